@@ -8,6 +8,7 @@ import streamlit as st
 import PyPDF2
 import requests
 import json
+import os
 import time
 from fpdf import FPDF
 from datetime import datetime
@@ -17,21 +18,33 @@ warnings.filterwarnings('ignore')
 # Import backend modules
 from backend import (
     ollama_client as OllamaClient,
+    ollama_pool,
     pdf_extractor as PDFTextExtractor,
+    text_cleaner as TextCleaner,
     summarizer as AISummarizer,
     exporter as SummaryExporter,
-    utils as calculate_statistics
+    utils as calculate_statistics,
+    cache as SummaryCache,
+    jobs,
+    metrics,
+    reporting
 )
 
 # Import frontend modules
 from frontend import (
+    SUMMARY_TYPE_OPTIONS,
     load_custom_css,
+    StreamlitReporter,
     render_header,
     render_features,
     render_sidebar,
+    render_cache_stats,
+    render_model_warm_up,
+    render_metrics_export,
     render_file_info,
     render_text_statistics,
-    render_processing_status,
+    render_cleanup_report,
+    render_job_progress,
     render_summary_statistics,
     render_summary_display,
     render_download_section,
@@ -49,6 +62,259 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Backend errors and progress are shown in the page
+reporting.set_reporter(StreamlitReporter())
+
+# Worker processes used to extract large PDFs
+EXTRACTION_WORKERS = int(os.environ.get("PDF_EXTRACTION_WORKERS", os.cpu_count() or 1))
+
+# Extracted documents kept in memory (shared by all sessions) and for how long
+EXTRACTION_CACHE_ENTRIES = int(os.environ.get("EXTRACTION_CACHE_ENTRIES", 8))
+EXTRACTION_CACHE_TTL = int(os.environ.get("EXTRACTION_CACHE_TTL", 3600))
+
+# Ollama servers; several (comma-separated) are load balanced by an OllamaPool
+OLLAMA_HOSTS = ollama_pool.parse_hosts(os.environ.get("OLLAMA_HOSTS")) or ["http://localhost:11434"]
+OLLAMA_ROUTING = os.environ.get("OLLAMA_ROUTING", "least_outstanding")
+
+# How long Ollama keeps the model loaded after a request ("30m", seconds, -1 for ever)
+MODEL_KEEP_ALIVE = os.environ.get("MODEL_KEEP_ALIVE", "30m")
+
+# Process metrics rewritten after every summary (.prom for Prometheus' textfile collector, else JSON)
+METRICS_FILE = os.environ.get("METRICS_FILE")
+
+# Summary jobs generating at once across all sessions, and how often a session polls its job
+SUMMARY_JOB_WORKERS = int(os.environ.get("SUMMARY_JOB_WORKERS", 2))
+JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", 0.5))
+
+# ============================================================================
+# SHARED RESOURCES
+# ============================================================================
+
+@st.cache_resource
+def get_ollama_client():
+    """Ollama client whose connection pool is shared by all sessions"""
+    keep_alive = OllamaClient.parse_keep_alive(MODEL_KEEP_ALIVE)
+    if len(OLLAMA_HOSTS) > 1:
+        return ollama_pool.OllamaPool(OLLAMA_HOSTS, routing=OLLAMA_ROUTING, keep_alive=keep_alive)
+    return OllamaClient.OllamaClient(
+        base_url=OLLAMA_HOSTS[0],
+        keep_alive=keep_alive
+    )
+
+@st.cache_resource
+def get_summary_cache():
+    """Summary cache shared by all sessions of this server"""
+    return SummaryCache.SummaryCache()
+
+def write_metrics_file(job):
+    """Rewrite METRICS_FILE after a summary job ends"""
+    if METRICS_FILE:
+        metrics.get_metrics().write(METRICS_FILE)
+
+@st.cache_resource
+def get_job_queue():
+    """Summary job queue whose workers are shared by all sessions"""
+    return jobs.JobQueue(
+        get_ollama_client(),
+        cache=get_summary_cache(),
+        max_workers=SUMMARY_JOB_WORKERS,
+        on_finish=write_metrics_file
+    )
+
+@st.cache_resource(max_entries=EXTRACTION_CACHE_ENTRIES, ttl=EXTRACTION_CACHE_TTL, show_spinner=False)
+def get_extraction_slot(document_hash):
+    """
+    Shared slot for one document's extraction results
+    
+    The slot is filled outside this function so extraction progress is drawn
+    live rather than replayed from the cache. Entries are bounded by count and
+    age, and a document uploaded in several sessions is held in memory once.
+    """
+    return {}
+
+def get_upload_digest(uploaded_file):
+    """SHA-256 of the upload, hashed once per uploaded file in this session"""
+    file_id = getattr(uploaded_file, 'file_id', None) or f"{uploaded_file.name}:{uploaded_file.size}"
+    cached = st.session_state.get('upload_digest')
+    if cached and cached[0] == file_id:
+        return cached[1]
+    
+    digest = SummaryCache.SummaryCache.hash_document(uploaded_file.getvalue())
+    st.session_state['upload_digest'] = (file_id, digest)
+    return digest
+
+def load_extraction(uploaded_file):
+    """
+    Extract an upload once and reuse the result on every rerun
+    
+    Returns:
+        dict: text, page_texts, pages, stats, boilerplate, metrics (extraction and
+            cleaning stage timings) and document_hash, or None if failed
+    """
+    document_hash = get_upload_digest(uploaded_file)
+    slot = get_extraction_slot(document_hash)
+    if slot:
+        return slot
+    
+    with metrics.collect() as extraction_metrics:
+        with st.spinner("📖 Extracting text from PDF..."):
+            page_texts = PDFTextExtractor.PDFTextExtractor.extract_pages(
+                PDFTextExtractor.PDFDocument(uploaded_file),
+                workers=EXTRACTION_WORKERS
+            )
+        if page_texts is None:
+            return None
+        
+        page_texts, boilerplate = TextCleaner.TextCleaner.strip_repeated_lines(page_texts)
+        page_texts = TextCleaner.TextCleaner.clean_pages(page_texts)
+    text = PDFTextExtractor.PDFTextExtractor.join_pages(page_texts)
+    slot.update({
+        'text': text,
+        'page_texts': tuple(page_texts),
+        'pages': len(page_texts),
+        'stats': calculate_statistics.TextStats.from_pages(page_texts),
+        'boilerplate': boilerplate,
+        'metrics': extraction_metrics.as_dict(),
+        'document_hash': document_hash
+    })
+    return slot
+
+def render_summary_result(summary, summary_type, results_header, processing_time,
+                          extraction, selected_model, uploaded_file, request_metrics=None):
+    """
+    Render statistics, copy and download sections for one finished summary
+    
+    Statistics are drawn into results_header, a container placed above the summary.
+    request_metrics holds the stage timings and Ollama counters recorded so far.
+    """
+    # Calculate statistics
+    stats = calculate_statistics.calculate_statistics(
+        extraction['text'],
+        summary,
+        extraction['stats']
+    )
+    
+    with results_header:
+        # Success message
+        st.markdown(
+            f"""
+            <div class="status-success">
+                ✅ {summary_type} Generated Successfully in {processing_time:.1f} seconds!
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+        
+        st.markdown("---")
+        
+        # Render summary statistics
+        render_summary_statistics(
+            stats,
+            processing_time,
+            selected_model,
+            request_metrics
+        )
+        
+        st.markdown("---")
+    
+    # Copy-friendly text area
+    with st.expander("📋 Copy-Friendly Text"):
+        st.text_area("", summary, height=300, key=f"copy_{summary_type}")
+    
+    st.markdown("---")
+    
+    # Download section
+    exporter = SummaryExporter.SummaryExporter()
+    render_download_section(
+        summary,
+        uploaded_file,
+        summary_type,
+        exporter,
+        key=f"download_{summary_type}"
+    )
+    
+    # Model information footer
+    st.markdown("---")
+    st.info(
+        f"🤖 Generated using **{selected_model}** | "
+        f"📅 {datetime.now().strftime('%B %d, %Y at %I:%M %p')}"
+    )
+
+def render_job(job_queue, job_id, running, extraction, uploaded_file):
+    """
+    Show a summary job, polling it every JOB_POLL_INTERVAL seconds while it runs
+    
+    Only this fragment reruns while polling. Once the job ends the whole page
+    reruns, drawing the results with statistics and downloads.
+    """
+    labels = {value: label for label, value in SUMMARY_TYPE_OPTIONS.items()}
+    
+    @st.fragment(run_every=JOB_POLL_INTERVAL if running else None)
+    def job_panel():
+        job = job_queue.get(job_id)
+        summary_labels = {key: labels.get(key, key) for key in job['summary_types']}
+        
+        if job['status'] not in jobs.FINISHED:
+            if render_job_progress(job, summary_labels, job_queue.position(job_id)):
+                job_queue.cancel(job_id)
+            return
+        if running:
+            # Finished since the page was drawn: redraw everything without polling
+            st.rerun()
+        
+        for message in job['errors']:
+            st.error(message)
+        for message in job['warnings']:
+            st.warning(message)
+        if job['status'] == jobs.CANCELLED:
+            st.info("⏹️ Summary cancelled")
+        
+        # Stage timings of this document's extraction and of the job
+        request_metrics = metrics.Metrics()
+        request_metrics.merge(extraction['metrics'])
+        request_metrics.merge(job['metrics'])
+        # Generation time without the queue wait; a job cancelled while pending never started
+        processing_time = job['finished'] - (job['started'] or job['finished'])
+        
+        for summary_key, summary in job['results'].items():
+            summary_type = summary_labels.get(summary_key, summary_key)
+            if not summary:
+                st.markdown(
+                    f'<div class="status-error">❌ Failed to generate {summary_type}</div>',
+                    unsafe_allow_html=True
+                )
+                continue
+            
+            st.markdown("---")
+            results_header = st.container()
+            render_summary_display(summary, summary_type)
+            render_summary_result(
+                summary,
+                summary_type,
+                results_header,
+                processing_time,
+                extraction,
+                job['model'],
+                uploaded_file,
+                request_metrics
+            )
+        
+        if job['status'] == jobs.FAILED:
+            if job['error'] and job['error'] != "Failed to generate summary":
+                st.markdown(
+                    f'<div class="status-error">❌ Error: {job["error"]}</div>',
+                    unsafe_allow_html=True
+                )
+                st.info("💡 Check your Ollama connection and try again")
+            elif not any(job['results'].values()):
+                st.markdown(
+                    '<div class="status-error">❌ Failed to generate summary</div>',
+                    unsafe_allow_html=True
+                )
+                st.info("💡 Try a different model or shorter document")
+    
+    job_panel()
+
 # ============================================================================
 # MAIN APPLICATION
 # ============================================================================
@@ -60,7 +326,13 @@ def main():
     load_custom_css()
     
     # Initialize Ollama client
-    ollama = OllamaClient.OllamaClient()
+    ollama = get_ollama_client()
+    
+    # Persistent summary cache
+    summary_cache = get_summary_cache()
+    
+    # Background summary jobs
+    job_queue = get_job_queue()
     
     # Render header
     render_header()
@@ -69,7 +341,17 @@ def main():
     render_features()
     
     # Render sidebar and get settings
-    selected_model, summary_type, summary_length = render_sidebar(ollama)
+    selected_model, summary_types, summary_length, prefilter = render_sidebar(ollama)
+    
+    # Load a newly selected model while the user uploads a document
+    if st.session_state.get('warmed_model') != selected_model:
+        ollama.warm_up(selected_model)
+        st.session_state['warmed_model'] = selected_model
+    render_model_warm_up(
+        selected_model,
+        ollama.is_warming(selected_model),
+        ollama.warm_timings.get(selected_model)
+    )
     
     st.markdown("---")
     
@@ -83,10 +365,10 @@ def main():
     )
     
     if uploaded_file:
-        # Extract text from PDF
-        with st.spinner("📖 Extracting text from PDF..."):
-            extractor = PDFTextExtractor.PDFTextExtractor()
-            extracted_text, total_pages = extractor.extract_text_from_pdf(uploaded_file)
+        # Extract text from PDF (memoized across reruns)
+        extraction = load_extraction(uploaded_file)
+        extracted_text = extraction['text'] if extraction else None
+        total_pages = extraction['pages'] if extraction else 0
         
         # Render file information
         render_file_info(uploaded_file, total_pages)
@@ -102,146 +384,45 @@ def main():
                 )
             
             # Render text statistics
-            render_text_statistics(extracted_text)
+            render_text_statistics(extracted_text, extraction['stats'])
+            render_cleanup_report(extraction['boilerplate'])
             
             st.markdown("---")
             
+            # Summary job of this document, kept across reruns and page reloads
+            job_id = st.session_state.get('summary_job') or st.query_params.get('job')
+            job = job_queue.get(job_id) if job_id else None
+            if job and job['document_hash'] != extraction['document_hash']:
+                job = None
+            job_running = job is not None and job['status'] not in jobs.FINISHED
+            
             # Generate summary button
+            if not summary_types:
+                st.info("👈 Select at least one summarization type in the sidebar")
+            
             if st.button(
                 "🚀 Generate AI Summary",
                 type="primary",
-                use_container_width=True
+                use_container_width=True,
+                disabled=not summary_types or job_running
             ):
-                # Initialize summarizer
-                summarizer = AISummarizer.AISummarizer(ollama)
-                
-                # Show processing status
-                with st.container():
-                    render_processing_status(
-                        selected_model,
-                        summary_type,
-                        summary_length
-                    )
-                    
-                    progress_bar = st.progress(0)
-                    status_text = st.empty()
-                
-                start_time = time.time()
-                
-                try:
-                    # Update progress
-                    status_text.text("🔄 Sending to AI model...")
-                    progress_bar.progress(25)
-                    
-                    # Generate summary based on selected type
-                    if "Extractive" in summary_type:
-                        summary = summarizer.summarize_extractive(
-                            extracted_text,
-                            selected_model,
-                            summary_length
-                        )
-                    elif "Abstractive" in summary_type:
-                        summary = summarizer.summarize_abstractive(
-                            extracted_text,
-                            selected_model,
-                            summary_length
-                        )
-                    elif "Bullet" in summary_type:
-                        summary = summarizer.summarize_bullet_points(
-                            extracted_text,
-                            selected_model
-                        )
-                    elif "Question" in summary_type:
-                        summary = summarizer.summarize_with_questions(
-                            extracted_text,
-                            selected_model
-                        )
-                    else:  # Key Insights
-                        summary = summarizer.get_key_insights(
-                            extracted_text,
-                            selected_model
-                        )
-                    
-                    # Update progress
-                    progress_bar.progress(75)
-                    status_text.text("⚙️ Processing response...")
-                    
-                    if summary:
-                        # Complete progress
-                        progress_bar.progress(100)
-                        time.sleep(0.5)
-                        progress_bar.empty()
-                        status_text.empty()
-                        
-                        # Calculate processing time and statistics
-                        processing_time = time.time() - start_time
-                        stats = calculate_statistics.calculate_statistics(extracted_text, summary)
-                        
-                        # Success message
-                        st.markdown(
-                            f"""
-                            <div class="status-success">
-                                ✅ Summary Generated Successfully in {processing_time:.1f} seconds!
-                            </div>
-                            """,
-                            unsafe_allow_html=True
-                        )
-                        
-                        st.markdown("---")
-                        
-                        # Render summary statistics
-                        render_summary_statistics(
-                            stats,
-                            processing_time,
-                            selected_model
-                        )
-                        
-                        st.markdown("---")
-                        
-                        # Display summary
-                        render_summary_display(summary, summary_type)
-                        
-                        # Copy-friendly text area
-                        with st.expander("📋 Copy-Friendly Text"):
-                            st.text_area("", summary, height=300)
-                        
-                        st.markdown("---")
-                        
-                        # Download section
-                        exporter = SummaryExporter.SummaryExporter()
-                        render_download_section(
-                            summary,
-                            uploaded_file,
-                            summary_type,
-                            exporter
-                        )
-                        
-                        # Model information footer
-                        st.markdown("---")
-                        st.info(
-                            f"🤖 Generated using **{selected_model}** | "
-                            f"📅 {datetime.now().strftime('%B %d, %Y at %I:%M %p')}"
-                        )
-                    
-                    else:
-                        # Failed to generate summary
-                        progress_bar.empty()
-                        status_text.empty()
-                        st.markdown(
-                            '<div class="status-error">❌ Failed to generate summary</div>',
-                            unsafe_allow_html=True
-                        )
-                        st.info("💡 Try a different model or shorter document")
-                
-                except Exception as e:
-                    # Handle errors
-                    progress_bar.empty()
-                    status_text.empty()
-                    st.markdown(
-                        f'<div class="status-error">❌ Error: {str(e)}</div>',
-                        unsafe_allow_html=True
-                    )
-                    st.info("💡 Check your Ollama connection and try again")
+                # Generation runs on the shared job pool; this script only polls it
+                job_id = job_queue.submit(
+                    extracted_text,
+                    selected_model,
+                    [SUMMARY_TYPE_OPTIONS[label] for label in summary_types],
+                    summary_length,
+                    document_hash=extraction['document_hash'],
+                    prefilter=prefilter,
+                    metadata={'file_name': uploaded_file.name}
+                )
+                st.session_state['summary_job'] = job_id
+                st.query_params['job'] = job_id
+                job = job_queue.get(job_id)
+                job_running = True
+            
+            if job is not None:
+                render_job(job_queue, job['id'], job_running, extraction, uploaded_file)
         
         else:
             # Could not extract text
@@ -253,6 +434,10 @@ def main():
                 "💡 Ensure your PDF contains readable text (not scanned images)"
             )
     
+    # Cache counters and metrics are rendered last so they include this run
+    render_cache_stats(summary_cache.stats())
+    render_metrics_export(metrics.get_metrics())
+    
     # Render footer
     render_footer()
 
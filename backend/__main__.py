@@ -0,0 +1,13 @@
+"""
+Backend Entry Point
+File: backend/__main__.py
+Description: Allow running the batch summarizer with python -m backend
+"""
+
+import sys
+
+from .cli import main
+
+# Guarded so extraction workers started with spawn/forkserver never rerun the CLI
+if __name__ == "__main__":
+    sys.exit(main())
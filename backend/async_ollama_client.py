@@ -0,0 +1,458 @@
+"""
+Async Ollama Client Module
+File: backend/async_ollama_client.py
+Description: asyncio Ollama API client for concurrent workloads
+"""
+
+import asyncio
+import random
+
+from .ollama_client import (
+    DEFAULT_CONTEXT_LENGTH,
+    GenerationStream,
+    OllamaStatusError,
+    RETRY_STATUS_CODES,
+    parse_context_length,
+    parse_timings
+)
+from .metrics import record_generation
+from .reporting import get_reporter
+
+
+def _describe_error(error):
+    """User-facing message for an exception raised by a generation request"""
+    import httpx
+    
+    if isinstance(error, httpx.TimeoutException):
+        return "Request timed out. Try a shorter document or different model."
+    if isinstance(error, httpx.ConnectError):
+        return "Cannot connect to Ollama. Ensure it's running: ollama serve"
+    if isinstance(error, OllamaStatusError):
+        return str(error)
+    return f"Generation error: {str(error)}"
+
+
+class AsyncGenerationStream(GenerationStream):
+    """Async iterator over the tokens of a streaming Ollama response
+    
+    The request is only sent, and a concurrency slot only taken, when
+    iteration starts, so a stream that is never read holds nothing. A
+    stream abandoned part-way keeps its slot until aclose(); use it as an
+    async context manager to release it in every case:
+    
+        async with await client.generate(model, prompt, stream=True) as stream:
+            async for token in stream:
+                ...
+    """
+    
+    def __init__(self, open_response, release, reporter=None, model=None):
+        """
+        Prepare a streaming request
+        
+        Args:
+            open_response: Coroutine function taking a concurrency slot and
+                returning the httpx.Response sent with stream=True
+            release: Callable freeing the concurrency slot held by the stream
+            reporter (Reporter): Error sink (defaults to get_reporter())
+            model (str): Model name the timings are recorded under
+        """
+        super().__init__(None, reporter, model)
+        self._open_response = open_response
+        self._release = release
+        self._holding = False
+        self._closed = False
+    
+    def __iter__(self):
+        raise TypeError("AsyncGenerationStream must be consumed with 'async for'")
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def _open(self):
+        """Send the request on first use; False if the stream is closed or failed"""
+        if self.response is None and not self._closed:
+            try:
+                self.response = await self._open_response()
+                self._holding = True
+            except Exception as e:
+                # Reported like a failed one-shot request, not as an error inside the stream
+                self.error = _describe_error(e)
+                (self.reporter or get_reporter()).error(self.error)
+        return self.response is not None and not self._closed
+    
+    def close(self):
+        """Free the concurrency slot (on garbage collection; aclose() also closes the response)"""
+        self._closed = True
+        if self._holding:
+            self._holding = False
+            self._release()
+    
+    async def aclose(self):
+        """Close the response and free the concurrency slot (safe to call repeatedly)"""
+        if self.response is not None:
+            await self.response.aclose()
+        self.close()
+    
+    async def __aiter__(self):
+        """
+        Parse Ollama's NDJSON chunks as they arrive
+        
+        Yields:
+            str: Generated text fragments
+        """
+        try:
+            if not await self._open():
+                return
+            async for line in self.response.aiter_lines():
+                if not line:
+                    continue
+                token = self._parse_line(line)
+                if token:
+                    yield token
+                if self.done or self.error:
+                    break
+        finally:
+            await self.aclose()
+        self._finish()
+
+
+class AsyncOllamaClient:
+    """asyncio client for Ollama API communication"""
+    
+    def __init__(self, base_url="http://localhost:11434", max_concurrency=4, max_retries=3,
+                 backoff_factor=0.5, backoff_max=8.0, connect_timeout=5, read_timeout=300,
+                 probe_timeout=5, reporter=None, keep_alive=None):
+        """
+        Initialize async Ollama client
+        
+        Args:
+            base_url (str): Base URL for Ollama server
+            max_concurrency (int): Maximum in-flight requests (match OLLAMA_NUM_PARALLEL)
+            max_retries (int): Retries on connection errors and 5xx responses
+            backoff_factor (float): Base delay in seconds, doubled per retry
+            backoff_max (float): Upper bound on a single retry delay
+            connect_timeout (float): Seconds to establish a connection
+            read_timeout (float): Seconds to wait for generation responses
+            probe_timeout (float): Read timeout for status and model queries
+            reporter (Reporter): Error sink (defaults to get_reporter() at call time)
+            keep_alive: How long the model, and the prompt cache shared by requests
+                on the same document, stays loaded after a request ("10m", seconds,
+                or -1 for ever); None uses the server's OLLAMA_KEEP_ALIVE
+        """
+        # httpx is imported on first use to keep backend imports fast
+        import httpx
+        
+        self.base_url = base_url
+        self._reporter = reporter
+        self.generate_url = f"{base_url}/api/generate"
+        self.chat_url = f"{base_url}/api/chat"
+        self.models_url = f"{base_url}/api/tags"
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.probe_timeout = httpx.Timeout(probe_timeout, connect=connect_timeout)
+        self.keep_alive = keep_alive
+        self._context_lengths = {}
+        self.last_timings = {}
+        self.warm_timings = {}
+        self.semaphore = asyncio.BoundedSemaphore(max_concurrency)
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency
+            )
+        )
+    
+    @property
+    def reporter(self):
+        """Reporter for user-facing errors"""
+        return self._reporter or get_reporter()
+    
+    async def aclose(self):
+        """Close pooled connections"""
+        await self.client.aclose()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    def _backoff_delay(self, attempt):
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * (2 ** attempt)))
+    
+    async def _request(self, method, url, retries=None, timeout=None, stream=False, **kwargs):
+        """
+        Send a request, retrying connection errors and 5xx responses
+        
+        The caller must already hold a concurrency slot.
+        
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            retries (int): Override for max_retries
+            timeout: Override for the generation timeout
+            stream (bool): Return before reading the body
+            **kwargs: Passed to httpx.AsyncClient.build_request
+            
+        Returns:
+            httpx.Response: Final response
+        """
+        import httpx
+        
+        retries = self.max_retries if retries is None else retries
+        for attempt in range(retries + 1):
+            request = self.client.build_request(
+                method,
+                url,
+                timeout=timeout or self.timeout,
+                **kwargs
+            )
+            try:
+                response = await self.client.send(request, stream=stream)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError):
+                if attempt == retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(self._backoff_delay(attempt))
+    
+    async def check_connection(self):
+        """
+        Check if Ollama server is running
+        
+        Returns:
+            bool: True if connected, False otherwise
+        """
+        try:
+            async with self.semaphore:
+                response = await self._request(
+                    "GET", self.models_url, retries=0, timeout=self.probe_timeout
+                )
+            return response.status_code == 200
+        except Exception:
+            return False
+    
+    async def list_models(self):
+        """
+        Get list of available models
+        
+        Returns:
+            list: List of model names
+        """
+        try:
+            async with self.semaphore:
+                response = await self._request("GET", self.models_url, timeout=self.probe_timeout)
+            if response.status_code == 200:
+                return [model['name'] for model in response.json().get('models', [])]
+            return []
+        except Exception:
+            return []
+    
+    async def _open_stream(self, url, payload):
+        """
+        Take a concurrency slot and send a streaming request
+        
+        On success the slot stays held until the stream releases it.
+        
+        Args:
+            url (str): Endpoint URL
+            payload (dict): Request body
+            
+        Returns:
+            httpx.Response: Response whose body has not been read
+        """
+        await self.semaphore.acquire()
+        try:
+            response = await self._request("POST", url, json=payload, stream=True)
+        except Exception:
+            self.semaphore.release()
+            raise
+        if response.status_code != 200:
+            await response.aclose()
+            self.semaphore.release()
+            raise OllamaStatusError(response.status_code)
+        return response
+    
+    async def _post(self, url, payload, stream, result_key):
+        """
+        POST a generation request and unpack the result
+        
+        Args:
+            url (str): Endpoint URL
+            payload (dict): Request body
+            stream (bool): Whether to stream response
+            result_key (callable): Extracts the text from a non-streamed reply
+            
+        Returns:
+            str: Generated text (AsyncGenerationStream if streaming) or None if failed
+        """
+        if stream:
+            # Sent when the caller starts reading; see AsyncGenerationStream
+            return AsyncGenerationStream(
+                lambda: self._open_stream(url, payload),
+                self.semaphore.release,
+                self.reporter,
+                payload["model"]
+            )
+        
+        await self.semaphore.acquire()
+        try:
+            response = await self._request("POST", url, json=payload)
+        except Exception:
+            self.semaphore.release()
+            raise
+        
+        if response.status_code != 200:
+            await response.aclose()
+            self.semaphore.release()
+            self.reporter.error(f"Ollama API returned status code: {response.status_code}")
+            return None
+        
+        try:
+            await response.aread()
+            data = response.json()
+            self.last_timings = parse_timings(data)
+            record_generation(payload["model"], self.last_timings)
+            return result_key(data)
+        finally:
+            await response.aclose()
+            self.semaphore.release()
+    
+    async def generate(self, model, prompt, stream=False, options=None):
+        """
+        Generate text using Ollama model
+        
+        Args:
+            model (str): Model name to use
+            prompt (str): Input prompt
+            stream (bool): Whether to stream response
+            options (dict): Model parameters such as num_ctx
+            
+        Returns:
+            str: Generated text (AsyncGenerationStream if streaming, which reports
+                failures once read) or None if failed
+        """
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": stream
+        }
+        if options:
+            payload["options"] = options
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        try:
+            return await self._post(
+                self.generate_url, payload, stream, lambda data: data['response']
+            )
+        except Exception as e:
+            self.reporter.error(_describe_error(e))
+            return None
+    
+    async def warm_up(self, model):
+        """
+        Load a model into memory ahead of its first request
+        
+        Run it as a task (asyncio.create_task) to warm up in the background.
+        
+        Args:
+            model (str): Model name
+            
+        Returns:
+            dict: Timings of the load (see parse_timings), or None if it failed
+        """
+        payload = {"model": model, "stream": False}
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        try:
+            async with self.semaphore:
+                response = await self._request("POST", self.generate_url, json=payload)
+                await response.aread()
+            if response.status_code != 200:
+                return None
+            timings = parse_timings(response.json())
+            self.warm_timings[model] = timings
+            record_generation(model, timings)
+            return timings
+        except Exception:
+            return None
+    
+    async def chat(self, model, messages, stream=False):
+        """
+        Chat completion using Ollama
+        
+        Args:
+            model (str): Model name
+            messages (list): List of message dictionaries
+            stream (bool): Whether to stream response
+            
+        Returns:
+            str: Response text (AsyncGenerationStream if streaming, which reports
+                failures once read) or None if failed
+        """
+        payload = {
+            "model": model,
+            "messages": messages,
+            "stream": stream
+        }
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        try:
+            return await self._post(
+                self.chat_url, payload, stream, lambda data: data['message']['content']
+            )
+        except Exception as e:
+            self.reporter.error(f"Chat error: {str(e)}")
+            return None
+    
+    async def get_model_info(self, model_name):
+        """
+        Get information about a specific model
+        
+        Args:
+            model_name (str): Name of the model
+            
+        Returns:
+            dict: Model information or None
+        """
+        try:
+            async with self.semaphore:
+                response = await self._request(
+                    "POST",
+                    f"{self.base_url}/api/show",
+                    json={"name": model_name},
+                    timeout=self.probe_timeout
+                )
+            if response.status_code == 200:
+                return response.json()
+            return None
+        except Exception:
+            return None
+    
+    async def get_context_length(self, model_name):
+        """
+        Get the context window of a model in tokens
+        
+        Args:
+            model_name (str): Name of the model
+            
+        Returns:
+            int: Context window (DEFAULT_CONTEXT_LENGTH if unknown)
+        """
+        if model_name in self._context_lengths:
+            return self._context_lengths[model_name]
+        
+        info = await self.get_model_info(model_name)
+        if info is None:
+            return DEFAULT_CONTEXT_LENGTH
+        length = parse_context_length(info) or DEFAULT_CONTEXT_LENGTH
+        self._context_lengths[model_name] = length
+        return length
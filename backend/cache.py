@@ -0,0 +1,196 @@
+"""
+Summary Cache Module
+File: backend/cache.py
+Description: Persistent, size-bounded on-disk cache for generated summaries
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ai_pdf_summarizer")
+
+
+class SummaryCache:
+    """Content-addressed summary cache with least-recently-used eviction"""
+    
+    def __init__(self, cache_dir=None, max_entries=500, max_bytes=50 * 1024 * 1024):
+        """
+        Initialize summary cache
+        
+        Args:
+            cache_dir (str): Directory for cache files (env SUMMARY_CACHE_DIR overrides default)
+            max_entries (int): Maximum number of cached summaries
+            max_bytes (int): Maximum total size of cache files
+        """
+        self.cache_dir = cache_dir or os.environ.get("SUMMARY_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    @staticmethod
+    def hash_document(data):
+        """
+        Hash the raw bytes of a document
+        
+        Args:
+            data (bytes): Document content
+            
+        Returns:
+            str: SHA-256 hex digest
+        """
+        return hashlib.sha256(data).hexdigest()
+    
+    @staticmethod
+    def make_key(document_hash, model, summary_type, length, prompt_template):
+        """
+        Build a cache key from everything that determines a summary
+        
+        Args:
+            document_hash (str): SHA-256 of the source document
+            model (str): Model name
+            summary_type (str): Summary type key
+            length (str): Summary length
+            prompt_template (str): Rendered prompt template
+            
+        Returns:
+            str: SHA-256 hex digest identifying the summary
+        """
+        parts = [document_hash, model, summary_type, length, prompt_template]
+        return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+    
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def get(self, key):
+        """
+        Look up a cached summary
+        
+        Args:
+            key (str): Cache key from make_key()
+            
+        Returns:
+            str: Cached summary or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                summary = json.load(f)["summary"]
+            # Refresh modification time so eviction sees this entry as recently used
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+        
+        with self._lock:
+            self.hits += 1
+        return summary
+    
+    def put(self, key, summary, metadata=None):
+        """
+        Store a summary and evict old entries if over budget
+        
+        Args:
+            key (str): Cache key from make_key()
+            summary (str): Summary text
+            metadata (dict): Optional extra information stored alongside
+        """
+        record = {
+            'summary': summary,
+            'metadata': metadata or {},
+            'created': datetime.now().isoformat()
+        }
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(record, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            self._discard(tmp_path)
+            return
+        except Exception:
+            self._discard(tmp_path)
+            raise
+        
+        self._evict()
+    
+    @staticmethod
+    def _discard(tmp_path):
+        """Remove a half-written entry, eviction only ever looks at .json files"""
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+    
+    def _evict(self):
+        """Delete least recently used entries until within both limits"""
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith(".json"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            
+            total_bytes = sum(size for _, size, _ in entries)
+            count = len(entries)
+            if count <= self.max_entries and total_bytes <= self.max_bytes:
+                return
+            
+            entries.sort()
+            for _, size, path in entries:
+                if count <= self.max_entries and total_bytes <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                count -= 1
+                total_bytes -= size
+    
+    def clear(self):
+        """Remove all cached summaries"""
+        with self._lock:
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith(".json"):
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+    
+    def stats(self):
+        """
+        Get cache usage statistics
+        
+        Returns:
+            dict: Hits, misses, entry count and size on disk
+        """
+        entries = 0
+        total_bytes = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".json"):
+                entries += 1
+                try:
+                    total_bytes += entry.stat().st_size
+                except OSError:
+                    pass
+        
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': entries,
+            'bytes': total_bytes
+        }
@@ -0,0 +1,378 @@
+"""
+Batch Command Line Module
+File: backend/cli.py
+Description: Summarize directories of PDFs without the Streamlit UI
+
+Usage:
+    python -m backend reports/ "archive/**/*.pdf" --model llama2 --types abstractive bullet_points
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+
+from . import metrics
+from .cache import SummaryCache
+from .exporter import SummaryExporter
+from .ollama_client import OllamaClient, parse_keep_alive
+from .ollama_pool import ROUTING, OllamaPool, parse_hosts
+from .pdf_extractor import PDFDocument, PDFTextExtractor, process_context
+from .summarizer import AISummarizer, SUMMARY_TYPES
+from .text_cleaner import TextCleaner
+from .utils import TextStats, calculate_statistics
+
+
+def find_pdfs(inputs):
+    """
+    Expand directories, glob patterns and file paths into PDF paths
+    
+    Args:
+        inputs (list): Directories, glob patterns or files
+        
+    Returns:
+        list: Unique PDF paths in discovery order
+    """
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = sorted(glob.glob(os.path.join(item, "**", "*.pdf"), recursive=True))
+        elif glob.has_magic(item):
+            matches = sorted(glob.glob(item, recursive=True))
+        else:
+            matches = [item]
+        paths.extend(m for m in matches if m.lower().endswith(".pdf"))
+    return list(dict.fromkeys(paths))
+
+
+def markdown_path(path, summary_type, output_dir, input_root):
+    """
+    Markdown file of one summary, mirroring the PDF's place under the inputs
+    
+    Args:
+        path (str): PDF file path
+        summary_type (str): Summary type
+        output_dir (str): Directory for results
+        input_root (str): Common directory of all input PDFs
+        
+    Returns:
+        str: output_dir/<path relative to input_root without .pdf>.<type>.md, so
+            a/report.pdf and b/report.pdf do not overwrite each other
+    """
+    relative = os.path.relpath(os.path.abspath(path), input_root)
+    return os.path.join(output_dir, f"{os.path.splitext(relative)[0]}.{summary_type}.md")
+
+
+def extract_document(path, clean=True):
+    """
+    Extract one PDF in a worker process
+    
+    Args:
+        path (str): PDF file path
+        clean (bool): Normalize page texts with TextCleaner
+        
+    Returns:
+        dict: path, sha256, page_texts, stats, boilerplate and metrics (None if
+            failed) and error; metrics are recorded here since the worker's own
+            process metrics are lost
+    """
+    try:
+        with metrics.collect() as extraction_metrics:
+            document = PDFDocument(path)
+            with metrics.timed("extract"):
+                page_texts = [page_text for _, page_text in document.iter_pages()]
+            boilerplate = None
+            if clean:
+                page_texts, boilerplate = TextCleaner.strip_repeated_lines(page_texts)
+                page_texts = TextCleaner.clean_pages(page_texts)
+        return {
+            'path': path,
+            'sha256': SummaryCache.hash_document(document.data),
+            'page_texts': page_texts,
+            'stats': TextStats.from_pages(page_texts),
+            'boilerplate': boilerplate,
+            'metrics': extraction_metrics.as_dict(),
+            'error': None
+        }
+    except Exception as e:
+        return {
+            'path': path,
+            'sha256': None,
+            'page_texts': None,
+            'stats': None,
+            'boilerplate': None,
+            'metrics': None,
+            'error': str(e)
+        }
+
+
+def summarize_document(summarizer, extracted, model, summary_types, length):
+    """
+    Produce every requested summary type for one extracted document
+    
+    Args:
+        summarizer: AISummarizer instance
+        extracted (dict): Result of extract_document()
+        model (str): Model name to use
+        summary_types (list): Entries of SUMMARY_TYPES
+        length (str): Summary length
+        
+    Returns:
+        list: One result record per summary type
+    """
+    text = PDFTextExtractor.join_pages(extracted['page_texts'])
+    
+    # All types share one condensed text and run concurrently
+    results = {}
+    start_time = time.time()
+    with metrics.collect() as document_metrics:
+        document_metrics.merge(extracted['metrics'])
+        if text.strip():
+            for summary_type, summary in summarizer.summarize_many(
+                text,
+                model,
+                summary_types,
+                length,
+                document_hash=extracted['sha256']
+            ):
+                results[summary_type] = (summary, time.time() - start_time)
+    
+    records = []
+    for summary_type in summary_types:
+        summary, processing_time = results.get(summary_type, (None, 0.0))
+        error = None
+        if not text.strip():
+            error = "No extractable text"
+        elif not summary:
+            error = "Failed to generate summary"
+        
+        records.append({
+            'path': extracted['path'],
+            'sha256': extracted['sha256'],
+            'pages': len(extracted['page_texts']),
+            'text': text,
+            'stats': extracted['stats'],
+            'boilerplate': extracted['boilerplate'],
+            'summary_type': summary_type,
+            'summary': summary,
+            'processing_time': processing_time,
+            'metrics': document_metrics.as_dict(),
+            'error': error
+        })
+    return records
+
+
+def write_record(record, args, jsonl_file, input_root):
+    """
+    Write one result to the JSONL file and, if enabled, a Markdown file
+    
+    Args:
+        record (dict): Result from summarize_document()
+        args: Parsed command line arguments
+        jsonl_file: Open JSONL output file or None
+        input_root (str): Common directory of all input PDFs
+    """
+    title = os.path.basename(record['path'])
+    metadata = {
+        'model': args.model,
+        'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'source': record['path'],
+        'sha256': record['sha256'],
+        'pages': record['pages'],
+        'length': args.length,
+        'processing_time': round(record['processing_time'], 3),
+        'error': record['error']
+    }
+    if record['boilerplate']:
+        metadata.update({
+            'boilerplate_chars_removed': record['boilerplate']['chars_removed'],
+            'boilerplate_tokens_saved': record['boilerplate']['tokens_saved']
+        })
+    if record['summary']:
+        stats = calculate_statistics(record['text'], record['summary'], record['stats'])
+        metadata.update({
+            'original_words': stats['original_words'],
+            'summary_words': stats['summary_words'],
+            'compression': stats['compression_ratio']
+        })
+    
+    if jsonl_file is not None:
+        # Stage timings and model counters of the whole document, shared by its types
+        jsonl_file.write(SummaryExporter.create_json(
+            record['summary'] or "", title, record['summary_type'],
+            dict(metadata, metrics=record['metrics'])
+        ) + "\n")
+        jsonl_file.flush()
+    
+    if args.format in ("markdown", "both") and record['summary']:
+        md_path = markdown_path(record['path'], record['summary_type'], args.output_dir, input_root)
+        os.makedirs(os.path.dirname(md_path), exist_ok=True)
+        with open(md_path, "w", encoding="utf-8") as f:
+            f.write(SummaryExporter.create_markdown(
+                record['summary'], title, record['summary_type'], metadata
+            ))
+
+
+def build_parser():
+    """Command line arguments"""
+    parser = argparse.ArgumentParser(
+        prog="python -m backend",
+        description="Summarize PDFs in batch with a local Ollama server"
+    )
+    parser.add_argument("inputs", nargs="+", help="PDF files, directories or glob patterns")
+    parser.add_argument("--model", default="llama2", help="Ollama model name")
+    parser.add_argument(
+        "--types", nargs="+", default=["abstractive"], choices=SUMMARY_TYPES,
+        help="Summary types to generate for each document"
+    )
+    parser.add_argument("--length", default="medium", choices=["short", "medium", "long"])
+    parser.add_argument("--output-dir", default="summaries", help="Directory for results")
+    parser.add_argument(
+        "--format", default="both", choices=["jsonl", "markdown", "both"],
+        help="Write summaries.jsonl, one Markdown file per summary, or both"
+    )
+    parser.add_argument("--extract-workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes extracting PDFs")
+    parser.add_argument("--summarize-workers", type=int, default=2,
+                        help="Documents summarized at the same time")
+    parser.add_argument("--max-concurrency", type=int, default=None,
+                        help="In-flight Ollama requests per document (map stage; "
+                             "default 4 per Ollama server)")
+    parser.add_argument("--ollama-url", default="http://localhost:11434",
+                        help="Ollama server, or several separated by commas to balance "
+                             "requests across them")
+    parser.add_argument("--routing", default="least_outstanding", choices=ROUTING,
+                        help="How requests are spread over several Ollama servers")
+    parser.add_argument("--keep-alive", default="30m",
+                        help="How long Ollama keeps the model loaded between requests "
+                             "(e.g. 30m, seconds, -1 for ever; empty for the server default)")
+    parser.add_argument("--cache-dir", default=None, help="Summary cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the summary cache")
+    parser.add_argument("--no-clean", action="store_true",
+                        help="Summarize raw extracted text without normalization")
+    parser.add_argument("--metrics-file", default=None,
+                        help="Write stage timings and model counters here when done "
+                             "(.prom for Prometheus text, otherwise JSON)")
+    parser.add_argument("--prefilter", action="store_true",
+                        help="Shrink long documents by local sentence ranking instead of map-reduce")
+    return parser
+
+
+def main(argv=None):
+    """
+    Run the batch pipeline
+    
+    Extraction runs in a process pool and summarization in a thread pool.
+    Documents flow from one stage to the next as soon as they are ready,
+    and the number of documents in flight is bounded to keep memory flat.
+    
+    Args:
+        argv (list): Command line arguments (defaults to sys.argv)
+        
+    Returns:
+        int: Exit code (0 all succeeded, 1 some failed, 2 setup error)
+    """
+    args = build_parser().parse_args(argv)
+    
+    paths = find_pdfs(args.inputs)
+    if not paths:
+        print("No PDF files found", file=sys.stderr)
+        return 2
+    input_root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths])
+    
+    hosts = parse_hosts(args.ollama_url)
+    if not hosts:
+        print("No Ollama URL given", file=sys.stderr)
+        return 2
+    max_concurrency = args.max_concurrency or 4 * max(1, len(hosts))
+    client_options = {
+        'pool_size': max(10, args.summarize_workers * max_concurrency),
+        'keep_alive': parse_keep_alive(args.keep_alive)
+    }
+    if len(hosts) > 1:
+        ollama = OllamaPool(hosts, routing=args.routing, **client_options)
+    else:
+        ollama = OllamaClient(base_url=hosts[0], **client_options)
+    if not ollama.check_connection():
+        print(f"Cannot connect to Ollama at {args.ollama_url}. Ensure it's running: ollama serve",
+              file=sys.stderr)
+        return 2
+    
+    # Load the model while the first documents are being extracted
+    ollama.warm_up(args.model)
+    
+    cache = None if args.no_cache else SummaryCache(args.cache_dir)
+    summarizer = AISummarizer(ollama, max_concurrency=max_concurrency, cache=cache,
+                              prefilter=args.prefilter)
+    
+    os.makedirs(args.output_dir, exist_ok=True)
+    jsonl_file = None
+    if args.format in ("jsonl", "both"):
+        jsonl_file = open(os.path.join(args.output_dir, "summaries.jsonl"), "a", encoding="utf-8")
+    
+    max_in_flight = 2 * (args.extract_workers + args.summarize_workers)
+    path_iter = iter(paths)
+    extracting, summarizing = set(), set()
+    finished = failed = 0
+    
+    try:
+        with ProcessPoolExecutor(max_workers=args.extract_workers,
+                                 mp_context=process_context()) as extract_pool, \
+                ThreadPoolExecutor(max_workers=args.summarize_workers) as summarize_pool:
+            
+            def fill():
+                while len(extracting) + len(summarizing) < max_in_flight:
+                    path = next(path_iter, None)
+                    if path is None:
+                        return
+                    extracting.add(extract_pool.submit(extract_document, path, not args.no_clean))
+            
+            fill()
+            while extracting or summarizing:
+                done, _ = wait(extracting | summarizing, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in extracting:
+                        extracting.discard(future)
+                        extracted = future.result()
+                        if extracted['metrics']:
+                            metrics.get_metrics().merge(extracted['metrics'])
+                        if extracted['error'] is None:
+                            summarizing.add(summarize_pool.submit(
+                                summarize_document, summarizer, extracted,
+                                args.model, args.types, args.length
+                            ))
+                            continue
+                        records = [{
+                            'path': extracted['path'], 'sha256': None, 'pages': 0, 'text': "",
+                            'stats': None, 'boilerplate': None, 'summary_type': summary_type, 'summary': None,
+                            'processing_time': 0.0, 'metrics': None, 'error': extracted['error']
+                        } for summary_type in args.types]
+                    else:
+                        summarizing.discard(future)
+                        records = future.result()
+                    
+                    for record in records:
+                        write_record(record, args, jsonl_file, input_root)
+                    finished += 1
+                    errors = [r['error'] for r in records if r['error']]
+                    failed += bool(errors)
+                    status = f"failed: {errors[0]}" if errors else "ok"
+                    boilerplate = records[0]['boilerplate']
+                    if boilerplate and boilerplate['chars_removed']:
+                        status += (f" (stripped {boilerplate['chars_removed']:,} chars, "
+                                   f"~{boilerplate['tokens_saved']:,} tokens of headers/footers)")
+                    print(f"[{finished}/{len(paths)}] {records[0]['path']} {status}", file=sys.stderr)
+                fill()
+    finally:
+        if jsonl_file is not None:
+            jsonl_file.close()
+        ollama.close()
+        if args.metrics_file:
+            metrics.get_metrics().write(args.metrics_file)
+    
+    print(f"Summarized {finished - failed} of {len(paths)} documents into {args.output_dir}",
+          file=sys.stderr)
+    return 1 if failed else 0
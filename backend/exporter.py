@@ -4,6 +4,7 @@ File: backend/exporter.py
 Description: Export summaries to various formats
 """
 
+import json
 from fpdf import FPDF
 from datetime import datetime
 
@@ -36,12 +37,14 @@ class SummaryExporter:
         # Summary type
         if summary_type:
             pdf.set_font("Arial", 'I', 12)
-            pdf.cell(0, 10, f"Type: {summary_type}", ln=True, align='C')
+            # Core fonts are latin-1 only; drop the emoji of UI labels
+            label = summary_type.encode('latin-1', 'ignore').decode('latin-1').strip()
+            pdf.cell(0, 10, f"Type: {label}", ln=True, align='C')
             pdf.ln(5)
         
         # Document title
         pdf.set_font("Arial", 'B', 12)
-        pdf.cell(0, 10, title, ln=True)
+        pdf.cell(0, 10, title.encode('latin-1', 'replace').decode('latin-1'), ln=True)
         pdf.ln(5)
         
         # Metadata
@@ -176,3 +179,25 @@ class SummaryExporter:
         lines.append("*Generated by AI PDF Summarizer*")
         
         return "\n".join(lines)
+    
+    @staticmethod
+    def create_json(summary_text, title="Summary", summary_type="", metadata=None):
+        """
+        Create a single-line JSON record (one line of a JSONL file)
+        
+        Args:
+            summary_text (str): Summary content
+            title (str): Document title
+            summary_type (str): Type of summary
+            metadata (dict): Additional metadata
+            
+        Returns:
+            str: JSON object without newlines
+        """
+        record = {
+            'title': title,
+            'summary_type': summary_type,
+            'summary': summary_text,
+            'metadata': metadata or {}
+        }
+        return json.dumps(record, ensure_ascii=False)
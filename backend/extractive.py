@@ -0,0 +1,223 @@
+"""
+Extractive Summarizer Module
+File: backend/extractive.py
+Description: Local sentence ranking with TF-IDF and TextRank, no LLM calls
+"""
+
+import re
+
+from .utils import estimate_tokens
+
+# Sentences selected for each summary length (matches LENGTH_SENTENCES upper bounds)
+SENTENCE_COUNTS = {
+    "short": 4,
+    "medium": 7,
+    "long": 12
+}
+
+# Sentence end (terminator kept in group 1) or a blank line
+_SENTENCE_BOUNDARY = re.compile(r"([.!?][\"')\]]*)\s+|\n[ \t]*\n\s*")
+
+# Sentences are tokenized in one pass, separated by a NUL "term"
+_BREAK = "\x00"
+
+# ASCII digits and punctuation become spaces so str.split() yields words
+_NON_LETTERS = str.maketrans({
+    c: " " for c in map(chr, range(1, 128)) if not c.isalpha()
+})
+
+
+class ExtractiveSummarizer:
+    """Select the most central sentences of a document with TextRank"""
+    
+    def __init__(self, damping=0.85, max_iter=100, tol=1e-6, min_words=4):
+        """
+        Initialize extractive summarizer
+        
+        Args:
+            damping (float): TextRank damping factor
+            max_iter (int): Maximum power iterations
+            tol (float): Convergence threshold on the L1 change of scores
+            min_words (int): Shorter sentences (headings, captions) are never selected
+        """
+        self.damping = damping
+        self.max_iter = max_iter
+        self.tol = tol
+        self.min_words = min_words
+    
+    @staticmethod
+    def split_sentences(text):
+        """
+        Split text into sentences
+        
+        Args:
+            text (str): Input text
+            
+        Returns:
+            list: Sentences in document order
+        """
+        parts = _SENTENCE_BOUNDARY.split(text.replace(_BREAK, " "))
+        # parts alternates sentence text and its terminator (None after a blank line)
+        parts.append(None)
+        joined = _BREAK.join(
+            body + terminator if terminator else body
+            for body, terminator in zip(parts[::2], parts[1::2])
+        )
+        return [s for s in " ".join(joined.split()).replace(" \x00", _BREAK)
+                .replace("\x00 ", _BREAK).split(_BREAK) if s]
+    
+    @staticmethod
+    def tfidf(sentences):
+        """
+        Build the L2-normalized TF-IDF sentence-term matrix in COO form
+        
+        Args:
+            sentences (list): Sentences
+            
+        Returns:
+            tuple: (rows, cols, values) arrays of the non-zero entries
+        """
+        # numpy is imported on first use to keep backend imports fast
+        import numpy as np
+        
+        n_sentences = len(sentences)
+        text = f" {_BREAK} ".join(s.replace(_BREAK, " ") for s in sentences)
+        terms = text.lower().translate(_NON_LETTERS).split()
+        
+        # Number each distinct term by its first occurrence, then make ids contiguous
+        vocabulary = {}
+        first_seen = np.fromiter(
+            map(vocabulary.setdefault, terms, range(len(terms))),
+            dtype=np.int64,
+            count=len(terms)
+        )
+        is_break = first_seen == vocabulary.get(_BREAK, -1)
+        rows = np.cumsum(is_break)[~is_break]
+        _, cols = np.unique(first_seen[~is_break], return_inverse=True)
+        
+        if not len(cols):
+            empty = np.zeros(0)
+            return empty.astype(np.int64), empty.astype(np.int64), empty
+        n_terms = int(cols.max()) + 1
+        
+        # Merge repeated terms within a sentence into one entry with its count
+        keys, counts = np.unique(rows * n_terms + cols, return_counts=True)
+        rows = keys // n_terms
+        cols = keys % n_terms
+        
+        document_frequency = np.bincount(cols, minlength=n_terms)
+        idf = np.log(n_sentences / document_frequency)
+        values = (1.0 + np.log(counts)) * idf[cols]
+        
+        norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=n_sentences))
+        norms[norms == 0] = 1.0
+        return rows, cols, values / norms[rows]
+    
+    def rank(self, sentences):
+        """
+        Score sentences with TextRank over their cosine similarity graph
+        
+        The similarity matrix S = X·Xᵀ is never built: every product S·v is
+        computed as X·(Xᵀ·v) with two bincounts over the non-zero TF-IDF
+        entries, minus the self-similarity term, so memory and time per
+        iteration are linear in the document length.
+        
+        Args:
+            sentences (list): Sentences
+            
+        Returns:
+            numpy.ndarray: One score per sentence (sums to 1)
+        """
+        import numpy as np
+        
+        n = len(sentences)
+        if n == 0:
+            return np.zeros(0)
+        
+        rows, cols, values = self.tfidf(sentences)
+        n_terms = int(cols.max()) + 1 if len(cols) else 1
+        self_similarity = np.bincount(rows, weights=values * values, minlength=n)
+        
+        def similarity_dot(vector):
+            term_weights = np.bincount(cols, weights=values * vector[rows], minlength=n_terms)
+            return np.bincount(rows, weights=values * term_weights[cols], minlength=n) \
+                - self_similarity * vector
+        
+        degree = similarity_dot(np.ones(n))
+        inverse_degree = np.divide(1.0, degree, out=np.zeros(n), where=degree > 1e-12)
+        
+        scores = np.full(n, 1.0 / n)
+        for _ in range(self.max_iter):
+            updated = (1 - self.damping) / n + self.damping * similarity_dot(scores * inverse_degree)
+            # Mass of sentences with no neighbours is spread uniformly
+            updated += self.damping * scores[degree <= 1e-12].sum() / n
+            converged = np.abs(updated - scores).sum() < self.tol
+            scores = updated
+            if converged:
+                break
+        return scores
+    
+    def select(self, text, num_sentences=None, max_tokens=None):
+        """
+        Pick the highest-ranked sentences of a text
+        
+        Sentences are taken in score order until num_sentences are chosen or
+        the next one would exceed max_tokens, and returned in document order.
+        
+        Args:
+            text (str): Input text
+            num_sentences (int): Maximum number of sentences
+            max_tokens (int): Maximum total tokens of the selection
+            
+        Returns:
+            list: Selected sentences in document order
+        """
+        import numpy as np
+        
+        sentences = self.split_sentences(text)
+        scores = self.rank(sentences)
+        eligible = np.array(
+            [s.count(" ") + 1 >= self.min_words for s in sentences], dtype=bool
+        )
+        if len(sentences) and not eligible.any():
+            eligible[:] = True
+        
+        chosen = []
+        used_tokens = 0
+        for index in np.argsort(-scores, kind="stable"):
+            if not eligible[index]:
+                continue
+            if num_sentences is not None and len(chosen) >= num_sentences:
+                break
+            tokens = estimate_tokens(sentences[index]) + 1
+            if max_tokens is not None and used_tokens + tokens > max_tokens:
+                continue
+            chosen.append(index)
+            used_tokens += tokens
+        return [sentences[i] for i in sorted(chosen)]
+    
+    def summarize(self, text, length="medium"):
+        """
+        Fast extractive summary of the whole document
+        
+        Args:
+            text (str): Input text
+            length (str): Summary length (short/medium/long)
+            
+        Returns:
+            str: Selected sentences joined in document order
+        """
+        return " ".join(self.select(text, num_sentences=SENTENCE_COUNTS[length]))
+    
+    def condense(self, text, max_tokens):
+        """
+        Shrink a text to a token budget by keeping its most central sentences
+        
+        Args:
+            text (str): Input text
+            max_tokens (int): Token budget
+            
+        Returns:
+            str: Selected sentences in document order
+        """
+        return " ".join(self.select(text, max_tokens=max_tokens))
@@ -5,39 +5,71 @@ Description: Initialize backend module and expose main classes
 """
 
 from .ollama_client import OllamaClient
-from .pdf_extractor import PDFTextExtractor
-from .summarizer import AISummarizer
+from .ollama_pool import OllamaPool, CircuitBreaker
+from .async_ollama_client import AsyncOllamaClient
+from .pdf_extractor import PDFTextExtractor, PDFDocument
+from .text_cleaner import TextCleaner
+from .extractive import ExtractiveSummarizer
+from .summarizer import AISummarizer, AsyncAISummarizer
 from .exporter import SummaryExporter
+from .cache import SummaryCache
+from .reporting import Reporter, ProgressTracker, get_reporter, set_reporter
+from .metrics import Metrics, collect, get_metrics
+from .jobs import JobQueue
 from .utils import (
     calculate_statistics,
     validate_text_length,
     estimate_processing_time,
     clean_text,
     split_into_chunks,
+    iter_chunks,
+    split_into_token_chunks,
+    estimate_tokens,
     format_time,
     get_file_size_mb,
     truncate_filename,
     count_sentences,
     get_reading_time,
-    extract_key_stats
+    extract_key_stats,
+    TextStats
 )
 
 __all__ = [
     'OllamaClient',
+    'OllamaPool',
+    'CircuitBreaker',
+    'AsyncOllamaClient',
     'PDFTextExtractor',
+    'PDFDocument',
+    'TextCleaner',
+    'Metrics',
+    'collect',
+    'get_metrics',
+    'JobQueue',
+    'ExtractiveSummarizer',
     'AISummarizer',
+    'AsyncAISummarizer',
     'SummaryExporter',
+    'SummaryCache',
+    'Reporter',
+    'ProgressTracker',
+    'get_reporter',
+    'set_reporter',
     'calculate_statistics',
     'validate_text_length',
     'estimate_processing_time',
     'clean_text',
     'split_into_chunks',
+    'iter_chunks',
+    'split_into_token_chunks',
+    'estimate_tokens',
     'format_time',
     'get_file_size_mb',
     'truncate_filename',
     'count_sentences',
     'get_reading_time',
-    'extract_key_stats'
+    'extract_key_stats',
+    'TextStats'
 ]
 
 __version__ = '1.0.0'
@@ -0,0 +1,434 @@
+"""
+Jobs Module
+File: backend/jobs.py
+Description: Background summarization jobs with a worker pool, persisted status and cancellation
+
+A Streamlit script run that generates a summary itself freezes the session
+and loses the work when the script reruns. The app instead submits a job
+to a JobQueue shared by all sessions and polls its record on later runs.
+At most max_workers jobs generate at once; the rest wait in order. Job
+records are JSON files in job_dir, rewritten as the job progresses, so
+results outlive the session that asked for them.
+"""
+
+import copy
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from . import metrics
+from .cache import DEFAULT_CACHE_DIR
+from .reporting import Reporter, use_reporter
+from .summarizer import AISummarizer
+
+DEFAULT_JOB_DIR = os.path.join(DEFAULT_CACHE_DIR, "jobs")
+
+# Job states; a job ends in one of FINISHED
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+# Seconds between updates of a streaming job's partial text
+PARTIAL_INTERVAL = 0.2
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancel() was called"""
+
+
+class JobReporter(Reporter):
+    """Collects the errors and warnings raised while a job runs into its record"""
+    
+    def __init__(self, queue, job_id):
+        self.queue = queue
+        self.job_id = job_id
+    
+    def error(self, message):
+        self.queue._append(self.job_id, 'errors', message)
+    
+    def warning(self, message):
+        self.queue._append(self.job_id, 'warnings', message)
+
+
+class JobQueue:
+    """Run summarization jobs on a bounded thread pool"""
+    
+    def __init__(self, ollama_client, cache=None, job_dir=None, max_workers=2, max_jobs=200,
+                 save_interval=1.0, on_finish=None):
+        """
+        Initialize job queue
+        
+        Records left pending or running by a previous process are marked
+        failed, since their input text is not persisted.
+        
+        Args:
+            ollama_client: Instance of OllamaClient shared by all jobs
+            cache: Optional SummaryCache passed to every AISummarizer
+            job_dir (str): Directory for job records (env SUMMARY_JOB_DIR overrides default)
+            max_workers (int): Jobs generating at once
+            max_jobs (int): Finished job records kept; older ones are deleted
+            save_interval (float): Minimum seconds between writes of a streaming job's text
+            on_finish (callable): Called with a copy of each record when its job ends
+        """
+        self.ollama = ollama_client
+        self.cache = cache
+        self.job_dir = job_dir or os.environ.get("SUMMARY_JOB_DIR", DEFAULT_JOB_DIR)
+        self.max_jobs = max_jobs
+        self.save_interval = save_interval
+        self.on_finish = on_finish
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._futures = {}
+        self._cancel_events = {}
+        self._saved_at = {}
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                        thread_name_prefix="summary-job")
+        os.makedirs(self.job_dir, exist_ok=True)
+        self._load_records()
+    
+    def _path(self, job_id):
+        return os.path.join(self.job_dir, f"{job_id}.json")
+    
+    def _load_records(self):
+        """Read job records written by earlier processes"""
+        for entry in os.scandir(self.job_dir):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                with open(entry.path, "r", encoding="utf-8") as f:
+                    record = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if record.get('status') not in FINISHED:
+                record.update(
+                    status=FAILED,
+                    error="Interrupted by a server restart",
+                    finished=time.time()
+                )
+                self._save(record)
+            self._jobs[record['id']] = record
+    
+    def _save(self, record):
+        """Atomically write a job record"""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.job_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(record, f)
+            os.replace(tmp_path, self._path(record['id']))
+        except OSError:
+            pass
+        self._saved_at[record['id']] = time.monotonic()
+    
+    def _update(self, job_id, save=True, **fields):
+        """
+        Change fields of a job record
+        
+        Args:
+            job_id (str): Job ID
+            save (bool): Write the record now (False writes at most every save_interval)
+            **fields: Fields to set
+        """
+        with self._lock:
+            record = self._jobs[job_id]
+            record.update(fields)
+            due = time.monotonic() - self._saved_at.get(job_id, 0.0) >= self.save_interval
+            if save or due:
+                self._save(copy.deepcopy(record))
+    
+    def _append(self, job_id, field, message):
+        """Add a reporter message to a job record"""
+        with self._lock:
+            self._jobs[job_id][field].append(message)
+    
+    def submit(self, text, model, summary_types, length="medium", document_hash=None,
+               prefilter=False, metadata=None):
+        """
+        Queue summaries of one text
+        
+        A single summary type is streamed, so its text grows in the record's
+        partial field while it is generated. Several types run concurrently
+        through AISummarizer.summarize_many().
+        
+        Args:
+            text (str): Input text to summarize
+            model (str): Model name to use
+            summary_types (list): Entries of SUMMARY_TYPES
+            length (str): Summary length (short/medium/long)
+            document_hash (str): SHA-256 of the source document, enables caching
+            prefilter (bool): Condense long texts with local sentence ranking
+            metadata (dict): Extra information stored with the job (e.g. file name)
+            
+        Returns:
+            str: Job ID
+        """
+        job_id = uuid.uuid4().hex
+        record = {
+            'id': job_id,
+            'status': PENDING,
+            'model': model,
+            'summary_types': list(summary_types),
+            'length': length,
+            'document_hash': document_hash,
+            'prefilter': prefilter,
+            'metadata': metadata or {},
+            'created': time.time(),
+            'started': None,
+            'finished': None,
+            'progress': 0.0,
+            'message': "Waiting for a free worker...",
+            'partial': {},
+            'results': {},
+            'error': None,
+            'errors': [],
+            'warnings': [],
+            'metrics': {}
+        }
+        with self._lock:
+            self._jobs[job_id] = record
+            self._cancel_events[job_id] = threading.Event()
+            self._save(copy.deepcopy(record))
+            self._futures[job_id] = self._pool.submit(self._run, job_id, text)
+        return job_id
+    
+    def get(self, job_id):
+        """
+        Get a snapshot of a job record
+        
+        Args:
+            job_id (str): Job ID
+            
+        Returns:
+            dict: Copy of the record, or None for an unknown ID
+        """
+        with self._lock:
+            record = self._jobs.get(job_id)
+            return copy.deepcopy(record) if record is not None else None
+    
+    def list_jobs(self, document_hash=None):
+        """
+        Get snapshots of all known jobs, newest first
+        
+        Args:
+            document_hash (str): Only jobs for this document
+            
+        Returns:
+            list: Copies of job records
+        """
+        with self._lock:
+            records = [
+                copy.deepcopy(record) for record in self._jobs.values()
+                if document_hash is None or record['document_hash'] == document_hash
+            ]
+        return sorted(records, key=lambda record: record['created'], reverse=True)
+    
+    def position(self, job_id):
+        """
+        Number of pending jobs submitted before this one
+        
+        Args:
+            job_id (str): Job ID
+            
+        Returns:
+            int: Jobs ahead in the queue, 0 if the job is not pending
+        """
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is None or record['status'] != PENDING:
+                return 0
+            return sum(
+                1 for other in self._jobs.values()
+                if other['status'] == PENDING and other['created'] < record['created']
+            )
+    
+    def cancel(self, job_id):
+        """
+        Cancel a job
+        
+        A pending job never starts. A running job stops at its next
+        checkpoint: the next streamed token, or the next finished type once
+        the requests already sent to Ollama complete.
+        
+        Args:
+            job_id (str): Job ID
+            
+        Returns:
+            bool: True if the job was pending or running
+        """
+        with self._lock:
+            record = self._jobs.get(job_id)
+            if record is None or record['status'] in FINISHED:
+                return False
+            self._cancel_events[job_id].set()
+            future = self._futures.get(job_id)
+            if future is None or not future.cancel():
+                return True
+        self._finish(job_id, CANCELLED)
+        return True
+    
+    def wait(self, job_id, timeout=None):
+        """
+        Block until a job ends
+        
+        Args:
+            job_id (str): Job ID
+            timeout (float): Maximum seconds to wait
+            
+        Returns:
+            dict: Snapshot of the record
+        """
+        future = self._futures.get(job_id)
+        if future is not None:
+            try:
+                future.result(timeout)
+            except Exception:
+                pass
+        return self.get(job_id)
+    
+    def shutdown(self, wait=True, cancel=False):
+        """
+        Stop the worker pool
+        
+        Args:
+            wait (bool): Block until running jobs end
+            cancel (bool): Cancel pending and running jobs first
+        """
+        if cancel:
+            for record in self.list_jobs():
+                self.cancel(record['id'])
+        self._pool.shutdown(wait=wait)
+    
+    def _finish(self, job_id, status, **fields):
+        """Record the end of a job, prune old records and notify on_finish"""
+        with self._lock:
+            # Together with the status change, so cancel() never finds an
+            # unfinished job whose cancel event is already gone
+            self._futures.pop(job_id, None)
+            self._cancel_events.pop(job_id, None)
+            record = self._jobs[job_id]
+            record.update(fields, status=status, finished=time.time())
+            self._save(copy.deepcopy(record))
+        self._evict()
+        if self.on_finish is not None:
+            try:
+                self.on_finish(self.get(job_id))
+            except Exception:
+                pass
+    
+    def _evict(self):
+        """Delete the oldest finished records beyond max_jobs"""
+        with self._lock:
+            finished = sorted(
+                (record['finished'], job_id) for job_id, record in self._jobs.items()
+                if record['status'] in FINISHED
+            )
+            for _, job_id in finished[:max(0, len(finished) - self.max_jobs)]:
+                del self._jobs[job_id]
+                self._saved_at.pop(job_id, None)
+                try:
+                    os.remove(self._path(job_id))
+                except OSError:
+                    pass
+    
+    def _run(self, job_id, text):
+        """Generate the summaries of a job on a worker thread"""
+        cancelled = self._cancel_events[job_id]
+        if cancelled.is_set():
+            self._finish(job_id, CANCELLED)
+            return
+        
+        record = self.get(job_id)
+        self._update(job_id, status=RUNNING, started=time.time(), message="Sending to AI model...")
+        summarizer = AISummarizer(self.ollama, cache=self.cache, prefilter=record['prefilter'])
+        
+        status, error = DONE, None
+        with metrics.collect() as job_metrics, use_reporter(JobReporter(self, job_id)):
+            try:
+                if len(record['summary_types']) == 1:
+                    self._run_stream(job_id, summarizer, text, record, cancelled)
+                else:
+                    self._run_many(job_id, summarizer, text, record, cancelled)
+            except JobCancelled:
+                status = CANCELLED
+            except Exception as e:
+                status, error = FAILED, str(e)
+        
+        record = self.get(job_id)
+        if status == DONE and not any(record['results'].values()):
+            status, error = FAILED, "Failed to generate summary"
+        self._finish(
+            job_id,
+            status,
+            error=error,
+            progress=1.0 if status == DONE else record['progress'],
+            message="",
+            metrics=job_metrics.as_dict()
+        )
+    
+    def _run_stream(self, job_id, summarizer, text, record, cancelled):
+        """Stream a single summary type into the record's partial text"""
+        summary_type = record['summary_types'][0]
+        summary = summarizer.summarize(
+            text,
+            record['model'],
+            summary_type,
+            record['length'],
+            document_hash=record['document_hash'],
+            stream=True
+        )
+        if summary is None or isinstance(summary, str):
+            # Failed, cached or computed locally
+            self._update(job_id, results={summary_type: summary})
+            return
+        
+        self._update(job_id, message="Receiving summary...")
+        received = ""
+        updated_at = time.monotonic()
+        tokens = iter(summary)
+        for token in tokens:
+            if cancelled.is_set():
+                # Closing the stream drops the connection, which stops Ollama generating
+                tokens.close()
+                raise JobCancelled()
+            received += token
+            if time.monotonic() - updated_at >= PARTIAL_INTERVAL:
+                updated_at = time.monotonic()
+                self._update(job_id, save=False, partial={summary_type: received})
+        
+        if summary.error:
+            # Already reported to the job's errors; the partial text is not a summary
+            self._update(job_id, partial={}, results={summary_type: None})
+        elif not summary.done:
+            self._update(job_id, partial={}, results={summary_type: None})
+            raise RuntimeError("Ollama closed the stream before the summary was complete")
+        else:
+            self._update(job_id, partial={}, results={summary_type: received or None})
+    
+    def _run_many(self, job_id, summarizer, text, record, cancelled):
+        """Generate several summary types, storing each as it completes"""
+        summary_types = record['summary_types']
+        self._update(job_id, message=f"Generating {len(summary_types)} summaries in parallel...")
+        results = {}
+        completed = summarizer.summarize_many(
+            text,
+            record['model'],
+            summary_types,
+            record['length'],
+            document_hash=record['document_hash']
+        )
+        for summary_type, summary in completed:
+            results[summary_type] = summary
+            self._update(
+                job_id,
+                results=dict(results),
+                progress=len(results) / len(summary_types)
+            )
+            if cancelled.is_set():
+                completed.close()
+                raise JobCancelled()
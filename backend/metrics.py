@@ -0,0 +1,296 @@
+"""
+Metrics Module
+File: backend/metrics.py
+Description: Stage timings and Ollama token throughput, exportable as JSON or Prometheus text
+
+Backend code records into a process-wide Metrics (for dashboards) and into
+every collector opened with collect() in the current context (for one
+request). Work handed to a thread pool must be submitted with submit() so
+its records reach the caller's collectors.
+"""
+
+import contextvars
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+# Ollama duration fields kept per model (see ollama_client.parse_timings)
+GENERATION_SECONDS = ('load_seconds', 'prompt_eval_seconds', 'eval_seconds', 'total_seconds')
+GENERATION_TOKENS = ('prompt_tokens', 'eval_tokens')
+
+
+def _escape_label(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _rates(counters):
+    """Add prompt and generation tokens per second to generation counters"""
+    counters['prompt_tokens_per_second'] = (
+        counters['prompt_tokens'] / counters['prompt_eval_seconds']
+        if counters['prompt_eval_seconds'] else 0.0
+    )
+    counters['tokens_per_second'] = (
+        counters['eval_tokens'] / counters['eval_seconds'] if counters['eval_seconds'] else 0.0
+    )
+    return counters
+
+
+class Metrics:
+    """Thread-safe accumulator of stage durations and per-model generation counters"""
+    
+    def __init__(self):
+        """Initialize empty metrics"""
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.generations = {}
+    
+    def record_stage(self, stage, seconds, count=1):
+        """
+        Add time spent in a pipeline stage
+        
+        Args:
+            stage (str): Stage name, e.g. "extract" or "condense"
+            seconds (float): Duration
+            count (int): Number of runs the duration covers
+        """
+        with self._lock:
+            entry = self.stages.setdefault(stage, {'count': 0, 'seconds': 0.0})
+            entry['count'] += count
+            entry['seconds'] += seconds
+    
+    def record_generation(self, model, timings, requests=1):
+        """
+        Add the durations and token counts Ollama reported for a generation
+        
+        Args:
+            model (str): Model name
+            timings (dict): Result of ollama_client.parse_timings()
+            requests (int): Number of requests the timings cover
+        """
+        if not timings:
+            return
+        with self._lock:
+            entry = self.generations.get(model)
+            if entry is None:
+                entry = dict.fromkeys(GENERATION_SECONDS, 0.0)
+                entry.update(dict.fromkeys(GENERATION_TOKENS, 0))
+                entry['requests'] = 0
+                self.generations[model] = entry
+            entry['requests'] += requests
+            for key in GENERATION_SECONDS + GENERATION_TOKENS:
+                entry[key] += timings.get(key, 0)
+    
+    def merge(self, snapshot):
+        """
+        Add metrics recorded elsewhere, e.g. in a worker process
+        
+        Args:
+            snapshot (dict): Result of as_dict()
+        """
+        for stage, entry in snapshot.get('stages', {}).items():
+            self.record_stage(stage, entry['seconds'], entry['count'])
+        for model, entry in snapshot.get('generations', {}).items():
+            self.record_generation(model, entry, entry['requests'])
+    
+    def totals(self):
+        """
+        Generation counters summed over all models
+        
+        Returns:
+            dict: requests, seconds and token totals with tokens_per_second
+                and prompt_tokens_per_second
+        """
+        with self._lock:
+            totals = dict.fromkeys(GENERATION_SECONDS, 0.0)
+            totals.update(dict.fromkeys(GENERATION_TOKENS, 0))
+            totals['requests'] = 0
+            for entry in self.generations.values():
+                for key in totals:
+                    totals[key] += entry[key]
+        return _rates(totals)
+    
+    def stage_seconds(self, stage):
+        """
+        Time recorded for a stage
+        
+        Args:
+            stage (str): Stage name
+            
+        Returns:
+            float: Seconds, 0.0 if the stage never ran
+        """
+        with self._lock:
+            return self.stages.get(stage, {}).get('seconds', 0.0)
+    
+    def as_dict(self):
+        """
+        Snapshot of all metrics
+        
+        Returns:
+            dict: stages ({name: {count, seconds}}) and generations
+                ({model: {requests, seconds, tokens, rates}})
+        """
+        with self._lock:
+            stages = {stage: dict(entry) for stage, entry in self.stages.items()}
+            generations = {model: dict(entry) for model, entry in self.generations.items()}
+        return {
+            'stages': stages,
+            'generations': {model: _rates(entry) for model, entry in generations.items()}
+        }
+    
+    def to_json(self):
+        """
+        Serialize a snapshot as JSON
+        
+        Returns:
+            str: JSON document
+        """
+        return json.dumps(self.as_dict(), indent=2, sort_keys=True)
+    
+    def to_prometheus(self, prefix="pdf_summarizer"):
+        """
+        Serialize a snapshot in the Prometheus text exposition format
+        
+        Args:
+            prefix (str): Metric name prefix
+            
+        Returns:
+            str: Exposition text with cumulative counters
+        """
+        snapshot = self.as_dict()
+        lines = []
+        
+        def family(name, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape_label(v)}"' for key, v in labels)
+                lines.append(f"{prefix}_{name}{{{label_text}}} {value}")
+        
+        stages = sorted(snapshot['stages'].items())
+        family("stage_seconds_total", "Time spent in each pipeline stage.",
+               [((("stage", stage),), entry['seconds']) for stage, entry in stages])
+        family("stage_runs_total", "Runs of each pipeline stage.",
+               [((("stage", stage),), entry['count']) for stage, entry in stages])
+        
+        generations = sorted(snapshot['generations'].items())
+        family("generation_requests_total", "Ollama generations completed.",
+               [((("model", model),), entry['requests']) for model, entry in generations])
+        family("generation_seconds_total", "Ollama time by phase (load, prompt_eval, eval).",
+               [((("model", model), ("phase", phase)), entry[f"{phase}_seconds"])
+                for model, entry in generations for phase in ("load", "prompt_eval", "eval")])
+        family("generation_tokens_total", "Tokens evaluated (prompt) and generated (eval).",
+               [((("model", model), ("kind", kind)), entry[f"{kind}_tokens"])
+                for model, entry in generations for kind in ("prompt", "eval")])
+        return "\n".join(lines) + "\n"
+    
+    def write(self, path):
+        """
+        Atomically write the metrics to a file
+        
+        Files ending in .prom get Prometheus text (for node_exporter's
+        textfile collector); anything else gets JSON.
+        
+        Args:
+            path (str): Output file path
+        """
+        content = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+
+_process_metrics = Metrics()
+
+# Per-request collectors open in the current context
+_collectors = contextvars.ContextVar("metrics_collectors", default=())
+
+
+def get_metrics():
+    """
+    Get the process-wide metrics
+    
+    Returns:
+        Metrics: Cumulative metrics of this process
+    """
+    return _process_metrics
+
+
+@contextmanager
+def collect():
+    """
+    Collect the metrics recorded in this context, e.g. for one request
+    
+    Yields:
+        Metrics: Collector receiving every record made until the block exits
+    """
+    collector = Metrics()
+    token = _collectors.set(_collectors.get() + (collector,))
+    try:
+        yield collector
+    finally:
+        _collectors.reset(token)
+
+
+def _sinks():
+    return (_process_metrics,) + _collectors.get()
+
+
+def record_stage(stage, seconds):
+    """
+    Record a stage duration in the process metrics and open collectors
+    
+    Args:
+        stage (str): Stage name
+        seconds (float): Duration
+    """
+    for metrics in _sinks():
+        metrics.record_stage(stage, seconds)
+
+
+def record_generation(model, timings):
+    """
+    Record Ollama's timings in the process metrics and open collectors
+    
+    Args:
+        model (str): Model name
+        timings (dict): Result of ollama_client.parse_timings()
+    """
+    for metrics in _sinks():
+        metrics.record_generation(model, timings)
+
+
+@contextmanager
+def timed(stage):
+    """
+    Time a block as a pipeline stage
+    
+    Args:
+        stage (str): Stage name
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start)
+
+
+def submit(executor, fn, *args, **kwargs):
+    """
+    Submit work to an executor so it records into the caller's collectors
+    
+    Args:
+        executor: concurrent.futures thread pool
+        fn (callable): Function to run
+        *args, **kwargs: Passed to fn
+        
+    Returns:
+        Future: Future of fn's result
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
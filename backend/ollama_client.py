@@ -4,24 +4,351 @@ File: backend/ollama_client.py
 Description: Handles all Ollama API communication
 """
 
+import json
+import random
+import threading
+import time
+
 import requests
-import streamlit as st
+from requests.adapters import HTTPAdapter
+
+from .metrics import record_generation
+from .reporting import get_reporter
+
+# Transient server errors worth retrying
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+# Ollama's context window when a model reports none
+DEFAULT_CONTEXT_LENGTH = 2048
+
+
+def parse_context_length(model_info):
+    """
+    Read a model's context window from an /api/show response
+    
+    The Modelfile's num_ctx parameter wins because it is what Ollama loads
+    the model with; otherwise the trained context length is used.
+    
+    Args:
+        model_info (dict): Response from get_model_info()
+        
+    Returns:
+        int: Context window in tokens, or None if not reported
+    """
+    if not model_info:
+        return None
+    for line in (model_info.get('parameters') or "").splitlines():
+        name, _, value = line.strip().partition(" ")
+        if name == "num_ctx" and value.strip().isdigit():
+            return int(value.strip())
+    for key, value in (model_info.get('model_info') or {}).items():
+        if key.endswith(".context_length") and isinstance(value, int):
+            return value
+    return None
+
+
+def parse_keep_alive(value):
+    """
+    Convert a keep_alive setting (e.g. from an environment variable) for the API
+    
+    Ollama accepts a duration string ("30m") or a number of seconds (-1 keeps
+    the model loaded); a bare number given as a string must be sent as a number.
+    
+    Args:
+        value (str | int): Setting, None or "" for the server default
+        
+    Returns:
+        str | int: Value for the keep_alive request field, or None
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value)
+    return value
+
+
+def parse_timings(response):
+    """
+    Read the durations Ollama reports with a finished generation
+    
+    Args:
+        response (dict): Final response chunk (load_duration, prompt_eval_duration,
+            eval_duration and total_duration in nanoseconds, with token counts)
+            
+    Returns:
+        dict: load_seconds, prompt_eval_seconds, eval_seconds, total_seconds,
+            prompt_tokens, eval_tokens and tokens_per_second, or {} if not reported
+    """
+    if not response or 'total_duration' not in response:
+        return {}
+    timings = {
+        'load_seconds': response.get('load_duration', 0) / 1e9,
+        'prompt_eval_seconds': response.get('prompt_eval_duration', 0) / 1e9,
+        'eval_seconds': response.get('eval_duration', 0) / 1e9,
+        'total_seconds': response.get('total_duration', 0) / 1e9,
+        'prompt_tokens': response.get('prompt_eval_count', 0),
+        'eval_tokens': response.get('eval_count', 0)
+    }
+    timings['tokens_per_second'] = (
+        timings['eval_tokens'] / timings['eval_seconds'] if timings['eval_seconds'] else 0.0
+    )
+    return timings
+
+
+class OllamaStatusError(Exception):
+    """Ollama answered a generation request with an error status"""
+    
+    def __init__(self, status_code):
+        super().__init__(f"Ollama API returned status code: {status_code}")
+        self.status_code = status_code
+
+
+def describe_error(error):
+    """
+    User-facing message for an exception raised by a generation request
+    
+    Args:
+        error (Exception): Exception from OllamaClient.send_generation()
+        
+    Returns:
+        str: Message for the reporter
+    """
+    if isinstance(error, requests.Timeout):
+        return "Request timed out. Try a shorter document or different model."
+    if isinstance(error, requests.ConnectionError):
+        return "Cannot connect to Ollama. Ensure it's running: ollama serve"
+    if isinstance(error, OllamaStatusError):
+        return str(error)
+    return f"Generation error: {str(error)}"
+
+
+class GenerationStream:
+    """Iterator over the tokens of a streaming Ollama response"""
+    
+    def __init__(self, response, reporter=None, model=None):
+        """
+        Wrap a streaming HTTP response
+        
+        Args:
+            response: requests.Response opened with stream=True
+            reporter (Reporter): Error sink (defaults to get_reporter())
+            model (str): Model name the timings are recorded under
+        """
+        self.response = response
+        self.reporter = reporter
+        self.model = model
+        self.parts = []
+        self.stats = {}
+        self.done = False
+        self.error = None
+        self.on_complete = []
+        self.on_close = []
+        self._closed = False
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def __del__(self):
+        # A stream dropped without being read or closed still frees its connection
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    def close(self):
+        """
+        Close the response and run the on_close callbacks
+        
+        Called when iteration ends, on leaving a with block and when the
+        stream is garbage collected; only the first call has an effect.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self.response.close()
+        for callback in self.on_close:
+            callback(self)
+    
+    def __iter__(self):
+        """
+        Parse Ollama's NDJSON chunks as they arrive
+        
+        Callbacks in on_close run with the stream once the response is
+        closed, whether it completed, failed or was abandoned.
+        
+        Yields:
+            str: Generated text fragments
+        """
+        if self._closed:
+            return
+        try:
+            for line in self.response.iter_lines():
+                if not line:
+                    continue
+                token = self._parse_line(line)
+                if token:
+                    yield token
+                if self.done or self.error:
+                    break
+        finally:
+            self.close()
+        self._finish()
+    
+    def _parse_line(self, line):
+        """
+        Consume one NDJSON chunk
+        
+        Args:
+            line (str | bytes): One line of the response body
+            
+        Returns:
+            str: Text fragment carried by the chunk (may be empty)
+        """
+        chunk = json.loads(line)
+        if 'error' in chunk:
+            self.error = chunk['error']
+            return ""
+        
+        # /api/generate streams "response", /api/chat streams "message"
+        token = chunk.get('response') or chunk.get('message', {}).get('content', '')
+        if token:
+            self.parts.append(token)
+        
+        if chunk.get('done'):
+            self.stats = {
+                key: value for key, value in chunk.items()
+                if key not in ('response', 'message', 'context')
+            }
+            self.done = True
+        return token
+    
+    def _finish(self):
+        """Report errors or run completion callbacks once the stream ends"""
+        if self.error:
+            (self.reporter or get_reporter()).error(f"Generation error: {self.error}")
+        elif self.done:
+            record_generation(self.model, self.timings)
+            for callback in self.on_complete:
+                callback(self.text)
+    
+    @property
+    def text(self):
+        """Text received so far"""
+        return "".join(self.parts)
+    
+    @property
+    def timings(self):
+        """Load and eval durations of the finished generation (see parse_timings)"""
+        return parse_timings(self.stats)
 
 
 class OllamaClient:
     """Client for Ollama API communication"""
     
-    def __init__(self, base_url="http://localhost:11434"):
+    def __init__(self, base_url="http://localhost:11434", pool_size=10, max_retries=3,
+                 backoff_factor=0.5, backoff_max=8.0, connect_timeout=5, read_timeout=300,
+                 probe_timeout=5, reporter=None, keep_alive=None):
         """
         Initialize Ollama client
         
         Args:
             base_url (str): Base URL for Ollama server
+            pool_size (int): Keep-alive connections kept open to the server
+            max_retries (int): Retries on connection errors and 5xx responses
+            backoff_factor (float): Base delay in seconds, doubled per retry
+            backoff_max (float): Upper bound on a single retry delay
+            connect_timeout (float): Seconds to establish a connection
+            read_timeout (float): Seconds to wait for generation responses
+            probe_timeout (float): Read timeout for status and model queries
+            reporter (Reporter): Error sink (defaults to get_reporter() at call time)
+            keep_alive: How long the model, and the prompt cache shared by requests
+                on the same document, stays loaded after a request ("10m", seconds,
+                or -1 for ever); None uses the server's OLLAMA_KEEP_ALIVE
         """
         self.base_url = base_url
+        self._reporter = reporter
         self.generate_url = f"{base_url}/api/generate"
         self.chat_url = f"{base_url}/api/chat"
         self.models_url = f"{base_url}/api/tags"
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.timeout = (connect_timeout, read_timeout)
+        self.probe_timeout = (connect_timeout, probe_timeout)
+        self.keep_alive = keep_alive
+        self._context_lengths = {}
+        
+        # Timings of the most recent non-streamed generation, and of model warm-ups
+        self.last_timings = {}
+        self.warm_timings = {}
+        self._warming = set()
+        self._warm_lock = threading.Lock()
+        
+        # Pooled keep-alive connections shared by all calls (and threads)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    @property
+    def reporter(self):
+        """Reporter for user-facing errors"""
+        return self._reporter or get_reporter()
+    
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+    
+    def _backoff_delay(self, attempt):
+        """
+        Exponential backoff with full jitter
+        
+        Args:
+            attempt (int): Zero-based retry number
+            
+        Returns:
+            float: Seconds to sleep before the next attempt
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * (2 ** attempt)))
+    
+    def _request(self, method, url, retries=None, timeout=None, **kwargs):
+        """
+        Send a request over the pooled session, retrying transient failures
+        
+        Connection errors (including resets and connect timeouts) and 5xx
+        responses are retried; read timeouts are not, since the server may
+        still be generating.
+        
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            retries (int): Override for max_retries
+            timeout: Override for (connect, read) timeout
+            **kwargs: Passed to requests.Session.request
+            
+        Returns:
+            requests.Response: Final response
+        """
+        retries = self.max_retries if retries is None else retries
+        for attempt in range(retries + 1):
+            try:
+                response = self.session.request(
+                    method,
+                    url,
+                    timeout=timeout or self.timeout,
+                    **kwargs
+                )
+            except requests.ConnectionError:
+                if attempt == retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                    return response
+                response.close()
+            time.sleep(self._backoff_delay(attempt))
     
     def check_connection(self):
         """
@@ -31,7 +358,7 @@ class OllamaClient:
             bool: True if connected, False otherwise
         """
         try:
-            response = requests.get(self.models_url, timeout=5)
+            response = self._request("GET", self.models_url, retries=0, timeout=self.probe_timeout)
             return response.status_code == 200
         except Exception:
             return False
@@ -44,7 +371,7 @@ class OllamaClient:
             list: List of model names
         """
         try:
-            response = requests.get(self.models_url, timeout=5)
+            response = self._request("GET", self.models_url, timeout=self.probe_timeout)
             if response.status_code == 200:
                 models_data = response.json()
                 return [model['name'] for model in models_data.get('models', [])]
@@ -52,7 +379,78 @@ class OllamaClient:
         except Exception:
             return []
     
-    def generate(self, model, prompt, stream=False):
+    def list_loaded_models(self):
+        """
+        Get the models currently loaded in memory (/api/ps)
+        
+        Returns:
+            list: Model names, or None if the server could not be asked
+        """
+        try:
+            response = self._request(
+                "GET",
+                f"{self.base_url}/api/ps",
+                retries=0,
+                timeout=self.probe_timeout
+            )
+            if response.status_code == 200:
+                return [model['name'] for model in response.json().get('models', [])]
+            return None
+        except Exception:
+            return None
+    
+    def build_payload(self, model, stream, **fields):
+        """
+        Request body for /api/generate or /api/chat
+        
+        Args:
+            model (str): Model name
+            stream (bool): Whether to stream response
+            **fields: prompt and options, or messages
+            
+        Returns:
+            dict: JSON body including the client's keep_alive
+        """
+        payload = {"model": model, "stream": stream}
+        payload.update((key, value) for key, value in fields.items() if value is not None)
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        return payload
+    
+    def send_generation(self, url, payload):
+        """
+        POST a generation request without catching its errors
+        
+        generate() and chat() report failures through the reporter;
+        OllamaPool uses this to tell failing hosts from failed requests.
+        
+        Args:
+            url (str): generate_url or chat_url
+            payload (dict): Body from build_payload()
+            
+        Returns:
+            str: Generated text (GenerationStream if streaming)
+            
+        Raises:
+            requests.RequestException: Connection errors and timeouts
+            OllamaStatusError: Non-200 response after retries
+        """
+        stream = payload["stream"]
+        response = self._request("POST", url, json=payload, stream=stream)
+        if response.status_code != 200:
+            response.close()
+            raise OllamaStatusError(response.status_code)
+        if stream:
+            return GenerationStream(response, self.reporter, payload["model"])
+        
+        data = response.json()
+        self.last_timings = parse_timings(data)
+        record_generation(payload["model"], self.last_timings)
+        if "messages" in payload:
+            return data['message']['content']
+        return data['response']
+    
+    def generate(self, model, prompt, stream=False, options=None):
         """
         Generate text using Ollama model
         
@@ -60,41 +458,77 @@ class OllamaClient:
             model (str): Model name to use
             prompt (str): Input prompt
             stream (bool): Whether to stream response
+            options (dict): Model parameters such as num_ctx
             
         Returns:
-            str: Generated text or None if failed
+            str: Generated text (GenerationStream if streaming) or None if failed
         """
         try:
-            payload = {
-                "model": model,
-                "prompt": prompt,
-                "stream": stream
-            }
-            
-            response = requests.post(
+            return self.send_generation(
                 self.generate_url,
-                json=payload,
-                timeout=300  # 5 minutes timeout
+                self.build_payload(model, stream, prompt=prompt, options=options)
             )
+        except Exception as e:
+            self.reporter.error(describe_error(e))
+            return None
+    
+    def warm_up(self, model, background=True):
+        """
+        Load a model into memory ahead of its first request
+        
+        Sends a generate request without a prompt, which makes Ollama load
+        the model and hold it for keep_alive. Warm-ups already in flight for
+        the same model are not repeated; repeating one for a loaded model is
+        cheap and renews its keep_alive.
+        
+        Args:
+            model (str): Model name
+            background (bool): Return at once and load in a daemon thread
             
-            if response.status_code == 200:
-                if stream:
-                    return response
-                else:
-                    return response.json()['response']
-            else:
-                st.error(f"Ollama API returned status code: {response.status_code}")
+        Returns:
+            dict: Timings of the load (see parse_timings), or None if it runs in
+                the background, is already running or failed
+        """
+        with self._warm_lock:
+            if model in self._warming:
                 return None
-                
-        except requests.Timeout:
-            st.error("Request timed out. Try a shorter document or different model.")
-            return None
-        except requests.ConnectionError:
-            st.error("Cannot connect to Ollama. Ensure it's running: ollama serve")
+            self._warming.add(model)
+        
+        if background:
+            threading.Thread(target=self._warm_up, args=(model,), daemon=True).start()
             return None
-        except Exception as e:
-            st.error(f"Generation error: {str(e)}")
+        return self._warm_up(model)
+    
+    def _warm_up(self, model):
+        """Load a model and record its timings in warm_timings (best effort)"""
+        try:
+            payload = {"model": model, "stream": False}
+            if self.keep_alive is not None:
+                payload["keep_alive"] = self.keep_alive
+            response = self._request("POST", self.generate_url, json=payload)
+            if response.status_code != 200:
+                return None
+            timings = parse_timings(response.json())
+            self.warm_timings[model] = timings
+            record_generation(model, timings)
+            return timings
+        except Exception:
             return None
+        finally:
+            with self._warm_lock:
+                self._warming.discard(model)
+    
+    def is_warming(self, model):
+        """
+        Check whether a warm-up of a model is in flight
+        
+        Args:
+            model (str): Model name
+            
+        Returns:
+            bool: True while the model is being loaded by warm_up()
+        """
+        return model in self._warming
     
     def chat(self, model, messages, stream=False):
         """
@@ -106,30 +540,17 @@ class OllamaClient:
             stream (bool): Whether to stream response
             
         Returns:
-            str: Response text or None if failed
+            str: Response text (GenerationStream if streaming) or None if failed
         """
         try:
-            payload = {
-                "model": model,
-                "messages": messages,
-                "stream": stream
-            }
-            
-            response = requests.post(
+            return self.send_generation(
                 self.chat_url,
-                json=payload,
-                timeout=300
+                self.build_payload(model, stream, messages=messages)
             )
-            
-            if response.status_code == 200:
-                if stream:
-                    return response
-                else:
-                    return response.json()['message']['content']
+        except OllamaStatusError:
             return None
-            
         except Exception as e:
-            st.error(f"Chat error: {str(e)}")
+            self.reporter.error(f"Chat error: {str(e)}")
             return None
     
     def get_model_info(self, model_name):
@@ -143,13 +564,36 @@ class OllamaClient:
             dict: Model information or None
         """
         try:
-            response = requests.post(
+            response = self._request(
+                "POST",
                 f"{self.base_url}/api/show",
                 json={"name": model_name},
-                timeout=5
+                timeout=self.probe_timeout
             )
             if response.status_code == 200:
                 return response.json()
             return None
         except Exception:
             return None
+    
+    def get_context_length(self, model_name):
+        """
+        Get the context window of a model in tokens
+        
+        Successful lookups are remembered per model.
+        
+        Args:
+            model_name (str): Name of the model
+            
+        Returns:
+            int: Context window (DEFAULT_CONTEXT_LENGTH if unknown)
+        """
+        if model_name in self._context_lengths:
+            return self._context_lengths[model_name]
+        
+        info = self.get_model_info(model_name)
+        if info is None:
+            return DEFAULT_CONTEXT_LENGTH
+        length = parse_context_length(info) or DEFAULT_CONTEXT_LENGTH
+        self._context_lengths[model_name] = length
+        return length
@@ -0,0 +1,635 @@
+"""
+Ollama Pool Module
+File: backend/ollama_pool.py
+Description: Spread requests over several Ollama servers with health checks and failover
+
+An OllamaPool holds one OllamaClient per server and offers the same methods,
+so AISummarizer, JobQueue and the CLI use it unchanged. Each request goes to
+the available host with the fewest requests in flight; with
+routing="model_loaded" a host that already has the model in memory is
+preferred while it has free slots. A host whose requests keep failing is
+ejected by its circuit breaker and gets a single trial request after
+reset_timeout; a request failing on a host that way is sent to another. A
+daemon thread probes every host each health_interval seconds for its models
+(/api/tags) and the models it has loaded (/api/ps). Requests made inside
+document_affinity() stick to one host, so they share its KV cache.
+"""
+
+import contextvars
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import requests
+
+from .ollama_client import (
+    DEFAULT_CONTEXT_LENGTH,
+    GenerationStream,
+    OllamaClient,
+    OllamaStatusError,
+    describe_error,
+    parse_context_length
+)
+from .reporting import get_reporter
+
+ROUTING = ("least_outstanding", "model_loaded")
+
+# Documents whose host is remembered for document_affinity()
+MAX_AFFINITY_KEYS = 1024
+
+# Affinity key of the current context (see document_affinity)
+_affinity = contextvars.ContextVar("ollama_affinity", default=None)
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def parse_hosts(value):
+    """
+    Split a comma-separated list of Ollama URLs (e.g. from OLLAMA_HOSTS)
+    
+    Args:
+        value (str): URLs separated by commas
+        
+    Returns:
+        list: URLs without trailing slashes
+    """
+    return [url.strip().rstrip("/") for url in (value or "").split(",") if url.strip()]
+
+
+@contextmanager
+def document_affinity(key):
+    """
+    Send the requests made in this context to the same host
+    
+    Requests on one document share its prompt prefix, and only the host
+    that evaluated it has the prefix in its KV cache. Inside the block an
+    OllamaPool sends requests to the host that last served key, as long as
+    it has free slots; other clients ignore it. The key carries over into
+    thread pools used through metrics.submit().
+    
+    Args:
+        key (str): Identifies the document, e.g. a hash of its prepared text
+    """
+    token = _affinity.set(key)
+    try:
+        yield
+    finally:
+        _affinity.reset(token)
+
+
+def _host_failure(error):
+    """Whether an exception from send_generation() means the host, not the request, failed"""
+    if isinstance(error, OllamaStatusError):
+        return error.status_code >= 500
+    # Connect timeouts are connection errors; read timeouts are not
+    return isinstance(error, requests.ConnectionError)
+
+
+def _model_key(name):
+    """Model name with Ollama's implicit ":latest" tag"""
+    return name if ":" in name else f"{name}:latest"
+
+
+def _lists_model(names, model):
+    """Check whether a list of model names contains a model"""
+    key = _model_key(model)
+    return any(_model_key(name) == key for name in names)
+
+
+class CircuitBreaker:
+    """Stop sending requests to a host after repeated failures
+    
+    Closed, the host takes requests. failure_threshold consecutive failures
+    open it; after reset_timeout it is half open and admits one trial
+    request, whose success closes it and whose failure opens it again.
+    Not thread-safe: OllamaPool calls it under its lock.
+    """
+    
+    def __init__(self, failure_threshold=3, reset_timeout=30.0):
+        """
+        Initialize circuit breaker
+        
+        Args:
+            failure_threshold (int): Consecutive failures that open the breaker
+            reset_timeout (float): Seconds an open breaker rejects requests
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+    
+    @property
+    def state(self):
+        """CLOSED, OPEN or HALF_OPEN"""
+        if self.opened_at is None:
+            return CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+    
+    def available(self):
+        """
+        Check whether a request may be sent
+        
+        Returns:
+            bool: True if closed, or half open without a trial in flight
+        """
+        state = self.state
+        return state == CLOSED or (state == HALF_OPEN and not self._trial)
+    
+    def acquire(self):
+        """Note a request sent; in the half-open state it is the trial"""
+        if self.state == HALF_OPEN:
+            self._trial = True
+    
+    def record_success(self):
+        """Close the breaker"""
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+    
+    def record_inconclusive(self):
+        """End a request that says nothing about the host, freeing the trial slot"""
+        self._trial = False
+    
+    def record_failure(self):
+        """Count a failure, opening the breaker at the threshold or after a failed trial"""
+        self.failures += 1
+        self._trial = False
+        if self.failures >= self.failure_threshold or self.opened_at is not None:
+            self.opened_at = time.monotonic()
+    
+    def trip(self):
+        """Open the breaker at once, e.g. when the host is unreachable"""
+        self.failures = max(self.failures, self.failure_threshold)
+        self.opened_at = time.monotonic()
+        self._trial = False
+    
+    def probe_succeeded(self):
+        """Let an open breaker admit its trial request now that the host answers again"""
+        if self.opened_at is not None:
+            self.opened_at = min(self.opened_at, time.monotonic() - self.reset_timeout)
+
+
+class OllamaHost:
+    """One server of an OllamaPool and its routing state"""
+    
+    def __init__(self, client, breaker):
+        """
+        Initialize host
+        
+        Args:
+            client (OllamaClient): Client for the server
+            breaker (CircuitBreaker): Breaker ejecting the server on failures
+        """
+        self.client = client
+        self.breaker = breaker
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.models = None      # /api/tags names, None until the first health check
+        self.loaded = []        # /api/ps names, plus models that served a request since
+        self.checked_at = None
+    
+    @property
+    def url(self):
+        """Base URL of the server"""
+        return self.client.base_url
+    
+    def serves(self, model):
+        """Check whether the host has a model (assumed until its models are known)"""
+        return self.models is None or _lists_model(self.models, model)
+    
+    def has_loaded(self, model):
+        """Check whether the host has a model in memory"""
+        return _lists_model(self.loaded, model)
+
+
+class OllamaPool:
+    """Load-balancing client for several Ollama servers"""
+    
+    def __init__(self, urls, routing="least_outstanding", host_parallel=4, failure_threshold=3,
+                 reset_timeout=30.0, health_interval=10.0, reporter=None, **client_options):
+        """
+        Initialize Ollama pool
+        
+        Args:
+            urls (list): Base URLs of the Ollama servers
+            routing (str): "least_outstanding" sends each request to the host with
+                the fewest in flight; "model_loaded" prefers hosts that have the
+                model in memory while they have free slots
+            host_parallel (int): Requests one host runs at once (its OLLAMA_NUM_PARALLEL)
+            failure_threshold (int): Consecutive failures that eject a host
+            reset_timeout (float): Seconds before an ejected host gets a trial request
+            health_interval (float): Seconds between health checks (0 checks only on demand)
+            reporter (Reporter): Error sink (defaults to get_reporter() at call time)
+            **client_options: Passed to every OllamaClient (pool_size, keep_alive,
+                timeouts, ...); max_retries defaults to 1, since failing over to
+                another host beats backing off on a failing one
+        """
+        if routing not in ROUTING:
+            raise ValueError(f"Unknown routing: {routing}")
+        urls = list(urls)
+        if not urls:
+            raise ValueError("OllamaPool needs at least one URL")
+        
+        self.routing = routing
+        self.host_parallel = max(1, host_parallel)
+        self.health_interval = health_interval
+        self._reporter = reporter
+        client_options.setdefault('max_retries', 1)
+        self.hosts = [
+            OllamaHost(
+                OllamaClient(base_url=url, **client_options),
+                CircuitBreaker(failure_threshold, reset_timeout)
+            )
+            for url in urls
+        ]
+        self.last_timings = {}
+        self._context_lengths = {}
+        self._affinity_hosts = OrderedDict()
+        self._checked_at = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        
+        if health_interval:
+            threading.Thread(target=self._check_loop, daemon=True, name="ollama-health").start()
+    
+    @property
+    def reporter(self):
+        """Reporter for user-facing errors"""
+        return self._reporter or get_reporter()
+    
+    @property
+    def urls(self):
+        """Base URLs of all hosts"""
+        return [host.url for host in self.hosts]
+    
+    @property
+    def keep_alive(self):
+        """keep_alive sent with every request"""
+        return self.hosts[0].client.keep_alive
+    
+    @property
+    def max_concurrency(self):
+        """Requests all hosts run at once; AISummarizer sizes its map stage to it"""
+        return len(self.hosts) * self.host_parallel
+    
+    def close(self):
+        """Stop health checks and close pooled connections"""
+        self._stop.set()
+        for host in self.hosts:
+            host.client.close()
+    
+    def _check_loop(self):
+        """Probe all hosts every health_interval seconds until close()"""
+        while not self._stop.is_set():
+            self.check_health()
+            self._stop.wait(self.health_interval)
+    
+    def check_health(self):
+        """
+        Probe every host in parallel
+        
+        Reachable hosts refresh their model lists and let an open breaker
+        admit a trial request; unreachable hosts are ejected.
+        
+        Returns:
+            int: Number of reachable hosts
+        """
+        with ThreadPoolExecutor(max_workers=len(self.hosts)) as pool:
+            reachable = sum(pool.map(self._check_host, self.hosts))
+        self._checked_at = time.monotonic()
+        return reachable
+    
+    def _check_host(self, host):
+        """Probe one host (see check_health)"""
+        client = host.client
+        if not client.check_connection():
+            with self._lock:
+                host.breaker.trip()
+            return False
+        models = client.list_models()
+        loaded = client.list_loaded_models()
+        with self._lock:
+            host.models = models
+            if loaded is not None:
+                host.loaded = loaded
+            host.checked_at = time.monotonic()
+            host.breaker.probe_succeeded()
+        return True
+    
+    def _ensure_checked(self):
+        """Run a health check unless the checker thread ran one recently"""
+        if (self._checked_at is None
+                or time.monotonic() - self._checked_at > max(2 * self.health_interval, 1.0)):
+            self.check_health()
+    
+    def _available(self):
+        """Hosts whose breaker is not open"""
+        with self._lock:
+            return [host for host in self.hosts if host.breaker.state != OPEN]
+    
+    def check_connection(self):
+        """
+        Check if any Ollama server is usable
+        
+        Returns:
+            bool: True if at least one host is reachable and not ejected
+        """
+        self._ensure_checked()
+        return bool(self._available())
+    
+    def list_models(self):
+        """
+        Get the models available on any host
+        
+        Returns:
+            list: Model names, in host order without duplicates
+        """
+        self._ensure_checked()
+        models = []
+        for host in self._available():
+            for name in host.models or []:
+                if not _lists_model(models, name):
+                    models.append(name)
+        return models
+    
+    def status(self):
+        """
+        Describe the routing state of every host
+        
+        Returns:
+            list: One dict per host with url, state, outstanding, requests,
+                failures, models and loaded
+        """
+        with self._lock:
+            return [{
+                'url': host.url,
+                'state': host.breaker.state,
+                'outstanding': host.outstanding,
+                'requests': host.requests,
+                'failures': host.failures,
+                'models': list(host.models or []),
+                'loaded': list(host.loaded)
+            } for host in self.hosts]
+    
+    def _pick(self, model, tried, key=None):
+        """
+        Choose the host for the next request and count it as outstanding
+        
+        Args:
+            model (str): Model name
+            tried (list): Hosts that already failed this request
+            key (str): document_affinity() key of the request
+            
+        Returns:
+            OllamaHost: Chosen host, or None if no host is left
+        """
+        with self._lock:
+            candidates = [
+                host for host in self.hosts
+                if host not in tried and host.breaker.available()
+            ]
+            candidates = [host for host in candidates if host.serves(model)] or candidates
+            pinned = self._affinity_hosts.get(key) if key is not None else None
+            if pinned in candidates and pinned.outstanding < self.host_parallel:
+                candidates = [pinned]
+            elif self.routing == "model_loaded":
+                loaded = [
+                    host for host in candidates
+                    if host.has_loaded(model) and host.outstanding < self.host_parallel
+                ]
+                candidates = loaded or candidates
+            if not candidates:
+                return None
+            # Fewest in flight; among equals, fewest so far, so idle hosts take turns
+            host = min(candidates, key=lambda h: (h.outstanding, h.requests))
+            host.breaker.acquire()
+            host.outstanding += 1
+            host.requests += 1
+            if key is not None:
+                self._affinity_hosts[key] = host
+                self._affinity_hosts.move_to_end(key)
+                if len(self._affinity_hosts) > MAX_AFFINITY_KEYS:
+                    self._affinity_hosts.popitem(last=False)
+            return host
+    
+    def _release(self, host, model, succeeded):
+        """
+        Record the end of a request on a host
+        
+        Args:
+            host (OllamaHost): Host that handled the request
+            model (str): Model name
+            succeeded (bool): Outcome; None if it says nothing about the host
+        """
+        with self._lock:
+            host.outstanding -= 1
+            if succeeded:
+                host.breaker.record_success()
+                if not host.has_loaded(model):
+                    host.loaded.append(model)
+            elif succeeded is None:
+                host.breaker.record_inconclusive()
+            else:
+                host.failures += 1
+                host.breaker.record_failure()
+    
+    def _stream_closed(self, host, model, stream):
+        """on_close callback of a GenerationStream served by a host"""
+        if stream.error:
+            self._release(host, model, False)
+        else:
+            # A stream closed early was abandoned by the caller, not failed by the host
+            self._release(host, model, True if stream.done else None)
+    
+    def _call(self, model, url_name, stream, **fields):
+        """
+        Send a generation request to the best host, failing over to the others
+        
+        Only connection errors and 5xx responses count against a host and
+        move the request on. A read timeout, a 4xx (e.g. an unknown model)
+        or a malformed reply fails the request at once: another host would
+        wait or refuse the same way, and the host itself is fine.
+        
+        Args:
+            model (str): Model name
+            url_name (str): OllamaClient endpoint attribute (generate_url or chat_url)
+            stream (bool): Whether to stream response
+            **fields: prompt and options, or messages
+            
+        Returns:
+            str: Generated text (GenerationStream if streaming) or None if failed
+        """
+        reporter = self.reporter
+        key = _affinity.get()
+        tried = []
+        error = None
+        
+        while True:
+            host = self._pick(model, tried, key)
+            if host is None:
+                break
+            tried.append(host)
+            client = host.client
+            try:
+                result = client.send_generation(
+                    getattr(client, url_name),
+                    client.build_payload(model, stream, **fields)
+                )
+            except Exception as e:
+                error = e
+                if _host_failure(e):
+                    self._release(host, model, False)
+                    continue
+                self._release(host, model, None)
+                break
+            
+            if isinstance(result, GenerationStream):
+                # Errors while streaming go to the caller's reporter
+                result.reporter = self._reporter
+                result.on_close.append(
+                    lambda stream, host=host: self._stream_closed(host, model, stream)
+                )
+                return result
+            self.last_timings = client.last_timings
+            self._release(host, model, True)
+            return result
+        
+        reporter.error(describe_error(error) if error else "No Ollama host is available")
+        return None
+    
+    def generate(self, model, prompt, stream=False, options=None):
+        """
+        Generate text on the best available host (see OllamaClient.generate)
+        
+        Args:
+            model (str): Model name to use
+            prompt (str): Input prompt
+            stream (bool): Whether to stream response
+            options (dict): Model parameters such as num_ctx
+            
+        Returns:
+            str: Generated text (GenerationStream if streaming) or None if failed
+        """
+        return self._call(model, "generate_url", stream, prompt=prompt, options=options)
+    
+    def chat(self, model, messages, stream=False):
+        """
+        Chat completion on the best available host (see OllamaClient.chat)
+        
+        Args:
+            model (str): Model name
+            messages (list): List of message dictionaries
+            stream (bool): Whether to stream response
+            
+        Returns:
+            str: Response text (GenerationStream if streaming) or None if failed
+        """
+        return self._call(model, "chat_url", stream, messages=messages)
+    
+    def _hosts_with(self, model):
+        """Available hosts that have a model"""
+        return [host for host in self._available() if host.serves(model)]
+    
+    def warm_up(self, model, background=True):
+        """
+        Load a model on every available host that has it
+        
+        Args:
+            model (str): Model name
+            background (bool): Return at once and load in daemon threads
+            
+        Returns:
+            dict: Timings of the slowest load, or None if they run in the background
+                or all failed
+        """
+        hosts = self._hosts_with(model)
+        if background:
+            for host in hosts:
+                host.client.warm_up(model)
+            return None
+        
+        with ThreadPoolExecutor(max_workers=len(hosts) or 1) as pool:
+            results = list(pool.map(lambda host: host.client.warm_up(model, False), hosts))
+        for host, timings in zip(hosts, results):
+            if timings is not None:
+                with self._lock:
+                    if not host.has_loaded(model):
+                        host.loaded.append(model)
+        results = [timings for timings in results if timings]
+        if not results:
+            return None
+        return max(results, key=lambda timings: timings.get('load_seconds', 0.0))
+    
+    def is_warming(self, model):
+        """
+        Check whether a warm-up of a model is in flight on any host
+        
+        Args:
+            model (str): Model name
+            
+        Returns:
+            bool: True while any host is loading the model for warm_up()
+        """
+        return any(host.client.is_warming(model) for host in self.hosts)
+    
+    @property
+    def warm_timings(self):
+        """Timings of the slowest finished warm-up of each model"""
+        timings = {}
+        for host in self.hosts:
+            for model, host_timings in host.client.warm_timings.items():
+                slowest = timings.get(model, {}).get('load_seconds', -1.0)
+                if host_timings.get('load_seconds', 0.0) > slowest:
+                    timings[model] = host_timings
+        return timings
+    
+    def get_model_info(self, model_name):
+        """
+        Get information about a model from the first host that has it
+        
+        Args:
+            model_name (str): Name of the model
+            
+        Returns:
+            dict: Model information or None
+        """
+        for host in self._hosts_with(model_name):
+            info = host.client.get_model_info(model_name)
+            if info is not None:
+                return info
+        return None
+    
+    def get_context_length(self, model_name):
+        """
+        Get the smallest context window of a model across its hosts
+        
+        Any host may receive a prompt, so it has to fit the smallest one.
+        Successful lookups are remembered per model.
+        
+        Args:
+            model_name (str): Name of the model
+            
+        Returns:
+            int: Context window (DEFAULT_CONTEXT_LENGTH if unknown)
+        """
+        if model_name in self._context_lengths:
+            return self._context_lengths[model_name]
+        
+        lengths = [
+            parse_context_length(host.client.get_model_info(model_name))
+            for host in self._hosts_with(model_name)
+        ]
+        lengths = [length for length in lengths if length]
+        if not lengths:
+            return DEFAULT_CONTEXT_LENGTH
+        self._context_lengths[model_name] = min(lengths)
+        return self._context_lengths[model_name]
@@ -4,53 +4,333 @@ File: backend/pdf_extractor.py
 Description: Handles PDF text extraction
 """
 
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import PyPDF2
-import streamlit as st
+
+from .metrics import record_stage
+from .reporting import get_reporter
+
+# Documents shorter than this are extracted serially; process start-up costs more
+PARALLEL_MIN_PAGES = 40
+
+
+def _read_pdf_bytes(pdf_file):
+    """Return the raw bytes of an uploaded file, path or binary stream"""
+    if hasattr(pdf_file, 'getvalue'):
+        return pdf_file.getvalue()
+    if isinstance(pdf_file, (str, os.PathLike)):
+        with open(pdf_file, 'rb') as f:
+            return f.read()
+    pdf_file.seek(0)
+    return pdf_file.read()
+
+
+# PDF parsed once per worker process by _init_worker()
+_worker_reader = None
+
+
+def _init_worker(pdf_bytes):
+    """
+    Parse the PDF once when a worker process starts
+    
+    Args:
+        pdf_bytes (bytes): Complete PDF content
+    """
+    global _worker_reader
+    _worker_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+
+
+def _extract_page_range(start, end):
+    """
+    Extract text from pages [start, end) in a worker process
+    
+    Args:
+        start (int): First page index
+        end (int): Page index after the last page
+        
+    Returns:
+        tuple: (start, list of page texts)
+    """
+    return start, [_worker_reader.pages[i].extract_text() for i in range(start, end)]
+
+
+def process_context():
+    """
+    Start method for extraction worker pools
+    
+    Forking a multi-threaded process, such as Streamlit's server or the batch
+    CLI with its model warm-up and health check threads, can copy a lock held
+    by another thread into the child, so workers are started from a fresh
+    process instead: forkserver where available, otherwise spawn.
+    
+    Returns:
+        multiprocessing context
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class PDFDocument:
+    """Parsed PDF shared by validation, metadata and text extraction"""
+    
+    def __init__(self, pdf_file):
+        """
+        Load a PDF without parsing it yet
+        
+        Args:
+            pdf_file: Uploaded PDF file object, path or binary stream
+        """
+        self.data = _read_pdf_bytes(pdf_file)
+        self._reader = None
+        self._page_texts = None
+    
+    @classmethod
+    def open(cls, pdf_file):
+        """
+        Wrap a file in a PDFDocument, reusing an existing one
+        
+        Args:
+            pdf_file: PDFDocument or anything PDFDocument accepts
+            
+        Returns:
+            PDFDocument: Document handle
+        """
+        if isinstance(pdf_file, cls):
+            return pdf_file
+        return cls(pdf_file)
+    
+    @property
+    def reader(self):
+        """PdfReader, parsed on first access and reused afterwards"""
+        if self._reader is None:
+            self._reader = PyPDF2.PdfReader(io.BytesIO(self.data))
+        return self._reader
+    
+    @property
+    def page_count(self):
+        """Number of pages in the document"""
+        return len(self.reader.pages)
+    
+    def is_valid(self):
+        """
+        Check that the document parses and has a readable first page
+        
+        Returns:
+            bool: True if valid PDF, False otherwise
+        """
+        try:
+            if self.page_count > 0:
+                _ = self.reader.pages[0]
+                return True
+            return False
+        except Exception:
+            return False
+    
+    @property
+    def metadata(self):
+        """Title, author, subject and page count"""
+        info = self.reader.metadata
+        return {
+            'pages': self.page_count,
+            'title': info.get('/Title', 'Unknown') if info else 'Unknown',
+            'author': info.get('/Author', 'Unknown') if info else 'Unknown',
+            'subject': info.get('/Subject', 'Unknown') if info else 'Unknown',
+        }
+    
+    def page_text(self, page_index):
+        """
+        Extract one page, caching the result
+        
+        Args:
+            page_index (int): Page number (0-indexed)
+            
+        Returns:
+            str: Extracted text from the page
+        """
+        if self._page_texts is None:
+            self._page_texts = [None] * self.page_count
+        if self._page_texts[page_index] is None:
+            self._page_texts[page_index] = self.reader.pages[page_index].extract_text()
+        return self._page_texts[page_index]
+    
+    @property
+    def is_extracted(self):
+        """True once every page's text is cached"""
+        return self._page_texts is not None and None not in self._page_texts
+    
+    def iter_pages(self):
+        """
+        Lazily extract pages one at a time
+        
+        Yields:
+            tuple: (page_number, page_text) with 1-based page numbers
+        """
+        for page_index in range(self.page_count):
+            yield page_index + 1, self.page_text(page_index)
+    
+    def set_page_texts(self, page_texts):
+        """
+        Store page texts extracted elsewhere (e.g. by worker processes)
+        
+        Args:
+            page_texts (list): Text of every page in page order
+        """
+        self._page_texts = list(page_texts)
 
 
 class PDFTextExtractor:
     """Extract text from PDF documents"""
     
     @staticmethod
-    def extract_text_from_pdf(pdf_file):
+    def extract_text_from_pdf(pdf_file, workers=1, reporter=None):
         """
         Extract text from uploaded PDF file
         
         Args:
-            pdf_file: Uploaded PDF file object
+            pdf_file: Uploaded PDF file object or PDFDocument
+            workers (int): Worker processes for large documents (1 = serial)
+            reporter (Reporter): Progress/error sink (defaults to get_reporter())
             
         Returns:
             tuple: (extracted_text, total_pages) or (None, 0) if failed
         """
+        page_texts = PDFTextExtractor.extract_pages(pdf_file, workers, reporter)
+        if page_texts is None:
+            return None, 0
+        return PDFTextExtractor.join_pages(page_texts), len(page_texts)
+    
+    @staticmethod
+    def extract_pages(pdf_file, workers=1, reporter=None):
+        """
+        Extract text from every page, keeping page boundaries
+        
+        Args:
+            pdf_file: Uploaded PDF file object or PDFDocument
+            workers (int): Worker processes for large documents (1 = serial)
+            reporter (Reporter): Progress/error sink (defaults to get_reporter())
+            
+        Returns:
+            list: Page texts in page order, or None if failed
+        """
+        reporter = reporter or get_reporter()
+        progress = None
+        start = time.perf_counter()
         try:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            total_pages = len(pdf_reader.pages)
+            document = PDFDocument.open(pdf_file)
+            total_pages = document.page_count
             
-            # Create progress bar
-            progress_bar = st.progress(0)
-            status_text = st.empty()
+            # Create progress indicator
+            progress = reporter.progress()
             
-            # Extract text from each page
-            for page_num in range(total_pages):
-                status_text.text(f"Extracting page {page_num + 1} of {total_pages}...")
-                page = pdf_reader.pages[page_num]
-                page_text = page.extract_text()
-                text += page_text + "\n\n"
-                progress_bar.progress((page_num + 1) / total_pages)
+            parallel = workers > 1 and total_pages >= PARALLEL_MIN_PAGES
+            if parallel and not document.is_extracted:
+                page_texts = PDFTextExtractor._extract_parallel(
+                    document.data,
+                    total_pages,
+                    workers,
+                    progress
+                )
+                document.set_page_texts(page_texts)
+            else:
+                # Extract text from each page
+                page_texts = []
+                for page_number, page_text in document.iter_pages():
+                    page_texts.append(page_text)
+                    progress.update(
+                        page_number / total_pages,
+                        f"Extracting page {page_number} of {total_pages}..."
+                    )
             
+            return page_texts
+        
+        except PyPDF2.errors.PdfReadError:
+            reporter.error("Error: This PDF file is corrupted or invalid.")
+            return None
+        except Exception as e:
+            reporter.error(f"Extraction error: {str(e)}")
+            return None
+        finally:
+            record_stage("extract", time.perf_counter() - start)
             # Clean up progress indicators
-            progress_bar.empty()
-            status_text.empty()
+            if progress is not None:
+                progress.close()
+    
+    @staticmethod
+    def iter_pages(pdf_file):
+        """
+        Lazily extract pages one at a time
+        
+        Args:
+            pdf_file: Uploaded PDF file object or PDFDocument
             
-            return text, total_pages
+        Yields:
+            tuple: (page_number, page_text) with 1-based page numbers
+        """
+        return PDFDocument.open(pdf_file).iter_pages()
+    
+    @staticmethod
+    def join_pages(page_texts):
+        """
+        Join page texts into one document string
+        
+        Args:
+            page_texts (list): Page texts in page order
             
-        except PyPDF2.errors.PdfReadError:
-            st.error("Error: This PDF file is corrupted or invalid.")
-            return None, 0
-        except Exception as e:
-            st.error(f"Extraction error: {str(e)}")
-            return None, 0
+        Returns:
+            str: Document text with pages separated by blank lines
+        """
+        # Trailing empty item gives the final separator without a second copy
+        return "\n\n".join([*page_texts, ""]) if page_texts else ""
+    
+    @staticmethod
+    def _extract_parallel(pdf_bytes, total_pages, workers, progress):
+        """
+        Extract all pages across a process pool, preserving page order
+        
+        The bytes go to each worker once, through the pool initializer, and
+        are parsed there once; tasks only carry page ranges. Progress is
+        reported once per completed page range.
+        
+        Args:
+            pdf_bytes (bytes): Complete PDF content
+            total_pages (int): Number of pages in the document
+            workers (int): Number of worker processes
+            progress (ProgressTracker): Receives per-range progress
+            
+        Returns:
+            list: Page texts in page order
+        """
+        # Several ranges per worker keeps the pool busy when page costs vary
+        range_size = max(1, -(-total_pages // (workers * 4)))
+        ranges = [
+            (start, min(start + range_size, total_pages))
+            for start in range(0, total_pages, range_size)
+        ]
+        
+        page_texts = [None] * total_pages
+        done_pages = 0
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(ranges)),
+            mp_context=process_context(),
+            initializer=_init_worker,
+            initargs=(pdf_bytes,)
+        ) as pool:
+            futures = [pool.submit(_extract_page_range, start, end) for start, end in ranges]
+            for future in as_completed(futures):
+                start, texts = future.result()
+                page_texts[start:start + len(texts)] = texts
+                done_pages += len(texts)
+                progress.update(
+                    done_pages / total_pages,
+                    f"Extracted {done_pages} of {total_pages} pages..."
+                )
+        
+        return page_texts
     
     @staticmethod
     def validate_pdf(pdf_file):
@@ -58,18 +338,13 @@ class PDFTextExtractor:
         Validate if the uploaded file is a valid PDF
         
         Args:
-            pdf_file: Uploaded file object
+            pdf_file: Uploaded file object or PDFDocument
             
         Returns:
             bool: True if valid PDF, False otherwise
         """
         try:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            # Try to access first page to verify it's readable
-            if len(pdf_reader.pages) > 0:
-                _ = pdf_reader.pages[0]
-                return True
-            return False
+            return PDFDocument.open(pdf_file).is_valid()
         except Exception:
             return False
     
@@ -79,20 +354,13 @@ class PDFTextExtractor:
         Extract metadata from PDF
         
         Args:
-            pdf_file: Uploaded PDF file object
+            pdf_file: Uploaded PDF file object or PDFDocument
             
         Returns:
             dict: PDF metadata
         """
         try:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            metadata = {
-                'pages': len(pdf_reader.pages),
-                'title': pdf_reader.metadata.get('/Title', 'Unknown') if pdf_reader.metadata else 'Unknown',
-                'author': pdf_reader.metadata.get('/Author', 'Unknown') if pdf_reader.metadata else 'Unknown',
-                'subject': pdf_reader.metadata.get('/Subject', 'Unknown') if pdf_reader.metadata else 'Unknown',
-            }
-            return metadata
+            return PDFDocument.open(pdf_file).metadata
         except Exception:
             return {
                 'pages': 0,
@@ -102,24 +370,26 @@ class PDFTextExtractor:
             }
     
     @staticmethod
-    def extract_text_by_page(pdf_file, page_number):
+    def extract_text_by_page(pdf_file, page_number, reporter=None):
         """
         Extract text from a specific page
         
         Args:
-            pdf_file: Uploaded PDF file object
+            pdf_file: Uploaded PDF file object or PDFDocument
             page_number (int): Page number (0-indexed)
+            reporter (Reporter): Error sink (defaults to get_reporter())
             
         Returns:
             str: Extracted text from the page
         """
         try:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            if 0 <= page_number < len(pdf_reader.pages):
-                page = pdf_reader.pages[page_number]
-                return page.extract_text()
+            document = PDFDocument.open(pdf_file)
+            if 0 <= page_number < document.page_count:
+                return document.page_text(page_number)
             else:
                 return ""
         except Exception as e:
-            st.error(f"Error extracting page {page_number + 1}: {str(e)}")
+            (reporter or get_reporter()).error(
+                f"Error extracting page {page_number + 1}: {str(e)}"
+            )
             return ""
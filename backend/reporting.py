@@ -0,0 +1,107 @@
+"""
+Reporting Module
+File: backend/reporting.py
+Description: Pluggable progress and error reporting for backend modules
+
+Backend code never imports a UI toolkit. It reports through a Reporter;
+the default one logs errors and ignores progress, and the Streamlit app
+installs frontend.reporting.StreamlitReporter at start-up. Background
+work (see jobs.py) overrides it for its own context with use_reporter().
+"""
+
+import contextvars
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger("backend")
+
+
+class ProgressTracker:
+    """Progress of one long-running operation (no-op by default)"""
+    
+    def update(self, fraction, message=""):
+        """
+        Report progress
+        
+        Args:
+            fraction (float): Completed share between 0 and 1
+            message (str): Short status text
+        """
+    
+    def close(self):
+        """Remove any progress indicators"""
+
+
+class Reporter:
+    """Receives errors, warnings and progress from backend modules"""
+    
+    def error(self, message):
+        """
+        Report an error the user should see
+        
+        Args:
+            message (str): Error message
+        """
+        logger.error(message)
+    
+    def warning(self, message):
+        """
+        Report a non-fatal problem
+        
+        Args:
+            message (str): Warning message
+        """
+        logger.warning(message)
+    
+    def progress(self):
+        """
+        Start tracking a long-running operation
+        
+        Returns:
+            ProgressTracker: Tracker to update and close
+        """
+        return ProgressTracker()
+
+
+_default_reporter = Reporter()
+
+# Reporter overriding the default in the current context
+_context_reporter = contextvars.ContextVar("reporter", default=None)
+
+
+def get_reporter():
+    """
+    Get the reporter of the current context, or the process-wide default
+    
+    Returns:
+        Reporter: Current reporter
+    """
+    return _context_reporter.get() or _default_reporter
+
+
+def set_reporter(reporter):
+    """
+    Replace the process-wide default reporter
+    
+    Args:
+        reporter (Reporter): New default, or None to restore logging only
+    """
+    global _default_reporter
+    _default_reporter = reporter or Reporter()
+
+
+@contextmanager
+def use_reporter(reporter):
+    """
+    Report through another reporter within a block, e.g. on a worker thread
+    
+    Threads started with metrics.submit() inherit the override.
+    
+    Args:
+        reporter (Reporter): Reporter used by get_reporter() until the block exits
+    """
+    token = _context_reporter.set(reporter)
+    try:
+        yield reporter
+    finally:
+        _context_reporter.reset(token)
@@ -4,58 +4,615 @@ File: backend/summarizer.py
 Description: AI-powered text summarization using various strategies
 """
 
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from . import metrics
+from .extractive import ExtractiveSummarizer
+from .ollama_pool import document_affinity
+from .reporting import get_reporter
+from .utils import CHARS_PER_TOKEN, estimate_tokens, split_into_token_chunks
+
+# Smallest document budget per prompt, whatever the model's context
+MIN_INPUT_TOKENS = 512
+
+# Summary type answered locally by ExtractiveSummarizer, without a model call
+FAST_EXTRACTIVE = "fast_extractive"
+
+# Share of the requests of a map or reduce step that may fail; past it the
+# condensed text would silently miss whole sections, so condensing fails
+MAX_FAILED_CHUNK_RATIO = 0.25
+
+
+CHUNK_SUMMARY_PROMPT = """You are summarizing one section of a longer document. Write a dense summary of this section that keeps every key fact, finding, figure and conclusion.
+
+SECTION:
+{text}
+
+SECTION SUMMARY:"""
+
+COMBINE_SUMMARY_PROMPT = """The following are summaries of consecutive sections of one document. Merge them into a single coherent summary that keeps every key fact, finding, figure and conclusion, in document order.
+
+SECTION SUMMARIES:
+{text}
+
+COMBINED SUMMARY:"""
+
+LENGTH_SENTENCES = {
+    "short": "3-4",
+    "medium": "5-7",
+    "long": "8-12"
+}
+
+# Every prompt starts with the document, byte-identical across summary types,
+# so Ollama reuses its KV cache for the prefix and only evaluates the short
+# instructions that follow when another type is requested for the same text
+DOCUMENT_PREFIX = """Read the following document carefully. A summarization task about it follows the document.
+
+DOCUMENT:
+{text}
+
+"""
+
+PROMPT_INSTRUCTIONS = {
+    "extractive": """TASK: You are an expert at extractive text summarization. Create a summary of the document above by selecting and combining its most important sentences.
+
+INSTRUCTIONS:
+Select {length} key sentences from the document that capture the main ideas and essential information.
+
+RULES:
+1. Use ONLY sentences or phrases from the document
+2. Do NOT create new sentences or paraphrase
+3. Select sentences that contain the most important information
+4. Maintain the original order when possible
+5. Ensure the summary flows naturally
+6. Focus on key facts, findings, and conclusions
+
+EXTRACTIVE SUMMARY:""",
+    
+    "abstractive": """TASK: You are an expert at abstractive text summarization. Understand the document above, then create a new summary of it in your own words.
+
+INSTRUCTIONS:
+Write a {length} sentences summary in your own words.
+
+RULES:
+1. Read and understand the entire text
+2. Identify the main ideas, key points, and important details
+3. Write a NEW summary in your own words (do not copy sentences)
+4. Ensure the summary is coherent and flows naturally
+5. Preserve the meaning and critical information
+6. Use clear, concise language
+7. Focus on what matters most
+
+ABSTRACTIVE SUMMARY:""",
+    
+    "bullet_points": """TASK: You are an expert at creating concise bullet-point summaries. Extract the key points from the document above.
+
+INSTRUCTIONS:
+1. Create 5-10 bullet points
+2. Each point should be one clear, complete sentence
+3. Focus on the most important information
+4. Use parallel structure
+5. Start each bullet with an action verb or key concept
+
+BULLET-POINT SUMMARY:""",
+    
+    "questions": """TASK: Analyze the document above and create a summary by answering these key questions:
+
+Create a summary that answers:
+1. What is the main topic or thesis?
+2. What are the key arguments or findings?
+3. What evidence or examples are provided?
+4. What are the conclusions or implications?
+5. What are the limitations or future directions (if mentioned)?
+
+Provide a cohesive summary addressing these questions:""",
+    
+    "key_insights": """TASK: You are an expert analyst. Extract the most important insights and takeaways from the document above.
+
+Provide:
+1. TOP 3-5 KEY INSIGHTS (numbered)
+2. MAIN TAKEAWAYS (what should readers remember?)
+3. PRACTICAL IMPLICATIONS (if applicable)
+
+Format your response clearly with headers:"""
+}
+
+PROMPT_TEMPLATES = {
+    summary_type: DOCUMENT_PREFIX + instructions
+    for summary_type, instructions in PROMPT_INSTRUCTIONS.items()
+}
+
+# Every summary type accepted by summarize()
+SUMMARY_TYPES = list(PROMPT_TEMPLATES) + [FAST_EXTRACTIVE]
+
+CUSTOM_PROMPT = DOCUMENT_PREFIX + """TASK:
+{instructions}
+
+SUMMARY:"""
+
+
+def _document_key(text):
+    """document_affinity() key of a prepared text, shared by every prompt built on it"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
 
 class AISummarizer:
     """AI-powered text summarization using LLMs"""
     
-    def __init__(self, ollama_client):
+    def __init__(self, ollama_client, max_input_tokens=None, map_reduce=True,
+                 chunk_overlap=50, fan_out=4, max_concurrency=None, cache=None,
+                 max_context_tokens=8192, reserve_tokens=1024, prefilter=False,
+                 prime_prefix=True):
         """
         Initialize AI Summarizer
         
         Args:
             ollama_client: Instance of OllamaClient
+            max_input_tokens (int): Document tokens per prompt (None derives it from the model)
+            map_reduce (bool): Condense longer texts with map-reduce instead of truncating
+            chunk_overlap (int): Tokens shared between neighbouring chunks
+            fan_out (int): Partial summaries merged per combine call
+            max_concurrency (int): Maximum in-flight requests to Ollama (None uses the
+                client's max_concurrency, e.g. an OllamaPool's total slots, or 4)
+            cache: Optional SummaryCache consulted by summarize()
+            max_context_tokens (int): Upper bound on the context window requested (num_ctx)
+            reserve_tokens (int): Context kept free for instructions and the generated output
+            prefilter (bool): Shrink long texts to the budget with local sentence
+                ranking instead of map-reduce
+            prime_prefix (bool): Before concurrent requests on one document, ingest
+                the shared document prefix once so they all reuse its KV cache
         """
         self.ollama = ollama_client
+        self.max_input_tokens = max_input_tokens
+        self.map_reduce = map_reduce
+        self.chunk_overlap = chunk_overlap
+        self.fan_out = max(2, fan_out)
+        if max_concurrency is None:
+            max_concurrency = getattr(ollama_client, 'max_concurrency', 4)
+        self.max_concurrency = max(1, max_concurrency)
+        self.cache = cache
+        self.max_context_tokens = max_context_tokens
+        self.reserve_tokens = reserve_tokens
+        self.prefilter = prefilter
+        self.prime_prefix = prime_prefix
+        self.extractive = ExtractiveSummarizer()
+    
+    def _budget(self, context):
+        """Document tokens that fit a prompt given the context window"""
+        if self.max_input_tokens:
+            return self.max_input_tokens
+        return max(MIN_INPUT_TOKENS, context - self.reserve_tokens)
+    
+    def _template_key(self, summary_type, length):
+        """Prompt part of the cache key; prefiltered inputs give different summaries"""
+        template = self.render_template(summary_type, length)
+        if self.prefilter:
+            template += "\x00prefilter"
+        return template
     
-    def summarize_extractive(self, text, model, length="medium"):
+    def _group(self, summaries, budget):
+        """Pack consecutive summaries into combine inputs of at most fan_out and budget"""
+        groups, current, used = [], [], 0
+        for summary in summaries:
+            tokens = estimate_tokens(summary)
+            if current and (len(current) == self.fan_out or used + tokens > budget):
+                groups.append("\n\n".join(current))
+                current, used = [], 0
+            current.append(summary)
+            used += tokens
+        if current:
+            groups.append("\n\n".join(current))
+        return groups
+    
+    @staticmethod
+    def _keep_successful(results, what):
         """
-        Extractive summarization - AI selects key sentences
+        Drop the failed requests of a map or reduce step, reporting them
+        
+        Args:
+            results (list): Generated texts, None where a request failed
+            what (str): What the requests summarized, for the messages
+            
+        Returns:
+            tuple: (generated texts, or None if more than MAX_FAILED_CHUNK_RATIO
+                failed; number of failed requests)
+        """
+        summaries = [r.strip() for r in results if r]
+        failed = len(results) - len(summaries)
+        if failed > MAX_FAILED_CHUNK_RATIO * len(results):
+            get_reporter().error(
+                f"Could not condense the document: {failed} of {len(results)} {what} failed"
+            )
+            return None, failed
+        if failed:
+            get_reporter().warning(
+                f"{failed} of {len(results)} {what} failed; the summary may miss parts of "
+                f"the document"
+            )
+        return summaries, failed
+    
+    @staticmethod
+    def _fit(summaries, budget):
+        """Join partial summaries, cutting what exceeds the budget with a warning"""
+        text = "\n\n".join(summaries)
+        limit = budget * CHARS_PER_TOKEN
+        if len(text) > limit:
+            get_reporter().warning(
+                f"The condensed document is still too long for the model; its last "
+                f"{len(text) - limit:,} characters were left out"
+            )
+        return text[:limit]
+    
+    def context_window(self, model):
+        """
+        Context window requested from Ollama for a model
+        
+        Args:
+            model (str): Model name to use
+            
+        Returns:
+            int: The model's context length, capped at max_context_tokens
+        """
+        return min(self.ollama.get_context_length(model), self.max_context_tokens)
+    
+    def input_budget(self, model):
+        """
+        Document tokens that fit in a single prompt for a model
+        
+        Args:
+            model (str): Model name to use
+            
+        Returns:
+            int: Token budget for the {text} part of a prompt
+        """
+        return self._budget(self.context_window(model))
+    
+    def prepare_text(self, text, model, document_hash=None):
+        """
+        Fit text into a single prompt
+        
+        Texts within the model's input budget are returned unchanged. Longer
+        texts are shrunk to their most central sentences when prefilter is
+        set, condensed with map-reduce when enabled, otherwise truncated.
+        A map-reduce result is cached per document, so every summary type
+        of that document gets the same prompt prefix.
+        
+        Args:
+            text (str): Input text
+            model (str): Model name to use
+            document_hash (str): SHA-256 of the source document, enables caching
+            
+        Returns:
+            str: Text that fits the prompt, or None if condensing failed
+        """
+        budget = self.input_budget(model)
+        if estimate_tokens(text) <= budget:
+            return text
+        if self.prefilter:
+            with metrics.timed("prefilter"):
+                return self.extractive.condense(text, budget)
+        if not self.map_reduce:
+            return text[:budget * CHARS_PER_TOKEN]
+        
+        key = self._condensed_key(document_hash, model, budget)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        with metrics.timed("condense"):
+            condensed, complete = self._map_reduce(text, model)
+        if key and condensed and complete:
+            self.cache.put(key, condensed)
+        return condensed
+    
+    def map_reduce_text(self, text, model):
+        """
+        Condense a long text with hierarchical map-reduce
+        
+        The text is cut into chunks that fill the model's input budget, the
+        chunks are summarized concurrently (map), then groups of up to
+        fan_out partial summaries are merged (reduce) until the result fits
+        the budget or no further merging is possible.
+        
+        Failed requests are left out and reported as a warning; if more than
+        MAX_FAILED_CHUNK_RATIO of a step's requests fail, condensing fails.
+        
+        Args:
+            text (str): Input text
+            model (str): Model name to use
+            
+        Returns:
+            str: Condensed text or None if too many requests failed
+        """
+        return self._map_reduce(text, model)[0]
+    
+    def _map_reduce(self, text, model):
+        """
+        Condense a long text (see map_reduce_text)
+        
+        Returns:
+            tuple: (condensed text or None, True if no request failed)
+        """
+        context = self.context_window(model)
+        budget = self._budget(context)
+        options = {"num_ctx": context}
+        
+        chunks = split_into_token_chunks(text, budget, self.chunk_overlap)
+        summaries, failed = self._keep_successful(
+            self._generate_all(model, CHUNK_SUMMARY_PROMPT, chunks, options),
+            "document sections"
+        )
+        
+        while summaries and estimate_tokens("\n\n".join(summaries)) > budget:
+            groups = self._group(summaries, budget)
+            if len(groups) == len(summaries):
+                break
+            summaries, merge_failed = self._keep_successful(
+                self._generate_all(model, COMBINE_SUMMARY_PROMPT, groups, options),
+                "merges of section summaries"
+            )
+            failed += merge_failed
+        
+        if not summaries:
+            return None, False
+        return self._fit(summaries, budget), failed == 0
+    
+    def _generate_all(self, model, template, texts, options=None):
+        """
+        Run one prompt per text concurrently, preserving order
+        
+        Args:
+            model (str): Model name to use
+            template (str): Prompt template with a {text} field
+            texts (list): Texts to fill into the template
+            options (dict): Model parameters passed to every request
+            
+        Returns:
+            list: Generated texts, None where a request failed
+        """
+        prompts = [template.format(text=t) for t in texts]
+        workers = min(self.max_concurrency, len(prompts)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                metrics.submit(pool, self.ollama.generate, model, p, options=options)
+                for p in prompts
+            ]
+            return [future.result() for future in futures]
+    
+    @staticmethod
+    def render_template(summary_type, length="medium"):
+        """
+        Render a prompt template with everything except the document text
+        
+        Args:
+            summary_type (str): Key of PROMPT_TEMPLATES
+            length (str): Summary length (short/medium/long)
+            
+        Returns:
+            str: Prompt template with a literal {text} placeholder
+        """
+        return PROMPT_TEMPLATES[summary_type].format(
+            text="{text}",
+            length=LENGTH_SENTENCES[length]
+        )
+    
+    def _condensed_key(self, document_hash, model, budget):
+        """Cache key of a document's map-reduce condensation, or None when caching is off"""
+        if self.cache is None or not document_hash:
+            return None
+        return self.cache.make_key(
+            document_hash,
+            model,
+            "condensed",
+            str(budget),
+            CHUNK_SUMMARY_PROMPT + COMBINE_SUMMARY_PROMPT
+        )
+    
+    def _cache_key(self, document_hash, model, summary_type, length):
+        """Cache key of a summary, or None when caching is off"""
+        if self.cache is None or not document_hash:
+            return None
+        return self.cache.make_key(
+            document_hash,
+            model,
+            summary_type,
+            length,
+            self._template_key(summary_type, length)
+        )
+    
+    @staticmethod
+    def _build_prompt(summary_type, text, length="medium"):
+        """Fill a summary type's template with prepared text"""
+        return PROMPT_TEMPLATES[summary_type].format(
+            text=text,
+            length=LENGTH_SENTENCES[length]
+        )
+    
+    def _cached_or_pending(self, text, model, summary_types, length, document_hash):
+        """
+        Split requested summary types into finished results and model work
+        
+        Returns:
+            tuple: (list of (summary_type, summary) answered from the cache or
+                locally, list of (summary_type, cache key) still to generate)
+        """
+        ready, pending = [], []
+        for summary_type in dict.fromkeys(summary_types):
+            if summary_type == FAST_EXTRACTIVE:
+                ready.append((summary_type, None))
+                continue
+            if summary_type not in PROMPT_TEMPLATES:
+                raise ValueError(f"Unknown summary type: {summary_type}")
+            key = self._cache_key(document_hash, model, summary_type, length)
+            cached = self.cache.get(key) if key else None
+            if cached is not None:
+                ready.append((summary_type, cached))
+            else:
+                pending.append((summary_type, key))
+        return ready, pending
+    
+    def summarize(self, text, model, summary_type, length="medium", document_hash=None,
+                  stream=False):
+        """
+        Summarize with the given strategy, consulting the cache when possible
         
         Args:
             text (str): Input text to summarize
             model (str): Model name to use
+            summary_type (str): Key of PROMPT_TEMPLATES or FAST_EXTRACTIVE
             length (str): Summary length (short/medium/long)
+            document_hash (str): SHA-256 of the source document, enables caching
+            stream (bool): Return a token stream instead of the finished text
             
         Returns:
-            str: Extractive summary
+            str: Summary text (GenerationStream if streaming and not cached) or None if failed
         """
-        length_map = {
-            "short": "3-4 key sentences",
-            "medium": "5-7 key sentences",
-            "long": "8-12 key sentences"
-        }
+        if summary_type == FAST_EXTRACTIVE:
+            return self.summarize_fast_extractive(text, length)
+        if summary_type not in PROMPT_TEMPLATES:
+            raise ValueError(f"Unknown summary type: {summary_type}")
         
-        prompt = f"""You are an expert at extractive text summarization. Your task is to create a summary by selecting and combining the most important sentences from the original text.
-
-TEXT TO SUMMARIZE:
-{text[:8000]}
-
-INSTRUCTIONS:
-Select {length_map[length]} from the original text that capture the main ideas and essential information.
-
-RULES:
-1. Use ONLY sentences or phrases from the original text
-2. Do NOT create new sentences or paraphrase
-3. Select sentences that contain the most important information
-4. Maintain the original order when possible
-5. Ensure the summary flows naturally
-6. Focus on key facts, findings, and conclusions
-
-EXTRACTIVE SUMMARY:"""
+        key = self._cache_key(document_hash, model, summary_type, length)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        summary = self._summarize(summary_type, text, model, length, stream, document_hash)
+        
+        if key and summary:
+            if stream:
+                summary.on_complete.append(lambda completed: self.cache.put(key, completed))
+            else:
+                self.cache.put(key, summary)
+        return summary
+    
+    def _summarize(self, summary_type, text, model, length="medium", stream=False,
+                   document_hash=None):
+        """
+        Build the prompt for a summary type and run it
+        
+        Args:
+            summary_type (str): Key of PROMPT_TEMPLATES
+            text (str): Input text to summarize
+            model (str): Model name to use
+            length (str): Summary length (short/medium/long)
+            stream (bool): Return a token stream instead of the finished text
+            document_hash (str): SHA-256 of the source document, enables caching
+            
+        Returns:
+            str: Summary text (GenerationStream if streaming) or None if failed
+        """
+        text = self.prepare_text(text, model, document_hash)
+        if text is None:
+            return None
+        
+        prompt = self._build_prompt(summary_type, text, length)
+        options = {"num_ctx": self.context_window(model)}
+        with document_affinity(_document_key(text)):
+            return self.ollama.generate(model, prompt, stream=stream, options=options)
+    
+    def prime(self, text, model):
+        """
+        Load the model and evaluate the document prefix shared by every prompt
+        
+        Ollama keeps the KV cache of the last prompt in each slot and reuses
+        the longest common prefix (copying it between slots), so requests for
+        any summary type of this text afterwards only evaluate their own
+        instructions.
         
-        return self.ollama.generate(model, prompt)
+        Args:
+            text (str): Prepared text, as returned by prepare_text()
+            model (str): Model name to use
+            
+        Returns:
+            bool: True if the prefix was evaluated
+        """
+        options = {"num_ctx": self.context_window(model), "num_predict": 1}
+        with metrics.timed("prime"), document_affinity(_document_key(text)):
+            return self.ollama.generate(
+                model, DOCUMENT_PREFIX.format(text=text), options=options
+            ) is not None
     
-    def summarize_abstractive(self, text, model, length="medium"):
+    def summarize_many(self, text, model, summary_types, length="medium", document_hash=None):
+        """
+        Produce several summary types of one text concurrently
+        
+        Cached and fast_extractive results come first. The text is then
+        fitted to the prompt once, so a long document is condensed into a
+        single set of chunk summaries shared by every type. With
+        prime_prefix, the shared document prefix is ingested once before
+        one request per remaining type is dispatched at once (up to
+        max_concurrency); otherwise parallel requests landing on different
+        server slots would each evaluate the whole document.
+        
+        Args:
+            text (str): Input text to summarize
+            model (str): Model name to use
+            summary_types (list): Entries of SUMMARY_TYPES
+            length (str): Summary length (short/medium/long)
+            document_hash (str): SHA-256 of the source document, enables caching
+            
+        Yields:
+            tuple: (summary_type, summary text or None if failed) as each completes
+        """
+        ready, pending = self._cached_or_pending(
+            text, model, summary_types, length, document_hash
+        )
+        for summary_type, summary in ready:
+            if summary_type == FAST_EXTRACTIVE:
+                summary = self.summarize_fast_extractive(text, length)
+            yield summary_type, summary
+        if not pending:
+            return
+        
+        prepared = self.prepare_text(text, model, document_hash)
+        if prepared is None:
+            for summary_type, _ in pending:
+                yield summary_type, None
+            return
+        
+        options = {"num_ctx": self.context_window(model)}
+        if len(pending) > 1 and self.prime_prefix:
+            self.prime(prepared, model)
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(pending))) as pool:
+            # Set only while submitting: a generator must not leave it in the caller's context
+            with document_affinity(_document_key(prepared)):
+                futures = {
+                    metrics.submit(
+                        pool,
+                        self.ollama.generate,
+                        model,
+                        self._build_prompt(summary_type, prepared, length),
+                        options=options
+                    ): (summary_type, key)
+                    for summary_type, key in pending
+                }
+            for future in as_completed(futures):
+                summary_type, key = futures[future]
+                summary = future.result()
+                if key and summary:
+                    self.cache.put(key, summary)
+                yield summary_type, summary
+    
+    def summarize_extractive(self, text, model, length="medium", stream=False):
+        """
+        Extractive summarization - AI selects key sentences
+        
+        Args:
+            text (str): Input text to summarize
+            model (str): Model name to use
+            length (str): Summary length (short/medium/long)
+            stream (bool): Return a token stream instead of the finished text
+            
+        Returns:
+            str: Extractive summary
+        """
+        return self._summarize("extractive", text, model, length, stream)
+    
+    def summarize_abstractive(self, text, model, length="medium", stream=False):
         """
         Abstractive summarization - AI generates new summary
         
@@ -63,115 +620,71 @@ EXTRACTIVE SUMMARY:"""
             text (str): Input text to summarize
             model (str): Model name to use
             length (str): Summary length (short/medium/long)
+            stream (bool): Return a token stream instead of the finished text
             
         Returns:
             str: Abstractive summary
         """
-        length_map = {
-            "short": "3-4 sentences",
-            "medium": "5-7 sentences",
-            "long": "8-12 sentences"
-        }
+        return self._summarize("abstractive", text, model, length, stream)
+    
+    def summarize_fast_extractive(self, text, length="medium"):
+        """
+        Extractive summarization without the model - sentences ranked locally
         
-        prompt = f"""You are an expert at abstractive text summarization. Your task is to read and understand the text, then create a new summary in your own words.
-
-TEXT TO SUMMARIZE:
-{text[:8000]}
-
-INSTRUCTIONS:
-Write a {length_map[length]} summary in your own words.
-
-RULES:
-1. Read and understand the entire text
-2. Identify the main ideas, key points, and important details
-3. Write a NEW summary in your own words (do not copy sentences)
-4. Ensure the summary is coherent and flows naturally
-5. Preserve the meaning and critical information
-6. Use clear, concise language
-7. Focus on what matters most
-
-ABSTRACTIVE SUMMARY:"""
+        Runs TF-IDF TextRank on the CPU in well under a second even for long
+        documents; no Ollama request is made and no cache is needed.
         
-        return self.ollama.generate(model, prompt)
+        Args:
+            text (str): Input text to summarize
+            length (str): Summary length (short/medium/long)
+            
+        Returns:
+            str: Extractive summary
+        """
+        with metrics.timed("fast_extractive"):
+            return self.extractive.summarize(text, length)
     
-    def summarize_bullet_points(self, text, model):
+    def summarize_bullet_points(self, text, model, stream=False):
         """
         Create bullet-point summary
         
         Args:
             text (str): Input text to summarize
             model (str): Model name to use
+            stream (bool): Return a token stream instead of the finished text
             
         Returns:
             str: Bullet-point summary
         """
-        prompt = f"""You are an expert at creating concise bullet-point summaries. Extract the key points from the following text.
-
-TEXT TO SUMMARIZE:
-{text[:8000]}
-
-INSTRUCTIONS:
-1. Create 5-10 bullet points
-2. Each point should be one clear, complete sentence
-3. Focus on the most important information
-4. Use parallel structure
-5. Start each bullet with an action verb or key concept
-
-BULLET-POINT SUMMARY:"""
-        
-        return self.ollama.generate(model, prompt)
+        return self._summarize("bullet_points", text, model, stream=stream)
     
-    def summarize_with_questions(self, text, model):
+    def summarize_with_questions(self, text, model, stream=False):
         """
         Question-based analytical summary
         
         Args:
             text (str): Input text to summarize
             model (str): Model name to use
+            stream (bool): Return a token stream instead of the finished text
             
         Returns:
             str: Question-based summary
         """
-        prompt = f"""Analyze the following text and create a summary by answering these key questions:
-
-TEXT:
-{text[:8000]}
-
-Create a summary that answers:
-1. What is the main topic or thesis?
-2. What are the key arguments or findings?
-3. What evidence or examples are provided?
-4. What are the conclusions or implications?
-5. What are the limitations or future directions (if mentioned)?
-
-Provide a cohesive summary addressing these questions:"""
-        
-        return self.ollama.generate(model, prompt)
+        return self._summarize("questions", text, model, stream=stream)
     
-    def get_key_insights(self, text, model):
+    def get_key_insights(self, text, model, stream=False):
         """
         Extract key insights and takeaways
         
         Args:
             text (str): Input text to summarize
             model (str): Model name to use
+            stream (bool): Return a token stream instead of the finished text
             
         Returns:
             str: Key insights summary
         """
-        prompt = f"""You are an expert analyst. Read the following text and extract the most important insights and takeaways.
-
-TEXT:
-{text[:8000]}
-
-Provide:
-1. TOP 3-5 KEY INSIGHTS (numbered)
-2. MAIN TAKEAWAYS (what should readers remember?)
-3. PRACTICAL IMPLICATIONS (if applicable)
-
-Format your response clearly with headers:"""
-        
-        return self.ollama.generate(model, prompt)
+        return self._summarize("key_insights", text, model, stream=stream)
     
     def custom_summarize(self, text, model, custom_prompt):
         """
@@ -185,12 +698,267 @@ Format your response clearly with headers:"""
         Returns:
             str: Custom summary
         """
-        full_prompt = f"""TEXT TO SUMMARIZE:
-{text[:8000]}
+        text = self.prepare_text(text, model)
+        if text is None:
+            return None
+        
+        full_prompt = CUSTOM_PROMPT.format(text=text, instructions=custom_prompt)
+        options = {"num_ctx": self.context_window(model)}
+        return self.ollama.generate(model, full_prompt, options=options)
 
-INSTRUCTIONS:
-{custom_prompt}
 
-SUMMARY:"""
+class AsyncAISummarizer(AISummarizer):
+    """asyncio variant of AISummarizer for use with AsyncOllamaClient
+    
+    Mirrors the AISummarizer methods as coroutines. Concurrency of the
+    map stage is bounded by the client's semaphore, so all chunk
+    summaries are submitted at once and overlap as far as the server
+    (OLLAMA_NUM_PARALLEL) allows.
+    """
+    
+    async def context_window(self, model):
+        """Context window requested from Ollama (see AISummarizer.context_window)"""
+        return min(await self.ollama.get_context_length(model), self.max_context_tokens)
+    
+    async def input_budget(self, model):
+        """Document tokens that fit in a single prompt for a model"""
+        return self._budget(await self.context_window(model))
+    
+    async def prepare_text(self, text, model, document_hash=None):
+        """
+        Fit text into a single prompt (see AISummarizer.prepare_text)
+        
+        Args:
+            text (str): Input text
+            model (str): Model name to use
+            document_hash (str): SHA-256 of the source document, enables caching
+            
+        Returns:
+            str: Text that fits the prompt, or None if condensing failed
+        """
+        budget = await self.input_budget(model)
+        if estimate_tokens(text) <= budget:
+            return text
+        if self.prefilter:
+            with metrics.timed("prefilter"):
+                return await asyncio.to_thread(self.extractive.condense, text, budget)
+        if not self.map_reduce:
+            return text[:budget * CHARS_PER_TOKEN]
+        
+        key = self._condensed_key(document_hash, model, budget)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        with metrics.timed("condense"):
+            condensed, complete = await self._map_reduce(text, model)
+        if key and condensed and complete:
+            self.cache.put(key, condensed)
+        return condensed
+    
+    async def map_reduce_text(self, text, model):
+        """
+        Condense a long text with hierarchical map-reduce
+        (see AISummarizer.map_reduce_text)
+        
+        Args:
+            text (str): Input text
+            model (str): Model name to use
+            
+        Returns:
+            str: Condensed text or None if too many requests failed
+        """
+        return (await self._map_reduce(text, model))[0]
+    
+    async def _map_reduce(self, text, model):
+        """
+        Condense a long text (see map_reduce_text)
+        
+        Returns:
+            tuple: (condensed text or None, True if no request failed)
+        """
+        context = await self.context_window(model)
+        budget = self._budget(context)
+        options = {"num_ctx": context}
+        
+        chunks = split_into_token_chunks(text, budget, self.chunk_overlap)
+        summaries, failed = self._keep_successful(
+            await self._generate_all(model, CHUNK_SUMMARY_PROMPT, chunks, options),
+            "document sections"
+        )
+        
+        while summaries and estimate_tokens("\n\n".join(summaries)) > budget:
+            groups = self._group(summaries, budget)
+            if len(groups) == len(summaries):
+                break
+            summaries, merge_failed = self._keep_successful(
+                await self._generate_all(model, COMBINE_SUMMARY_PROMPT, groups, options),
+                "merges of section summaries"
+            )
+            failed += merge_failed
+        
+        if not summaries:
+            return None, False
+        return self._fit(summaries, budget), failed == 0
+    
+    async def _generate_all(self, model, template, texts, options=None):
+        """
+        Run one prompt per text concurrently, preserving order
+        
+        Args:
+            model (str): Model name to use
+            template (str): Prompt template with a {text} field
+            texts (list): Texts to fill into the template
+            options (dict): Model parameters passed to every request
+            
+        Returns:
+            list: Generated texts, None where a request failed
+        """
+        return await asyncio.gather(*[
+            self.ollama.generate(model, template.format(text=t), options=options)
+            for t in texts
+        ])
+    
+    async def summarize(self, text, model, summary_type, length="medium", document_hash=None,
+                        stream=False):
+        """
+        Summarize with the given strategy, consulting the cache when possible
+        
+        Args:
+            text (str): Input text to summarize
+            model (str): Model name to use
+            summary_type (str): Key of PROMPT_TEMPLATES or FAST_EXTRACTIVE
+            length (str): Summary length (short/medium/long)
+            document_hash (str): SHA-256 of the source document, enables caching
+            stream (bool): Return a token stream instead of the finished text
+            
+        Returns:
+            str: Summary text (AsyncGenerationStream if streaming and not cached) or None if failed
+        """
+        if summary_type == FAST_EXTRACTIVE:
+            return await self.summarize_fast_extractive(text, length)
+        if summary_type not in PROMPT_TEMPLATES:
+            raise ValueError(f"Unknown summary type: {summary_type}")
+        
+        key = self._cache_key(document_hash, model, summary_type, length)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        summary = await self._summarize(summary_type, text, model, length, stream,
+                                        document_hash)
+        
+        if key and summary:
+            if stream:
+                summary.on_complete.append(lambda completed: self.cache.put(key, completed))
+            else:
+                self.cache.put(key, summary)
+        return summary
+    
+    async def _summarize(self, summary_type, text, model, length="medium", stream=False,
+                         document_hash=None):
+        """
+        Build the prompt for a summary type and run it
+        
+        Args:
+            summary_type (str): Key of PROMPT_TEMPLATES
+            text (str): Input text to summarize
+            model (str): Model name to use
+            length (str): Summary length (short/medium/long)
+            stream (bool): Return a token stream instead of the finished text
+            document_hash (str): SHA-256 of the source document, enables caching
+            
+        Returns:
+            str: Summary text (AsyncGenerationStream if streaming) or None if failed
+        """
+        text = await self.prepare_text(text, model, document_hash)
+        if text is None:
+            return None
+        
+        prompt = self._build_prompt(summary_type, text, length)
+        options = {"num_ctx": await self.context_window(model)}
+        return await self.ollama.generate(model, prompt, stream=stream, options=options)
+    
+    async def prime(self, text, model):
+        """Evaluate the shared document prefix once (see AISummarizer.prime)"""
+        options = {"num_ctx": await self.context_window(model), "num_predict": 1}
+        with metrics.timed("prime"):
+            return await self.ollama.generate(
+                model, DOCUMENT_PREFIX.format(text=text), options=options
+            ) is not None
+    
+    async def summarize_many(self, text, model, summary_types, length="medium",
+                             document_hash=None):
+        """
+        Produce several summary types of one text concurrently
+        
+        See AISummarizer.summarize_many; use with 'async for'.
+        
+        Yields:
+            tuple: (summary_type, summary text or None if failed) as each completes
+        """
+        ready, pending = self._cached_or_pending(
+            text, model, summary_types, length, document_hash
+        )
+        for summary_type, summary in ready:
+            if summary_type == FAST_EXTRACTIVE:
+                summary = await self.summarize_fast_extractive(text, length)
+            yield summary_type, summary
+        if not pending:
+            return
+        
+        prepared = await self.prepare_text(text, model, document_hash)
+        if prepared is None:
+            for summary_type, _ in pending:
+                yield summary_type, None
+            return
+        
+        options = {"num_ctx": await self.context_window(model)}
+        if len(pending) > 1 and self.prime_prefix:
+            await self.prime(prepared, model)
+        
+        async def generate(summary_type, key):
+            prompt = self._build_prompt(summary_type, prepared, length)
+            return summary_type, key, await self.ollama.generate(model, prompt, options=options)
+        
+        for next_done in asyncio.as_completed([generate(*item) for item in pending]):
+            summary_type, key, summary = await next_done
+            if key and summary:
+                self.cache.put(key, summary)
+            yield summary_type, summary
+    
+    async def summarize_extractive(self, text, model, length="medium", stream=False):
+        """Extractive summarization - AI selects key sentences"""
+        return await self._summarize("extractive", text, model, length, stream)
+    
+    async def summarize_abstractive(self, text, model, length="medium", stream=False):
+        """Abstractive summarization - AI generates new summary"""
+        return await self._summarize("abstractive", text, model, length, stream)
+    
+    async def summarize_fast_extractive(self, text, length="medium"):
+        """Extractive summarization without the model, off the event loop"""
+        with metrics.timed("fast_extractive"):
+            return await asyncio.to_thread(self.extractive.summarize, text, length)
+    
+    async def summarize_bullet_points(self, text, model, stream=False):
+        """Create bullet-point summary"""
+        return await self._summarize("bullet_points", text, model, stream=stream)
+    
+    async def summarize_with_questions(self, text, model, stream=False):
+        """Question-based analytical summary"""
+        return await self._summarize("questions", text, model, stream=stream)
+    
+    async def get_key_insights(self, text, model, stream=False):
+        """Extract key insights and takeaways"""
+        return await self._summarize("key_insights", text, model, stream=stream)
+    
+    async def custom_summarize(self, text, model, custom_prompt):
+        """Custom summarization with user-provided prompt"""
+        text = await self.prepare_text(text, model)
+        if text is None:
+            return None
         
-        return self.ollama.generate(model, full_prompt)
+        full_prompt = CUSTOM_PROMPT.format(text=text, instructions=custom_prompt)
+        options = {"num_ctx": await self.context_window(model)}
+        return await self.ollama.generate(model, full_prompt, options=options)
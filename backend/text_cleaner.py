@@ -0,0 +1,280 @@
+"""
+Text Cleaner Module
+File: backend/text_cleaner.py
+Description: Normalize extracted PDF text before statistics and summarization
+"""
+
+import re
+from bisect import bisect
+from collections import Counter
+
+from .metrics import timed
+from .utils import CHARS_PER_TOKEN
+
+# Typographic ligatures and invisible characters PDF extraction leaves behind
+_SPECIAL_CHARS = {
+    "\ufb00": "ff",
+    "\ufb01": "fi",
+    "\ufb02": "fl",
+    "\ufb03": "ffi",
+    "\ufb04": "ffl",
+    "\ufb05": "st",
+    "\ufb06": "st",
+    "\u00ad": "",     # soft hyphen
+    "\u200b": "",     # zero-width space
+    "\ufeff": "",     # byte order mark
+    "\u00a0": " ",    # no-break space
+    "\r": "",
+    "\f": "\n",       # reserved for the page separator below
+}
+_SPECIAL_CHAR = re.compile("[%s]" % "".join(_SPECIAL_CHARS))
+
+# Pages are cleaned as one text, separated by a form feed on its own line.
+# Every pattern starts with a literal so the regex engine can skip ahead
+# instead of attempting a match at each character.
+_PAGE_BREAK = "\n\f\n"
+
+# Lines holding only a page number: "12", "- 12 -", "Page 12", "Page 12 of 40", "12/40"
+_PAGE_NUMBER_LINE = re.compile(
+    r"\n[ \t]*(?:[Pp]age[ \t]+)?[-–—]?[ \t]*(\d{1,4})"
+    r"(?:[ \t]*(?:/|of)[ \t]*\d{1,4})?[ \t]*[-–—]?[ \t]*(?=\n)"
+)
+
+# Lines at the top and bottom of a page where a page number may stand; a
+# number line elsewhere is only removed if it equals the page's position,
+# since mid-page it is usually data (a table cell, a figure value)
+PAGE_NUMBER_EDGE_LINES = 3
+
+# A word broken across lines with a hyphen, continuing in lower case
+_HYPHENATED_BREAK = re.compile(r"-(?<=\w-)[ \t]*\n[ \t]*(?=[a-z])")
+
+# One or more blank lines
+_PARAGRAPH_BREAK = re.compile(r"\n(?:[ \t]*\n)+[ \t]*")
+
+# A single line wrap inside a paragraph, unless the next line starts a list item
+_LINE_WRAP = re.compile(
+    r"\n(?<=[^\n\f]\n)"
+    r"(?![ \t]*(?:[\n\f]|(?:[-•*▪◦‣]|\d{1,3}[.)])[ \t]))[ \t]*"
+)
+
+_HORIZONTAL_SPACE = re.compile(r"  +|\t")
+
+# Share of a page's non-blank lines that may be taken as its header and,
+# again, as its footer, so the body of a short page is never inspected
+EDGE_FRACTION = 0.25
+
+# Running headers differ between pages only by numbers ("Page 3", "2023-04-01")
+_DIGITS = re.compile(r"\d+")
+
+
+def _line_key(line):
+    """Fingerprint of a line that ignores case, spacing and numbers"""
+    return _DIGITS.sub("#", " ".join(line.split()).lower())
+
+
+def _page_number_replacer(text):
+    """
+    Replacement function for _PAGE_NUMBER_LINE over the joined page texts
+    
+    Args:
+        text (str): Joined page texts the pattern runs over
+        
+    Returns:
+        callable: Returns a newline, or nothing mid-page, for page-number lines
+            and the match otherwise
+    """
+    # Page i spans breaks[i] to breaks[i + 1]; the first page starts before text[0]
+    breaks = [-1]
+    position = text.find("\f")
+    while position != -1:
+        breaks.append(position)
+        position = text.find("\f", position + 1)
+    breaks.append(len(text))
+    
+    def near_top(start, page_start):
+        # Fewer than PAGE_NUMBER_EDGE_LINES line breaks between the page start and the line
+        for _ in range(PAGE_NUMBER_EDGE_LINES):
+            start = text.rfind("\n", page_start + 1, start)
+            if start == -1:
+                return True
+        return False
+    
+    def near_bottom(end, page_end):
+        for _ in range(PAGE_NUMBER_EDGE_LINES):
+            end = text.find("\n", end, page_end - 1)
+            if end == -1:
+                return True
+            end += 1
+        return False
+    
+    def replace(match):
+        page = bisect(breaks, match.start()) - 1
+        if near_top(match.start(), breaks[page]) or near_bottom(match.end(), breaks[page + 1]):
+            return "\n"
+        if int(match.group(1)) == page + 1:
+            # Mid-page, the surrounding lines belong to one paragraph
+            return ""
+        return match.group()
+    
+    return replace
+
+
+def _edge_lines(lines, edge_lines):
+    """
+    Indices of the first and last non-blank lines of a page
+    
+    Args:
+        lines (list): Lines of the page
+        edge_lines (int): Lines taken at each end, capped at EDGE_FRACTION of
+            the non-blank lines (but at least one)
+            
+    Returns:
+        list: Line indices, each at most once
+    """
+    content = [i for i, line in enumerate(lines) if line.strip()]
+    window = min(edge_lines, max(1, int(len(content) * EDGE_FRACTION)))
+    if len(content) <= 2 * window:
+        return content
+    return content[:window] + content[-window:]
+
+
+class TextCleaner:
+    """Normalize PDF page texts while keeping paragraph structure"""
+    
+    @staticmethod
+    def clean_pages(page_texts):
+        """
+        Normalize page texts in bulk
+        
+        All pages are joined and each pattern runs once over the whole
+        document, instead of once per page. Ligatures are expanded, invisible
+        characters dropped, page-number lines removed (near the top or bottom
+        of a page, or anywhere if the number is the page's own), words
+        hyphenated across lines rejoined and wrapped lines unwrapped. Paragraphs stay
+        separated by a blank line and list items keep their own lines.
+        
+        Args:
+            page_texts (list): Raw page texts
+            
+        Returns:
+            list: Cleaned page texts, one per input page
+        """
+        if not page_texts:
+            return []
+        
+        with timed("clean"):
+            return TextCleaner._clean_joined(page_texts)
+    
+    @staticmethod
+    def _clean_joined(page_texts):
+        """Run every cleaning pattern once over the joined page texts"""
+        text = _PAGE_BREAK.join(
+            _SPECIAL_CHAR.sub(lambda m: _SPECIAL_CHARS[m.group()], page_text)
+            for page_text in page_texts
+        )
+        text = "\n" + text + "\n"
+        text = _PAGE_NUMBER_LINE.sub(_page_number_replacer(text), text)
+        text = _HYPHENATED_BREAK.sub("", text)
+        text = _PARAGRAPH_BREAK.sub("\n\n", text)
+        text = _LINE_WRAP.sub(" ", text)
+        text = _HORIZONTAL_SPACE.sub(" ", text).replace(" \n", "\n")
+        return [page_text.strip() for page_text in text.split("\f")]
+    
+    @staticmethod
+    def find_repeated_lines(page_texts, edge_lines=3, min_ratio=0.5, min_pages=3):
+        """
+        Find running headers and footers
+        
+        The first and last edge_lines lines of every page, at most a quarter
+        of its lines at each end, are fingerprinted
+        (case, spacing and digits ignored) and counted once per page. Lines
+        recurring on at least min_ratio of the pages are boilerplate, unless
+        the fingerprint also repeats within a page, which marks body text
+        such as table rows rather than a running header.
+        
+        Args:
+            page_texts (list): Raw page texts
+            edge_lines (int): Lines inspected at the top and bottom of each page
+            min_ratio (float): Share of pages a line must appear on
+            min_pages (int): Documents with fewer pages are left alone
+            
+        Returns:
+            set: Fingerprints of repeated lines
+        """
+        if len(page_texts) < min_pages:
+            return set()
+        
+        counts = Counter()
+        within_page = set()
+        for page_text in page_texts:
+            lines = page_text.split("\n")
+            page_counts = Counter(_line_key(lines[i]) for i in _edge_lines(lines, edge_lines))
+            within_page.update(key for key, count in page_counts.items() if count > 1)
+            counts.update(page_counts.keys())
+        
+        threshold = max(min_pages, min_ratio * len(page_texts))
+        return {
+            key for key, count in counts.items()
+            if count >= threshold and key not in within_page
+        }
+    
+    @staticmethod
+    def strip_repeated_lines(page_texts, edge_lines=3, min_ratio=0.5, min_pages=3):
+        """
+        Remove running headers, footers and page numbers repeated across pages
+        
+        Run on raw page texts, before clean_pages() unwraps lines.
+        
+        Args:
+            page_texts (list): Raw page texts
+            edge_lines (int): Lines inspected at the top and bottom of each page
+            min_ratio (float): Share of pages a line must appear on
+            min_pages (int): Documents with fewer pages are left alone
+            
+        Returns:
+            tuple: (page texts, report dict with repeated_lines, lines_removed,
+                chars_removed and tokens_saved)
+        """
+        with timed("strip_boilerplate"):
+            return TextCleaner._strip_lines(page_texts, edge_lines, min_ratio, min_pages)
+    
+    @staticmethod
+    def _strip_lines(page_texts, edge_lines, min_ratio, min_pages):
+        """Remove the repeated edge lines found by find_repeated_lines()"""
+        repeated = TextCleaner.find_repeated_lines(page_texts, edge_lines, min_ratio, min_pages)
+        report = {
+            'repeated_lines': len(repeated),
+            'lines_removed': 0,
+            'chars_removed': 0,
+            'tokens_saved': 0
+        }
+        if not repeated:
+            return list(page_texts), report
+        
+        stripped = []
+        for page_text in page_texts:
+            lines = page_text.split("\n")
+            drop = {i for i in _edge_lines(lines, edge_lines) if _line_key(lines[i]) in repeated}
+            if not drop:
+                stripped.append(page_text)
+                continue
+            kept = "\n".join(line for i, line in enumerate(lines) if i not in drop)
+            report['lines_removed'] += len(drop)
+            report['chars_removed'] += len(page_text) - len(kept)
+            stripped.append(kept)
+        
+        report['tokens_saved'] = -(-report['chars_removed'] // CHARS_PER_TOKEN)
+        return stripped, report
+    
+    @staticmethod
+    def clean_page(page_text):
+        """
+        Normalize the text of a single page
+        
+        Args:
+            page_text (str): Raw page text
+            
+        Returns:
+            str: Cleaned page text
+        """
+        return TextCleaner.clean_pages([page_text])[0]
@@ -4,20 +4,164 @@ File: backend/utils.py
 Description: Helper functions and utilities
 """
 
+import re
+from collections import deque
+from functools import lru_cache
 
-def calculate_statistics(original_text, summary_text):
+# Average characters per token for Llama-style BPE vocabularies on English text
+CHARS_PER_TOKEN = 4
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+_NON_SPACE = re.compile(r"\S")
+_WHITESPACE = re.compile(r"\s+")
+_SENTENCE_SPLIT = re.compile(r"[.!?]+")
+_SENTENCE_TERMINATOR = re.compile(r"[.!?]")
+# Text between sentence terminators that is not just whitespace
+_SENTENCE_CONTENT = re.compile(r"[^.!?\S]*[^.!?\s][^.!?]*")
+
+# Separator PDFTextExtractor.join_pages puts after every page
+PAGE_SEPARATOR = "\n\n"
+
+
+class TextStats:
+    """
+    Word, character, sentence and paragraph counts of a text
+    
+    Computed once, page by page, so a document is scanned a single time
+    and the counts can be reused by every consumer. Counting rules match
+    the historical helpers: words are whitespace-separated, sentences end
+    at . ! or ?, and paragraphs are separated by blank lines.
+    """
+    
+    def __init__(self):
+        self.words = 0
+        self.characters = 0
+        self.sentences = 0
+        self.paragraphs = 0
+        # Whether the text so far ends inside an unterminated sentence
+        self._open_sentence = False
+    
+    @classmethod
+    def from_text(cls, text):
+        """
+        Count a complete text
+        
+        Args:
+            text (str): Input text
+            
+        Returns:
+            TextStats: Counts for text
+        """
+        stats = cls()
+        stats._add(text, "")
+        return stats
+    
+    @classmethod
+    def from_pages(cls, page_texts):
+        """
+        Count a document given as pages
+        
+        Args:
+            page_texts (iterable): Page texts in order
+            
+        Returns:
+            TextStats: Counts for PDFTextExtractor.join_pages(page_texts)
+        """
+        stats = cls()
+        for page_text in page_texts:
+            stats.add_page(page_text)
+        return stats
+    
+    def add_page(self, page_text):
+        """
+        Count one more page, e.g. while extraction streams pages in
+        
+        A sentence left unterminated at the end of the previous page is
+        continued rather than counted twice.
+        
+        Args:
+            page_text (str): Text of the next page
+        """
+        self._add(page_text, PAGE_SEPARATOR)
+    
+    def _add(self, text, separator):
+        self.words += len(text.split())
+        self.characters += len(text) + len(separator)
+        self.paragraphs += sum(1 for p in text.split('\n\n') if p.strip())
+        
+        first = last = None
+        count = 0
+        for last in _SENTENCE_CONTENT.finditer(text):
+            if first is None:
+                first = last
+            count += 1
+        
+        if first is not None:
+            continues = (
+                self._open_sentence
+                and _SENTENCE_TERMINATOR.search(text, 0, first.start()) is None
+            )
+            self.sentences += count - continues
+            self._open_sentence = last.end() == len(text)
+        elif _SENTENCE_TERMINATOR.search(text):
+            self._open_sentence = False
+    
+    @property
+    def avg_word_length(self):
+        """Characters per word"""
+        return self.characters / self.words if self.words else 0
+    
+    @property
+    def avg_sentence_length(self):
+        """Words per sentence"""
+        return self.words / self.sentences if self.sentences else 0
+    
+    def reading_time(self, words_per_minute=200):
+        """
+        Estimate reading time
+        
+        Args:
+            words_per_minute (int): Average reading speed
+            
+        Returns:
+            str: Estimated reading time
+        """
+        return _format_reading_time(self.words / words_per_minute)
+    
+    def as_dict(self):
+        """
+        Get the counts in the format of extract_key_stats()
+        
+        Returns:
+            dict: Statistics dictionary
+        """
+        return {
+            'words': self.words,
+            'characters': self.characters,
+            'sentences': self.sentences,
+            'paragraphs': self.paragraphs,
+            'avg_word_length': self.avg_word_length,
+            'avg_sentence_length': self.avg_sentence_length
+        }
+
+
+def calculate_statistics(original_text, summary_text, original_stats=None):
     """
     Calculate summary statistics
     
     Args:
         original_text (str): Original document text
         summary_text (str): Generated summary text
+        original_stats (TextStats): Precomputed counts of original_text
         
     Returns:
         dict: Statistics dictionary
     """
-    original_words = len(original_text.split())
-    original_chars = len(original_text)
+    if original_stats is None:
+        original_stats = TextStats.from_text(original_text)
+    original_words = original_stats.words
+    original_chars = original_stats.characters
     summary_words = len(summary_text.split())
     summary_chars = len(summary_text)
     
@@ -37,17 +181,20 @@ def calculate_statistics(original_text, summary_text):
     }
 
 
-def validate_text_length(text, max_length=8000):
+def validate_text_length(text, max_length=8000, max_tokens=None):
     """
     Validate and truncate text if necessary
     
     Args:
         text (str): Input text
-        max_length (int): Maximum allowed length
+        max_length (int): Maximum allowed length in characters
+        max_tokens (int): Maximum allowed length in tokens (overrides max_length)
         
     Returns:
         tuple: (truncated_text, was_truncated)
     """
+    if max_tokens is not None:
+        max_length = max_tokens * CHARS_PER_TOKEN
     if len(text) <= max_length:
         return text, False
     else:
@@ -78,48 +225,196 @@ def estimate_processing_time(word_count, model_type="medium"):
     return max(int(estimated), 5)  # Minimum 5 seconds
 
 
-def clean_text(text):
+def clean_text(text, preserve_paragraphs=False):
     """
     Clean and normalize text
     
+    For PDF page texts prefer TextCleaner.clean_pages(), which also repairs
+    hyphenation, ligatures and page numbers.
+    
     Args:
         text (str): Input text
+        preserve_paragraphs (bool): Keep blank-line paragraph breaks
         
     Returns:
         str: Cleaned text
     """
+    if preserve_paragraphs:
+        paragraphs = (clean_text(p) for p in _PARAGRAPH_BREAK.split(text))
+        return "\n\n".join(p for p in paragraphs if p)
+    
     # Remove excessive whitespace
-    import re
-    text = re.sub(r'\s+', ' ', text)
+    text = _WHITESPACE.sub(' ', text)
     text = text.strip()
     return text
 
 
+@lru_cache(maxsize=16)
+def _chunk_patterns(chunk_size, overlap):
+    """
+    Regexes used by iter_chunks
+    
+    stride: the words a chunk does not share with the next one, plus the
+    whitespace after them (group 1 ends at the last of those words).
+    tail: up to overlap more words. last: up to chunk_size words.
+    """
+    return (
+        re.compile(r"((?:\S+\s+){%d}\S+)\s+" % (chunk_size - overlap - 1)),
+        re.compile(r"\S+(?:\s+\S+){0,%d}" % max(overlap - 1, 0)),
+        re.compile(r"\S+(?:\s+\S+){0,%d}" % (chunk_size - 1))
+    )
+
+
+def iter_chunks(text, chunk_size=4000, overlap=200):
+    """
+    Lazily split long text into overlapping chunks of words
+    
+    Chunk boundaries are found by regex over character offsets, scanning
+    each word once (overlapping words twice). No word list is built and each
+    chunk is a single slice of text, so whitespace inside a chunk is kept as
+    in the original.
+    
+    Args:
+        text (str): Input text
+        chunk_size (int): Words per chunk
+        overlap (int): Words shared between consecutive chunks
+        
+    Yields:
+        str: Text chunks in document order
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if not 0 <= overlap < chunk_size:
+        raise ValueError("overlap must be at least 0 and smaller than chunk_size")
+    
+    stride_pattern, tail_pattern, last_pattern = _chunk_patterns(chunk_size, overlap)
+    first_word = _NON_SPACE.search(text)
+    if first_word is None:
+        return
+    
+    start = first_word.start()
+    while True:
+        stride = stride_pattern.match(text, start)
+        if stride is None or stride.end() == len(text):
+            # Everything left fits in this chunk
+            yield text[start:last_pattern.match(text, start).end()]
+            return
+        
+        end = tail_pattern.match(text, stride.end()).end() if overlap else stride.end(1)
+        yield text[start:end]
+        if _NON_SPACE.search(text, end) is None:
+            return
+        start = stride.end()
+
+
 def split_into_chunks(text, chunk_size=4000, overlap=200):
     """
     Split long text into overlapping chunks
     
     Args:
         text (str): Input text
-        chunk_size (int): Size of each chunk
-        overlap (int): Overlap between chunks
+        chunk_size (int): Words per chunk
+        overlap (int): Words shared between consecutive chunks
         
     Returns:
         list: List of text chunks
     """
-    words = text.split()
-    chunks = []
+    return list(iter_chunks(text, chunk_size, overlap))
+
+
+def estimate_tokens(text):
+    """
+    Approximate the number of model tokens in text
+    
+    Args:
+        text (str): Input text
+        
+    Returns:
+        int: Estimated token count
+    """
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _spans(text, pattern, start, end):
+    """Yield (start, end) spans of text[start:end] between matches of pattern"""
+    position = start
+    for match in pattern.finditer(text, start, end):
+        if match.start() > position:
+            yield position, match.start()
+        position = match.end()
+    if end > position:
+        yield position, end
+
+
+def _bounded_spans(text, max_chars):
+    """
+    Yield spans no longer than max_chars, cut at the coarsest boundary possible
     
-    start = 0
-    while start < len(words):
-        end = min(start + chunk_size, len(words))
-        chunk = ' '.join(words[start:end])
-        chunks.append(chunk)
-        start = end - overlap
+    Paragraphs are kept whole when they fit, otherwise split into sentences,
+    and sentences that are still too long are split at whitespace.
+    """
+    for para_start, para_end in _spans(text, _PARAGRAPH_BREAK, 0, len(text)):
+        if para_end - para_start <= max_chars:
+            yield para_start, para_end
+            continue
+        for sent_start, sent_end in _spans(text, _SENTENCE_BREAK, para_start, para_end):
+            position = sent_start
+            while sent_end - position > max_chars:
+                cut = text.rfind(" ", position + 1, position + max_chars)
+                if cut == -1:
+                    cut = position + max_chars
+                yield position, cut
+                position = cut
+            if sent_end > position:
+                yield position, sent_end
+
+
+def split_into_token_chunks(text, max_tokens, overlap_tokens=0):
+    """
+    Split text into chunks that fit a token budget
+    
+    Chunks end on paragraph boundaries where possible, then sentence
+    boundaries, then whitespace. Consecutive chunks share up to
+    overlap_tokens of trailing paragraphs/sentences. Runs in linear time and
+    returns slices of the original text, so paragraph breaks are preserved.
+    
+    Args:
+        text (str): Input text
+        max_tokens (int): Token budget per chunk
+        overlap_tokens (int): Tokens repeated at the start of the next chunk
+        
+    Returns:
+        list: List of text chunks
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    overlap_chars = max(0, min(overlap_tokens, max_tokens // 2)) * CHARS_PER_TOKEN
+    
+    chunks = []
+    window = deque()
+    chunk_start = chunk_end = None
+    for span_start, span_end in _bounded_spans(text, max_chars):
+        if chunk_start is not None and span_end - chunk_start > max_chars:
+            chunks.append(text[chunk_start:chunk_end])
+            
+            # Carry trailing spans into the next chunk, as long as the new span still fits
+            next_start = span_start
+            for prev_start, _ in reversed(window):
+                if chunk_end - prev_start > overlap_chars or span_end - prev_start > max_chars:
+                    break
+                next_start = prev_start
+            while window and window[0][0] < next_start:
+                window.popleft()
+            chunk_start = next_start
         
-        if start >= len(words):
-            break
+        if chunk_start is None:
+            chunk_start = span_start
+        window.append((span_start, span_end))
+        chunk_end = span_end
     
+    if chunk_start is not None:
+        chunks.append(text[chunk_start:chunk_end])
     return chunks
 
 
@@ -193,8 +488,7 @@ def count_sentences(text):
     Returns:
         int: Number of sentences
     """
-    import re
-    sentences = re.split(r'[.!?]+', text)
+    sentences = _SENTENCE_SPLIT.split(text)
     return len([s for s in sentences if s.strip()])
 
 
@@ -210,8 +504,11 @@ def get_reading_time(text, words_per_minute=200):
         str: Estimated reading time
     """
     word_count = len(text.split())
-    minutes = word_count / words_per_minute
-    
+    return _format_reading_time(word_count / words_per_minute)
+
+
+def _format_reading_time(minutes):
+    """Format a reading time given in minutes"""
     if minutes < 1:
         return "< 1 minute"
     elif minutes < 60:
@@ -231,16 +528,4 @@ def extract_key_stats(text):
     Returns:
         dict: Statistics dictionary
     """
-    words = text.split()
-    chars = len(text)
-    sentences = count_sentences(text)
-    paragraphs = len([p for p in text.split('\n\n') if p.strip()])
-    
-    return {
-        'words': len(words),
-        'characters': chars,
-        'sentences': sentences,
-        'paragraphs': paragraphs,
-        'avg_word_length': chars / len(words) if words else 0,
-        'avg_sentence_length': len(words) / sentences if sentences else 0
-    }
+    return TextStats.from_text(text).as_dict()
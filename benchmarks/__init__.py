@@ -0,0 +1,11 @@
+"""
+Benchmarks Package
+File: benchmarks/__init__.py
+Description: Performance benchmarks for the AI PDF Summarizer backend
+
+Run a benchmark from the repository root, e.g.:
+    python -m benchmarks.bench_extraction
+
+The full suite, with JSON results that can be compared between runs:
+    python -m benchmarks.suite --output results.json
+"""
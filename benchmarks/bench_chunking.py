@@ -0,0 +1,70 @@
+"""
+Chunking Benchmark
+File: benchmarks/bench_chunking.py
+Description: Time and peak memory of word chunking on a large synthetic text
+
+Usage:
+    python -m benchmarks.bench_chunking [--words 10000000] [--chunk-size 4000] [--overlap 200]
+"""
+
+import argparse
+
+from backend.utils import iter_chunks
+from benchmarks.fixtures import make_text, measure
+
+
+def legacy_split_into_chunks(text, chunk_size=4000, overlap=200):
+    """Chunking as done before iter_chunks: full word list plus joined slices"""
+    words = text.split()
+    chunks = []
+    
+    start = 0
+    while start < len(words):
+        end = min(start + chunk_size, len(words))
+        chunks.append(' '.join(words[start:end]))
+        if end >= len(words):
+            break
+        start = end - overlap
+    
+    return chunks
+
+
+def consume_legacy(text, chunk_size, overlap):
+    """Build all chunks with the legacy function and process them in turn"""
+    return sum(len(chunk) for chunk in legacy_split_into_chunks(text, chunk_size, overlap))
+
+
+def consume_stream(text, chunk_size, overlap):
+    """Process chunks one at a time as the generator yields them"""
+    return sum(len(chunk) for chunk in iter_chunks(text, chunk_size, overlap))
+
+
+def consume_list(text, chunk_size, overlap):
+    """Materialize every chunk at once, as split_into_chunks does"""
+    return sum(len(chunk) for chunk in list(iter_chunks(text, chunk_size, overlap)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=10_000_000)
+    parser.add_argument("--chunk-size", type=int, default=4000)
+    parser.add_argument("--overlap", type=int, default=200)
+    args = parser.parse_args()
+    
+    text = make_text(args.words)
+    print(f"Synthetic text: {args.words:,} words, {len(text) / 1024 / 1024:.1f} MB")
+    
+    chunk_args = (text, args.chunk_size, args.overlap)
+    results = {
+        'legacy split_into_chunks': measure(consume_legacy, *chunk_args),
+        'iter_chunks (list)': measure(consume_list, *chunk_args),
+        'iter_chunks (stream)': measure(consume_stream, *chunk_args),
+    }
+    
+    print(f"{'case':<30}{'seconds':>10}{'peak MB':>10}")
+    for name, result in results.items():
+        print(f"{name:<30}{result['seconds']:>10.3f}{result['peak_mb']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
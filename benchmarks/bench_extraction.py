@@ -0,0 +1,59 @@
+"""
+Extraction Benchmark
+File: benchmarks/bench_extraction.py
+Description: Time and peak memory of PDF text assembly on a synthetic PDF
+
+Usage:
+    python -m benchmarks.bench_extraction [--pages 2000]
+"""
+
+import argparse
+import io
+
+from backend.pdf_extractor import PDFTextExtractor
+from benchmarks.fixtures import make_pdf, measure
+
+
+def legacy_concat(page_texts):
+    """Document assembly as done before page lists: repeated concatenation"""
+    text = ""
+    for page_text in page_texts:
+        text += page_text + "\n\n"
+    return text
+
+
+def streaming_word_count(pdf_bytes):
+    """Consume pages lazily without ever building the full document"""
+    return sum(
+        len(page_text.split())
+        for _, page_text in PDFTextExtractor.iter_pages(io.BytesIO(pdf_bytes))
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=2000)
+    args = parser.parse_args()
+    
+    pdf_bytes = make_pdf(args.pages)
+    page_texts = PDFTextExtractor.extract_pages(io.BytesIO(pdf_bytes))
+    doc_mb = sum(len(t) for t in page_texts) / (1024 * 1024)
+    print(f"Synthetic PDF: {args.pages} pages, {len(pdf_bytes) / 1024 / 1024:.1f} MB file, "
+          f"{doc_mb:.1f} MB text")
+    
+    results = {
+        'assemble: legacy +=': measure(legacy_concat, page_texts),
+        'assemble: join_pages': measure(PDFTextExtractor.join_pages, page_texts),
+        'extract: full text': measure(
+            lambda: PDFTextExtractor.extract_text_from_pdf(io.BytesIO(pdf_bytes))
+        ),
+        'extract: iter_pages stream': measure(streaming_word_count, pdf_bytes),
+    }
+    
+    print(f"{'case':<30}{'seconds':>10}{'peak MB':>10}")
+    for name, result in results.items():
+        print(f"{name:<30}{result['seconds']:>10.3f}{result['peak_mb']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Extractive Benchmark
+File: benchmarks/bench_extractive.py
+Description: Time of local TF-IDF TextRank sentence ranking on synthetic text
+
+Usage:
+    python -m benchmarks.bench_extractive [--sentences 1000 10000 100000]
+"""
+
+import argparse
+import time
+
+from backend.extractive import ExtractiveSummarizer
+from benchmarks.fixtures import make_text
+
+
+def measure(summarizer, text, repeat=3):
+    """
+    Best-of-repeat time of each extractive stage
+    
+    Returns:
+        dict: seconds for split, rank and summarize
+    """
+    timings = {'split': float("inf"), 'rank': float("inf"), 'summarize': float("inf")}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        sentences = summarizer.split_sentences(text)
+        timings['split'] = min(timings['split'], time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        summarizer.rank(sentences)
+        timings['rank'] = min(timings['rank'], time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        summarizer.summarize(text)
+        timings['summarize'] = min(timings['summarize'], time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sentences", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    summarizer = ExtractiveSummarizer()
+    print(f"{'sentences':>10}{'MB':>8}{'split s':>10}{'rank s':>10}{'summarize s':>13}")
+    for count in args.sentences:
+        # make_text ends a sentence every 15 words
+        text = make_text(count * 15)
+        timings = measure(summarizer, text, args.repeat)
+        print(f"{count:>10,}{len(text) / 1024 / 1024:>8.1f}{timings['split']:>10.3f}"
+              f"{timings['rank']:>10.3f}{timings['summarize']:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
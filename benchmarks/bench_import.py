@@ -0,0 +1,89 @@
+"""
+Import Benchmark
+File: benchmarks/bench_import.py
+Description: Cold-start import time of the backend package
+
+Each measurement runs in a fresh interpreter so nothing is cached in
+sys.modules. The reported time is the median wall time of the import
+statement alone.
+
+Usage:
+    python -m benchmarks.bench_import [--runs 5]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+BACKEND_MODULES = [
+    "backend.ollama_client",
+    "backend.ollama_pool",
+    "backend.async_ollama_client",
+    "backend.pdf_extractor",
+    "backend.text_cleaner",
+    "backend.extractive",
+    "backend.summarizer",
+    "backend.exporter",
+    "backend.cache",
+    "backend.metrics",
+    "backend.jobs",
+    "backend.utils",
+    "backend.cli",
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'streamlit_loaded': 'streamlit' in sys.modules,
+                   'modules': len(sys.modules)}}))
+"""
+
+
+def measure_import(modules, runs):
+    """
+    Import modules in fresh interpreters
+    
+    Args:
+        modules (list): Module names to import
+        runs (int): Number of interpreters to start
+        
+    Returns:
+        dict: median_ms, streamlit_loaded and module count
+    """
+    code = PROBE.format(imports="\n".join(f"import {m}" for m in modules))
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        'median_ms': statistics.median(s['seconds'] for s in samples) * 1000,
+        'streamlit_loaded': samples[0]['streamlit_loaded'],
+        'modules': samples[0]['modules'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import time of the backend package")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    
+    cases = {
+        'backend (all modules)': BACKEND_MODULES,
+        'streamlit (reference)': ["streamlit"],
+    }
+    
+    print(f"{'case':<26}{'median ms':>12}{'modules':>10}{'streamlit':>11}")
+    for name, modules in cases.items():
+        result = measure_import(modules, args.runs)
+        print(f"{name:<26}{result['median_ms']:>12.1f}{result['modules']:>10}"
+              f"{str(result['streamlit_loaded']):>11}")
+
+
+if __name__ == "__main__":
+    main()
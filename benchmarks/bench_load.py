@@ -0,0 +1,281 @@
+"""
+Load Benchmark
+File: benchmarks/bench_load.py
+Description: Client pooling, retries, concurrency and caching under contention on a mock Ollama
+
+Every scenario starts its own StubOllama configured like a loaded server:
+prompt evaluation and generation take time, at most --num-parallel
+generations run at once and the rest queue.
+
+- pooling: sequential requests over the pooled session vs a new client each
+- concurrency: map-reduce condensing with AISummarizer max_concurrency 1..8
+- retry: concurrent requests against a server failing --failure-rate of them
+- cache: a repeated summary and summarize_many with a SummaryCache
+- contention: --users concurrent summarize_many calls sharing one client
+- hosts: map-reduce condensing spread over 1, 2 and 4 servers by an OllamaPool
+- failover: an OllamaPool losing one of three servers mid-run
+
+Usage:
+    python -m benchmarks.bench_load [--scenarios pooling retry] [--num-parallel 4]
+"""
+
+import argparse
+import hashlib
+import statistics
+import tempfile
+import threading
+import time
+
+from backend.cache import SummaryCache
+from backend.ollama_client import OllamaClient
+from backend.ollama_pool import OllamaPool
+from backend.reporting import Reporter
+from backend.summarizer import PROMPT_TEMPLATES, AISummarizer
+from benchmarks.fixtures import make_text
+from benchmarks.stub_ollama import StubOllama
+
+SCENARIOS = ("pooling", "concurrency", "retry", "cache", "contention", "hosts", "failover")
+
+MODEL = "stub:latest"
+
+
+class CountingReporter(Reporter):
+    """Counts client errors instead of logging each one"""
+    
+    def __init__(self):
+        self.errors = 0
+    
+    def error(self, message):
+        self.errors += 1
+
+
+def stub_server(args, **overrides):
+    """Mock server with the timing and parallelism given on the command line"""
+    settings = {
+        'tokens_per_second': args.tokens_per_second,
+        'reply_tokens': args.reply_tokens,
+        'prompt_tokens_per_second': args.prompt_tokens_per_second,
+        'latency': args.latency,
+        'num_parallel': args.num_parallel,
+        'models': (MODEL,),
+    }
+    settings.update(overrides)
+    return StubOllama(**settings)
+
+
+def run_threads(func, count):
+    """
+    Run func(index) on count threads at once
+    
+    Returns:
+        list: (seconds, result) per thread, in index order
+    """
+    results = [None] * count
+    
+    def worker(index):
+        start = time.perf_counter()
+        value = func(index)
+        results[index] = (time.perf_counter() - start, value)
+    
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def pooling(args):
+    """Per-request latency with connection reuse vs a new connection per request"""
+    requests_count = 200
+    with stub_server(args, tokens_per_second=0, latency=0, prompt_tokens_per_second=0) as stub:
+        pooled = OllamaClient(base_url=stub.url)
+        start = time.perf_counter()
+        for _ in range(requests_count):
+            pooled.generate(MODEL, "ping")
+        pooled_ms = (time.perf_counter() - start) / requests_count * 1000
+        pooled.close()
+        
+        start = time.perf_counter()
+        for _ in range(requests_count):
+            client = OllamaClient(base_url=stub.url)
+            client.generate(MODEL, "ping")
+            client.close()
+        fresh_ms = (time.perf_counter() - start) / requests_count * 1000
+    
+    print(f"{'client':<30}{'ms/request':>12}")
+    print(f"{'pooled session':<30}{pooled_ms:>12.2f}")
+    print(f"{'new client per request':<30}{fresh_ms:>12.2f}")
+
+
+def concurrency(args):
+    """Map-reduce wall time as the summarizer's concurrency passes the server's"""
+    text = make_text(args.words)
+    print(f"server num_parallel={args.num_parallel}, {args.words:,} words")
+    print(f"{'max_concurrency':<18}{'seconds':>10}{'requests':>10}{'peak active':>13}"
+          f"{'peak queued':>13}")
+    for max_concurrency in (1, 2, 4, 8):
+        with stub_server(args) as stub:
+            ollama = OllamaClient(base_url=stub.url, pool_size=max_concurrency)
+            summarizer = AISummarizer(ollama, max_concurrency=max_concurrency)
+            start = time.perf_counter()
+            summarizer.prepare_text(text, MODEL)
+            elapsed = time.perf_counter() - start
+            ollama.close()
+        print(f"{max_concurrency:<18}{elapsed:>10.2f}{stub.requests:>10}"
+              f"{stub.stats['peak_active']:>13}{stub.stats['peak_queued']:>13}")
+
+
+def retry(args):
+    """Success rate and latency of concurrent requests against a failing server"""
+    requests_count = 64
+    print(f"server failure_rate={args.failure_rate} (503), "
+          f"disconnect_rate={args.failure_rate / 4:.3f}")
+    print(f"{'max_retries':<14}{'succeeded':>11}{'seconds':>10}{'server requests':>17}"
+          f"{'failed':>8}{'dropped':>9}{'client errors':>15}")
+    for max_retries in (0, 1, 3):
+        with stub_server(args, failure_rate=args.failure_rate, failure_status=503,
+                         disconnect_rate=args.failure_rate / 4, seed=1) as stub:
+            reporter = CountingReporter()
+            ollama = OllamaClient(base_url=stub.url, max_retries=max_retries,
+                                  backoff_factor=0.05, reporter=reporter)
+            
+            def call(index):
+                try:
+                    return ollama.generate(MODEL, f"request {index}")
+                except Exception:
+                    # Failures while reading the body are not retried
+                    return None
+            
+            start = time.perf_counter()
+            results = run_threads(call, requests_count)
+            elapsed = time.perf_counter() - start
+            ollama.close()
+        succeeded = sum(1 for _, value in results if value)
+        print(f"{max_retries:<14}{succeeded:>8}/{requests_count:<2}{elapsed:>10.2f}"
+              f"{stub.requests:>17}{stub.stats['failed']:>8}{stub.stats['disconnected']:>9}"
+              f"{reporter.errors:>15}")
+
+
+def cache(args):
+    """Repeated requests for one document with and without a summary cache"""
+    text = make_text(args.words)
+    document_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    print(f"{'call':<44}{'seconds':>10}{'requests':>10}")
+    with stub_server(args) as stub, tempfile.TemporaryDirectory() as cache_dir:
+        ollama = OllamaClient(base_url=stub.url)
+        summarizer = AISummarizer(ollama, cache=SummaryCache(cache_dir))
+        calls = [
+            ("summarize abstractive (cold)",
+             lambda: summarizer.summarize(text, MODEL, "abstractive", document_hash=document_hash)),
+            ("summarize abstractive (cached)",
+             lambda: summarizer.summarize(text, MODEL, "abstractive", document_hash=document_hash)),
+            ("summarize_many, condensed text cached",
+             lambda: list(summarizer.summarize_many(text, MODEL, list(PROMPT_TEMPLATES),
+                                                    document_hash=document_hash))),
+            ("summarize_many (cached)",
+             lambda: list(summarizer.summarize_many(text, MODEL, list(PROMPT_TEMPLATES),
+                                                    document_hash=document_hash))),
+        ]
+        for name, call in calls:
+            before = stub.requests
+            start = time.perf_counter()
+            call()
+            print(f"{name:<44}{time.perf_counter() - start:>10.2f}{stub.requests - before:>10}")
+        ollama.close()
+
+
+def contention(args):
+    """Latency and throughput of concurrent users sharing one client and server"""
+    documents = [make_text(args.words // 4, seed=user) for user in range(args.users)]
+    with stub_server(args) as stub:
+        ollama = OllamaClient(base_url=stub.url, pool_size=args.users * 4)
+        summarizer = AISummarizer(ollama)
+        start = time.perf_counter()
+        results = run_threads(
+            lambda user: list(summarizer.summarize_many(
+                documents[user], MODEL, list(PROMPT_TEMPLATES)
+            )),
+            args.users
+        )
+        elapsed = time.perf_counter() - start
+        ollama.close()
+    latencies = sorted(seconds for seconds, _ in results)
+    p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+    print(f"{args.users} users x {len(PROMPT_TEMPLATES)} summary types, "
+          f"server num_parallel={args.num_parallel}")
+    print(f"wall {elapsed:.2f}s, {stub.requests / elapsed:.1f} requests/s, "
+          f"user latency p50 {statistics.median(latencies):.2f}s p95 {p95:.2f}s, "
+          f"peak queued {stub.stats['peak_queued']}, rejected {stub.stats['rejected']}")
+
+
+def hosts(args):
+    """Map-reduce wall time as an OllamaPool adds servers"""
+    text = make_text(args.words)
+    print(f"server num_parallel={args.num_parallel}, {args.words:,} words")
+    print(f"{'hosts':<8}{'seconds':>10}{'speedup':>10}{'requests per host':>20}")
+    baseline = None
+    for count in (1, 2, 4):
+        stubs = [stub_server(args).start() for _ in range(count)]
+        pool = OllamaPool([stub.url for stub in stubs], host_parallel=args.num_parallel,
+                          pool_size=args.num_parallel * 2)
+        summarizer = AISummarizer(pool)
+        start = time.perf_counter()
+        summarizer.prepare_text(text, MODEL)
+        elapsed = time.perf_counter() - start
+        pool.close()
+        for stub in stubs:
+            stub.stop()
+        baseline = baseline or elapsed
+        spread = "/".join(str(stub.requests) for stub in stubs)
+        print(f"{count:<8}{elapsed:>10.2f}{baseline / elapsed:>9.2f}x{spread:>20}")
+
+
+def failover(args):
+    """Requests to three servers while one fails and then goes away"""
+    requests_count = 96
+    stubs = [stub_server(args).start() for _ in range(3)]
+    reporter = CountingReporter()
+    pool = OllamaPool([stub.url for stub in stubs], host_parallel=args.num_parallel,
+                      reset_timeout=1.0, health_interval=0.5, reporter=reporter)
+    stubs[1].fail_next(requests_count, status=500)
+    
+    def call(index):
+        if index == requests_count // 2:
+            stubs[1].stop()
+        return pool.generate(MODEL, f"request {index}")
+    
+    start = time.perf_counter()
+    results = run_threads(call, requests_count)
+    elapsed = time.perf_counter() - start
+    succeeded = sum(1 for _, value in results if value)
+    print(f"succeeded {succeeded}/{requests_count} in {elapsed:.2f}s, "
+          f"client errors {reporter.errors}")
+    print(f"{'host':<26}{'state':>10}{'requests':>10}{'failures':>10}")
+    for host in pool.status():
+        print(f"{host['url']:<26}{host['state']:>10}{host['requests']:>10}{host['failures']:>10}")
+    pool.close()
+    for stub in (stubs[0], stubs[2]):
+        stub.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--num-parallel", type=int, default=4)
+    parser.add_argument("--tokens-per-second", type=float, default=400.0)
+    parser.add_argument("--reply-tokens", type=int, default=24)
+    parser.add_argument("--prompt-tokens-per-second", type=float, default=50_000.0)
+    parser.add_argument("--latency", type=float, default=0.01)
+    parser.add_argument("--failure-rate", type=float, default=0.2)
+    parser.add_argument("--words", type=int, default=20_000)
+    parser.add_argument("--users", type=int, default=8)
+    args = parser.parse_args()
+    
+    for name in args.scenarios:
+        print(f"\n== {name}: {globals()[name].__doc__}")
+        globals()[name](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Prompt Prefix Benchmark
+File: benchmarks/bench_prefix.py
+Description: Prompt-eval time of sequential summary types with and without a shared document prefix
+
+Requests every summary type of one document in turn and sums Ollama's
+prompt_eval_count / prompt_eval_duration. "instructions first" puts each
+type's instructions before the document, as the templates used to, so no
+two prompts share a prefix; "document first" uses PROMPT_TEMPLATES, whose
+common document prefix is served from the model's KV cache after the first
+request.
+
+Usage:
+    python -m benchmarks.bench_prefix --model llama3.2 [--words 1500] [--num-predict 16]
+"""
+
+import argparse
+
+from backend.ollama_client import OllamaClient
+from backend.summarizer import DOCUMENT_PREFIX, LENGTH_SENTENCES, PROMPT_INSTRUCTIONS
+from backend.utils import estimate_tokens
+from benchmarks.fixtures import make_text
+
+
+def instructions_first(summary_type, text):
+    """Prompt with the instructions ahead of the document (no shared prefix)"""
+    instructions = PROMPT_INSTRUCTIONS[summary_type].format(length=LENGTH_SENTENCES["medium"])
+    return instructions.replace("the document above", "the document below") + "\n\n" + \
+        DOCUMENT_PREFIX.format(text=text)
+
+
+def document_first(summary_type, text):
+    """Prompt from PROMPT_TEMPLATES (document prefix shared by every type)"""
+    return (DOCUMENT_PREFIX + PROMPT_INSTRUCTIONS[summary_type]).format(
+        text=text,
+        length=LENGTH_SENTENCES["medium"]
+    )
+
+
+def run(ollama, model, build_prompt, text, options, keep_alive):
+    """
+    Request every summary type in turn
+    
+    Returns:
+        list: (summary_type, prompt_eval_count, prompt_eval_ms) per request
+    """
+    # An unrelated prompt evicts any cached prefix from earlier runs
+    ollama.session.post(ollama.generate_url, json={
+        "model": model, "prompt": "Say OK.", "stream": False,
+        "options": dict(options, num_predict=1), "keep_alive": keep_alive
+    }).raise_for_status()
+    
+    rows = []
+    for summary_type in PROMPT_INSTRUCTIONS:
+        response = ollama.session.post(ollama.generate_url, json={
+            "model": model,
+            "prompt": build_prompt(summary_type, text),
+            "stream": False,
+            "options": options,
+            "keep_alive": keep_alive
+        })
+        response.raise_for_status()
+        data = response.json()
+        rows.append((
+            summary_type,
+            data.get('prompt_eval_count', 0),
+            data.get('prompt_eval_duration', 0) / 1e6
+        ))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default="llama2")
+    parser.add_argument("--words", type=int, default=1500)
+    parser.add_argument("--num-predict", type=int, default=16,
+                        help="Output tokens per request (kept small: only prompt eval is compared)")
+    parser.add_argument("--keep-alive", default="10m")
+    parser.add_argument("--ollama-url", default="http://localhost:11434")
+    args = parser.parse_args()
+    
+    ollama = OllamaClient(args.ollama_url)
+    text = make_text(args.words)
+    options = {
+        "num_ctx": estimate_tokens(text) + 1024,
+        "num_predict": args.num_predict
+    }
+    print(f"Document: {args.words:,} words, ~{estimate_tokens(text):,} tokens, model {args.model}")
+    
+    for name, build_prompt in (("instructions first", instructions_first),
+                               ("document first", document_first)):
+        rows = run(ollama, args.model, build_prompt, text, options, args.keep_alive)
+        print(f"\n{name}")
+        print(f"{'summary type':<16}{'prompt tokens':>15}{'prompt eval ms':>16}")
+        for summary_type, count, ms in rows:
+            print(f"{summary_type:<16}{count:>15,}{ms:>16.1f}")
+        print(f"{'total':<16}{sum(r[1] for r in rows):>15,}{sum(r[2] for r in rows):>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Benchmark Fixtures Module
+File: benchmarks/fixtures.py
+Description: Synthetic documents and measurement for reproducible benchmarks
+"""
+
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from fpdf import FPDF
+
+# Generated PDFs are kept here so every run measures the same bytes
+FIXTURE_DIR = os.path.join(tempfile.gettempdir(), "pdf_summarizer_bench")
+
+WORDS = (
+    "analysis report revenue growth quarter market customer product strategy "
+    "risk capital investment operating margin forecast segment regional global "
+    "performance the of and to in for with on by from results increased decreased "
+    "significant compared previous year management board committee policy"
+).split()
+
+
+def make_text(words, seed=0):
+    """
+    Generate deterministic pseudo-English text
+    
+    Args:
+        words (int): Number of words
+        seed (int): Random seed
+        
+    Returns:
+        str: Text made of sentences and paragraphs
+    """
+    rng = random.Random(seed)
+    parts = []
+    for i in range(words):
+        parts.append(rng.choice(WORDS))
+        if i % 15 == 14:
+            parts[-1] += "."
+        if i % 120 == 119:
+            parts[-1] += "\n\n"
+    return " ".join(parts)
+
+
+def make_pdf(pages, lines_per_page=40, seed=0):
+    """
+    Generate a text PDF in memory
+    
+    Args:
+        pages (int): Number of pages
+        lines_per_page (int): Text lines written on each page
+        seed (int): Random seed
+        
+    Returns:
+        bytes: PDF content
+    """
+    rng = random.Random(seed)
+    pdf = FPDF()
+    pdf.set_auto_page_break(False)
+    pdf.set_font("Arial", size=9)
+    for page in range(pages):
+        pdf.add_page()
+        pdf.cell(0, 5, f"Quarterly Report - Page {page + 1}", ln=True)
+        for _ in range(lines_per_page):
+            line = " ".join(rng.choice(WORDS) for _ in range(14))
+            pdf.cell(0, 6, line.capitalize() + ".", ln=True)
+    return pdf.output(dest='S').encode('latin-1')
+
+
+def fixture_pdf(pages, directory=FIXTURE_DIR, seed=0):
+    """
+    Load a generated PDF, creating it on first use
+    
+    fpdf stamps each file with its creation time, so PDFs are written once
+    and reused; runs compared against each other then parse identical input.
+    
+    Args:
+        pages (int): Number of pages
+        directory (str): Where fixture PDFs are stored
+        seed (int): Random seed
+        
+    Returns:
+        bytes: PDF content
+    """
+    path = os.path.join(directory, f"report_{pages}p_seed{seed}.pdf")
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(make_pdf(pages, seed=seed))
+        os.replace(tmp_path, path)
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def make_pages(pages, lines_per_page=40, seed=0):
+    """
+    Generate page texts shaped like PyPDF2 output
+    
+    Pages have a running header, wrapped lines, occasional end-of-line
+    hyphenation and ligature characters, blank lines between paragraphs and
+    a page number footer.
+    
+    Args:
+        pages (int): Number of pages
+        lines_per_page (int): Body lines on each page
+        seed (int): Random seed
+        
+    Returns:
+        list: Page texts
+    """
+    rng = random.Random(seed)
+    page_texts = []
+    for page in range(pages):
+        lines = ["ACME Corporation Annual Report 2023", ""]
+        carry = ""
+        for line_number in range(lines_per_page):
+            words = [rng.choice(WORDS) for _ in range(12)]
+            if carry:
+                words[0] = carry
+                carry = ""
+            if rng.random() < 0.05:
+                words[1] = "\ufb01nancial"
+            if rng.random() < 0.1 and line_number % 8 != 7:
+                word = rng.choice(["management", "investment", "performance", "significant"])
+                words[-1] = word[:4] + "-"
+                carry = word[4:]
+            lines.append(" ".join(words))
+            if line_number % 8 == 7:
+                lines[-1] += "."
+                lines.append("")
+        lines.append(f"Page {page + 1} of {pages}")
+        page_texts.append("\n".join(lines))
+    return page_texts
+
+
+def measure(func, *args):
+    """
+    Run func once for wall time and once under tracemalloc for peak memory
+    
+    Returns:
+        dict: seconds and peak_mb
+    """
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return {'seconds': elapsed, 'peak_mb': peak / (1024 * 1024)}
@@ -0,0 +1,542 @@
+"""
+Stub Ollama Server
+File: benchmarks/stub_ollama.py
+Description: Local mock of the Ollama HTTP API for benchmarks and load tests
+
+Serves /api/generate and /api/chat (streamed as NDJSON or as one JSON
+reply), /api/tags, /api/show, /api/ps and /api/version. Replies are canned
+tokens paced at tokens_per_second and report Ollama's duration and token
+count fields. Like a real server it can:
+
+- add a fixed latency and a prompt evaluation rate before the first token,
+  reusing the longest prompt prefix cached in one of the model's slots
+- load models on first use (load_seconds) and unload them after keep_alive
+- run at most num_parallel generations at once, queueing the rest and
+  rejecting requests with 503 beyond max_queue (OLLAMA_NUM_PARALLEL and
+  OLLAMA_MAX_QUEUE)
+- fail a share of generations with an HTTP error or a dropped connection,
+  at random (failure_rate, disconnect_rate) or scripted with fail_next()
+
+Usage:
+    with StubOllama(tokens_per_second=200) as stub:
+        client = OllamaClient(base_url=stub.url)
+
+    python -m benchmarks.stub_ollama --port 11434 --tokens-per-second 30 --num-parallel 4
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import cycle, islice
+
+from backend.utils import estimate_tokens
+
+CANNED_TOKENS = (
+    "The", " document", " reports", " steady", " revenue", " growth", " across",
+    " regional", " segments", ".", " Management", " expects", " margins", " to",
+    " improve", " next", " year", "."
+)
+
+# Ollama's keep_alive durations: "30s", "5m", "1h" or a plain number of seconds
+_DURATION = re.compile(r"^(-?\d+(?:\.\d+)?)(ms|s|m|h)?$")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}
+
+
+def parse_duration(value, default):
+    """
+    Convert a keep_alive value to seconds
+    
+    Args:
+        value (str | int | float): Duration, negative for ever, None for default
+        default (float): Seconds used when value is None
+        
+    Returns:
+        float: Seconds (infinity for a negative duration)
+    """
+    if value is None:
+        return default
+    match = _DURATION.match(str(value).strip())
+    if not match:
+        raise ValueError(f"invalid keep_alive duration: {value!r}")
+    seconds = float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+    return float("inf") if seconds < 0 else seconds
+
+
+class _Rejected(Exception):
+    """Request answered with an error status instead of a generation"""
+    
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Request handler; the StubOllama instance is self.server.stub"""
+    
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; with Nagle's algorithm each reply on a
+    # kept-alive connection would wait ~40 ms for the client's delayed ACK
+    disable_nagle_algorithm = True
+    
+    def log_message(self, format, *args):
+        """Keep benchmark output free of access logs"""
+    
+    def _send_json(self, body, status=200):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+    
+    def do_GET(self):
+        stub = self.server.stub
+        if self.path == "/api/tags":
+            self._send_json({"models": [
+                {"name": name, "model": name, "size": 0, "details": {"family": "stub"}}
+                for name in stub.models
+            ]})
+        elif self.path == "/api/ps":
+            self._send_json({"models": stub.loaded_models()})
+        elif self.path == "/api/version":
+            self._send_json({"version": "0.0.0-stub"})
+        else:
+            self._send_json({"error": "not found"}, 404)
+    
+    def do_POST(self):
+        stub = self.server.stub
+        body = self._read_json()
+        if self.path == "/api/show":
+            name = body.get("model") or body.get("name")
+            if name not in stub.models:
+                self._send_json({"error": f"model '{name}' not found"}, 404)
+                return
+            self._send_json({
+                "model_info": {"llama.context_length": stub.context_length},
+                "parameters": ""
+            })
+        elif self.path == "/api/generate":
+            self._generate(stub, body, "response", body.get("prompt", ""))
+        elif self.path == "/api/chat":
+            prompt = "\n".join(m.get("content", "") for m in body.get("messages", []))
+            self._generate(stub, body, "message", prompt)
+        else:
+            self._send_json({"error": "not found"}, 404)
+    
+    def _reply(self, key, text):
+        """Response field of a generate (plain text) or chat (message) chunk"""
+        if key == "message":
+            return {"message": {"role": "assistant", "content": text}}
+        return {"response": text}
+    
+    def _generate(self, stub, body, key, prompt):
+        """Answer a generate or chat request with canned tokens"""
+        model = body.get("model")
+        stub.count("requests")
+        if model not in stub.models:
+            stub.count("failed")
+            self._send_json({"error": f"model \"{model}\" not found, try pulling it first"}, 404)
+            return
+        
+        failure = stub.next_failure()
+        if failure == "disconnect":
+            stub.count("disconnected")
+            self.close_connection = True
+            return
+        if failure:
+            stub.count("failed")
+            self._send_json({"error": "injected failure"}, failure)
+            return
+        
+        try:
+            with stub.slot():
+                try:
+                    self._run_generation(stub, body, key, prompt, model)
+                finally:
+                    stub.release(model, body.get("keep_alive"))
+        except _Rejected as rejected:
+            stub.count("rejected")
+            self._send_json({"error": str(rejected)}, rejected.status)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client went away (e.g. a cancelled stream); Ollama stops generating
+            stub.count("aborted")
+            self.close_connection = True
+    
+    def _run_generation(self, stub, body, key, prompt, model):
+        """Generate while holding a parallel slot"""
+        start = time.perf_counter()
+        load_seconds = stub.load(model)
+        
+        if not prompt and key == "response":
+            # Empty prompt only loads (or, with keep_alive 0, unloads) the model
+            final = stub.final_chunk(model, load_seconds, 0, 0, 0, time.perf_counter() - start)
+            final.update(self._reply(key, ""), done_reason="load")
+            self._send_json(final)
+            stub.count("completed")
+            return
+        
+        prompt_tokens = stub.evaluate_prompt(model, prompt)
+        prompt_seconds = stub.latency + (
+            prompt_tokens / stub.prompt_tokens_per_second if stub.prompt_tokens_per_second else 0.0
+        )
+        time.sleep(prompt_seconds)
+        
+        limit = (body.get("options") or {}).get("num_predict")
+        count = stub.reply_tokens if limit is None or limit < 0 else min(limit, stub.reply_tokens)
+        tokens = list(islice(cycle(CANNED_TOKENS), count))
+        drop_after = len(tokens) // 2 if stub.next_failure(mid_stream=True) else None
+        
+        if not body.get("stream", True):
+            time.sleep(count * stub.token_interval)
+            if drop_after is not None:
+                stub.count("disconnected")
+                self.close_connection = True
+                return
+            final = stub.final_chunk(model, load_seconds, prompt_tokens, prompt_seconds, count,
+                                     time.perf_counter() - start)
+            final.update(self._reply(key, "".join(tokens)), done_reason="stop")
+            self._send_json(final)
+        else:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for index, token in enumerate(tokens):
+                if index == drop_after:
+                    stub.count("disconnected")
+                    self.close_connection = True
+                    return
+                time.sleep(stub.token_interval)
+                self._write_chunk(dict(self._reply(key, token), model=model, done=False))
+            final = stub.final_chunk(model, load_seconds, prompt_tokens, prompt_seconds, count,
+                                     time.perf_counter() - start)
+            final.update(self._reply(key, ""), done_reason="stop")
+            self._write_chunk(final)
+            self.wfile.write(b"0\r\n\r\n")
+        stub.count("completed")
+    
+    def _write_chunk(self, body):
+        """Send one NDJSON line as an HTTP chunk"""
+        data = (json.dumps(body) + "\n").encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+
+class StubOllama:
+    """In-process Ollama stand-in emitting canned tokens at a configurable rate"""
+    
+    def __init__(self, host="127.0.0.1", port=0, tokens_per_second=200.0, reply_tokens=16,
+                 context_length=4096, models=("stub:latest",), latency=0.0,
+                 prompt_tokens_per_second=0.0, load_seconds=0.0, keep_alive="5m",
+                 num_parallel=0, max_queue=512, failure_rate=0.0, failure_status=500,
+                 disconnect_rate=0.0, seed=0):
+        """
+        Initialize stub server (call start() or use it as a context manager)
+        
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind (0 picks a free one)
+            tokens_per_second (float): Generation rate of every request (0 = no delay)
+            reply_tokens (int): Tokens in every reply (capped by num_predict)
+            context_length (int): Context window reported by /api/show
+            models (tuple): Model names listed by /api/tags
+            latency (float): Seconds added before the first token of every generation
+            prompt_tokens_per_second (float): Prompt evaluation rate (0 = instant)
+            load_seconds (float): Time to load a model that is not in memory
+            keep_alive: Default time a model stays loaded after a request ("5m", seconds)
+            num_parallel (int): Generations served at once, others queue (0 = unlimited)
+            max_queue (int): Queued generations before new ones get 503
+            failure_rate (float): Share of generations answered with failure_status
+            failure_status (int): HTTP status of injected failures
+            disconnect_rate (float): Share of generations whose connection drops mid-reply
+            seed (int): Seed of the failure injection
+        """
+        self.tokens_per_second = tokens_per_second
+        self.token_interval = 1.0 / tokens_per_second if tokens_per_second else 0.0
+        self.reply_tokens = reply_tokens
+        self.context_length = context_length
+        self.models = list(models)
+        self.latency = latency
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+        self.load_seconds = load_seconds
+        self.keep_alive = parse_duration(keep_alive, 300.0)
+        self.num_parallel = num_parallel
+        self.max_queue = max_queue
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.disconnect_rate = disconnect_rate
+        
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._scripted = deque()
+        self._slots = threading.BoundedSemaphore(num_parallel) if num_parallel else None
+        self._active = 0
+        self._queued = 0
+        self._loaded = {}
+        self._in_use = dict.fromkeys(self.models, 0)
+        self._load_locks = {name: threading.Lock() for name in self.models}
+        # Recent prompts per model, one per parallel slot, for prefix reuse
+        self._prompts = {name: deque(maxlen=max(1, num_parallel)) for name in self.models}
+        self.stats = dict.fromkeys((
+            "requests", "completed", "failed", "rejected", "disconnected", "aborted", "loads",
+            "peak_active", "peak_queued", "prompt_tokens", "cached_prompt_tokens"
+        ), 0)
+        
+        self._server = ThreadingHTTPServer((host, port), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = None
+    
+    @property
+    def url(self):
+        """Base URL to pass to OllamaClient"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    @property
+    def requests(self):
+        """Generation requests received"""
+        return self.stats["requests"]
+    
+    def count(self, name, amount=1):
+        """Increment a counter of stats"""
+        with self._lock:
+            self.stats[name] += amount
+    
+    def fail_next(self, count=1, status=503):
+        """
+        Make the next generations fail, ahead of any random failures
+        
+        Args:
+            count (int): Number of generations to fail
+            status (int): HTTP status to answer with, or None to drop the connection
+        """
+        with self._lock:
+            self._scripted.extend([status or "disconnect"] * count)
+    
+    def next_failure(self, mid_stream=False):
+        """
+        Decide whether a generation fails
+        
+        Args:
+            mid_stream (bool): Ask whether a started reply is cut off instead
+            
+        Returns:
+            HTTP status, "disconnect", or None to answer normally
+        """
+        with self._lock:
+            if mid_stream:
+                return "disconnect" if self._random.random() < self.disconnect_rate else None
+            if self._scripted:
+                return self._scripted.popleft()
+            if self._random.random() < self.failure_rate:
+                return self.failure_status
+        return None
+    
+    @contextmanager
+    def slot(self):
+        """
+        Hold one of num_parallel generation slots, waiting in the queue if needed
+        
+        Raises:
+            _Rejected: With 503 when max_queue requests are already waiting
+        """
+        with self._lock:
+            if self._slots is not None and self._queued >= self.max_queue:
+                raise _Rejected(503, "server busy, please try again. "
+                                     "maximum pending requests exceeded")
+            self._queued += 1
+            self.stats["peak_queued"] = max(self.stats["peak_queued"], self._queued)
+        if self._slots is not None:
+            self._slots.acquire()
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self.stats["peak_active"] = max(self.stats["peak_active"], self._active)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active -= 1
+            if self._slots is not None:
+                self._slots.release()
+    
+    def load(self, model):
+        """
+        Load a model unless it is still in memory
+        
+        The model stays loaded while requests use it; release() starts the
+        keep_alive countdown.
+        
+        Args:
+            model (str): Model name
+            
+        Returns:
+            float: Seconds spent loading (0.0 if already loaded)
+        """
+        with self._load_locks[model]:
+            with self._lock:
+                loaded = self._loaded.get(model, 0.0) > time.monotonic()
+                self._loaded[model] = float("inf")
+                self._in_use[model] += 1
+            if loaded:
+                return 0.0
+            time.sleep(self.load_seconds)
+            with self._lock:
+                self._prompts[model].clear()
+                self.stats["loads"] += 1
+            return self.load_seconds
+    
+    def release(self, model, keep_alive=None):
+        """
+        Start a model's keep_alive countdown once its last request finishes
+        
+        Args:
+            model (str): Model name
+            keep_alive: Request's keep_alive (0 unloads the model now)
+        """
+        with self._lock:
+            self._in_use[model] -= 1
+            if not self._in_use[model]:
+                self._loaded[model] = time.monotonic() + parse_duration(keep_alive, self.keep_alive)
+    
+    def loaded_models(self):
+        """
+        Models in memory, as listed by /api/ps
+        
+        Returns:
+            list: name, model, size and expires_at of each loaded model
+        """
+        now = time.monotonic()
+        with self._lock:
+            loaded = [(name, expires) for name, expires in self._loaded.items() if expires > now]
+        return [{
+            "name": name,
+            "model": name,
+            "size": 0,
+            "expires_at": "never" if expires == float("inf") else
+            time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + expires - now))
+        } for name, expires in loaded]
+    
+    def evaluate_prompt(self, model, prompt):
+        """
+        Count the prompt tokens to evaluate, reusing the longest cached prefix
+        
+        Args:
+            model (str): Model name
+            prompt (str): Prompt text
+            
+        Returns:
+            int: Tokens evaluated (at least 1)
+        """
+        with self._lock:
+            cached = max(
+                (len(os.path.commonprefix([seen, prompt])) for seen in self._prompts[model]),
+                default=0
+            )
+            self._prompts[model].append(prompt)
+            tokens = max(1, estimate_tokens(prompt[cached:]))
+            self.stats["prompt_tokens"] += tokens
+            self.stats["cached_prompt_tokens"] += estimate_tokens(prompt[:cached])
+        return tokens
+    
+    def final_chunk(self, model, load_seconds, prompt_tokens, prompt_seconds, eval_tokens, elapsed):
+        """
+        Closing chunk with the timing fields Ollama reports
+        
+        Args:
+            model (str): Model name
+            load_seconds (float): Time spent loading the model
+            prompt_tokens (int): Prompt tokens evaluated
+            prompt_seconds (float): Time spent evaluating the prompt
+            eval_tokens (int): Tokens generated
+            elapsed (float): Seconds spent on the request
+            
+        Returns:
+            dict: done, durations in nanoseconds and token counts
+        """
+        eval_ns = int(eval_tokens * self.token_interval * 1e9)
+        return {
+            "model": model,
+            "done": True,
+            "total_duration": max(int(elapsed * 1e9), eval_ns),
+            "load_duration": int(load_seconds * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(prompt_seconds * 1e9),
+            "eval_count": eval_tokens,
+            "eval_duration": eval_ns
+        }
+    
+    def start(self):
+        """
+        Serve requests on a background thread
+        
+        Returns:
+            StubOllama: self
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def serve_forever(self):
+        """Serve requests on the calling thread until interrupted"""
+        self._server.serve_forever()
+    
+    def stop(self):
+        """Stop serving and release the port"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--models", nargs="+", default=["stub:latest"])
+    parser.add_argument("--tokens-per-second", type=float, default=30.0)
+    parser.add_argument("--reply-tokens", type=int, default=64)
+    parser.add_argument("--context-length", type=int, default=4096)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--prompt-tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--load-seconds", type=float, default=0.0)
+    parser.add_argument("--keep-alive", default="5m")
+    parser.add_argument("--num-parallel", type=int, default=0)
+    parser.add_argument("--max-queue", type=int, default=512)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--failure-status", type=int, default=500)
+    parser.add_argument("--disconnect-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    stub = StubOllama(**vars(args))
+    print(f"Stub Ollama serving {', '.join(stub.models)} at {stub.url} (Ctrl+C to stop)")
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.stop()
+        print(json.dumps(stub.stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Benchmark Suite
+File: benchmarks/suite.py
+Description: Reproducible timings of extraction, chunking, statistics, summarization and export
+
+Runs every case on generated report PDFs (10, 100 and 1,000 pages by
+default) and the summarizer against a local StubOllama, so results depend
+on the code and the machine, not on a model. Each case runs --repeat times;
+the JSON written with --output keeps every run plus min/median/mean and can
+be compared with a later run.
+
+Usage:
+    python -m benchmarks.suite [--pages 10 100 1000] [--repeat 3] [--output results.json]
+    python -m benchmarks.suite --only extract stats --pages 1000
+    python -m benchmarks.suite --compare baseline.json results.json [--threshold 10]
+"""
+
+import argparse
+import datetime
+import hashlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from backend import metrics
+from backend.exporter import SummaryExporter
+from backend.ollama_client import OllamaClient
+from backend.pdf_extractor import PDFTextExtractor
+from backend.summarizer import PROMPT_TEMPLATES, AISummarizer
+from backend.utils import (
+    TextStats,
+    calculate_statistics,
+    count_sentences,
+    extract_key_stats,
+    get_reading_time,
+    split_into_chunks,
+    split_into_token_chunks
+)
+from benchmarks.fixtures import fixture_pdf
+from benchmarks.stub_ollama import StubOllama
+
+GROUPS = ("extract", "chunk", "stats", "summarize", "export")
+
+STUB_MODEL = "stub:latest"
+
+
+def time_runs(func, repeat):
+    """
+    Time repeated calls of func
+    
+    Args:
+        func (callable): Function without arguments
+        repeat (int): Number of timed calls
+        
+    Returns:
+        dict: runs (seconds of each call), min, median and mean
+    """
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return {
+        'runs': runs,
+        'min': min(runs),
+        'median': statistics.median(runs),
+        'mean': statistics.fmean(runs)
+    }
+
+
+def time_generation(func, repeat, stub):
+    """
+    Time repeated summarizer calls, adding the Ollama traffic of one call
+    
+    Args:
+        func (callable): Function without arguments
+        repeat (int): Number of timed calls
+        stub (StubOllama): Server the summarizer talks to
+        
+    Returns:
+        dict: time_runs() result with requests, prompt_tokens and eval_tokens per call
+    """
+    requests_before = stub.requests
+    with metrics.collect() as collected:
+        result = time_runs(func, repeat)
+    totals = collected.totals()
+    result['requests'] = (stub.requests - requests_before) / repeat
+    result['prompt_tokens'] = totals['prompt_tokens'] / repeat
+    result['eval_tokens'] = totals['eval_tokens'] / repeat
+    return result
+
+
+def document_cases(pages, text, page_texts, summary):
+    """CPU-only cases on an extracted document"""
+    stats = TextStats.from_text(text)
+    return {
+        'chunk': {
+            'split_into_chunks': lambda: split_into_chunks(text),
+            'split_into_token_chunks': lambda: split_into_token_chunks(text, 3072, 50),
+        },
+        'stats': {
+            'TextStats.from_text': lambda: TextStats.from_text(text),
+            'TextStats.from_pages': lambda: TextStats.from_pages(page_texts),
+            'calculate_statistics': lambda: calculate_statistics(text, summary, stats),
+            'count_sentences': lambda: count_sentences(text),
+            'get_reading_time': lambda: get_reading_time(text),
+            'extract_key_stats': lambda: extract_key_stats(text),
+        },
+        'export': {
+            'SummaryExporter.create_pdf': lambda: SummaryExporter.create_pdf(
+                summary,
+                title=f"Report ({pages} pages)",
+                summary_type="Fast Extractive",
+                metadata={'Pages': pages, 'Model': STUB_MODEL}
+            ),
+        },
+    }
+
+
+def summarizer_cases(text, ollama):
+    """Summarizer cases; each builds a fresh AISummarizer so nothing is cached"""
+    types = list(PROMPT_TEMPLATES)
+    
+    def summarizer(**kwargs):
+        return AISummarizer(ollama, **kwargs)
+    
+    return {
+        'AISummarizer.prepare_text': lambda: summarizer().prepare_text(text, STUB_MODEL),
+        'AISummarizer.prepare_text[prefilter]': lambda: summarizer(prefilter=True).prepare_text(
+            text, STUB_MODEL
+        ),
+        'AISummarizer.summarize_abstractive': lambda: summarizer().summarize_abstractive(
+            text, STUB_MODEL
+        ),
+        'AISummarizer.summarize_many': lambda: list(
+            summarizer().summarize_many(text, STUB_MODEL, types)
+        ),
+        'AISummarizer.summarize_fast_extractive': lambda: summarizer().summarize_fast_extractive(
+            text, "long"
+        ),
+    }
+
+
+def run_suite(page_sizes, groups, repeat, stub):
+    """
+    Run the selected benchmark groups on every fixture size
+    
+    Args:
+        page_sizes (list): Fixture sizes in pages
+        groups (list): Names from GROUPS
+        repeat (int): Timed calls per case
+        stub (StubOllama): Server used by the summarize group
+        
+    Returns:
+        tuple: (results keyed "case@pages", fixture SHA-256 by page count)
+    """
+    ollama = OllamaClient(base_url=stub.url)
+    results = {}
+    fixtures = {}
+    
+    def record(case, pages, result):
+        results[f"{case}@{pages}"] = dict(case=case, pages=pages, **result)
+        print(f"{case:<42}{pages:>7}{result['median']:>11.4f}{result['min']:>11.4f}"
+              + (f"{result['requests']:>10.0f}" if 'requests' in result else ""))
+    
+    print(f"{'case':<42}{'pages':>7}{'median s':>11}{'min s':>11}{'requests':>10}")
+    for pages in page_sizes:
+        pdf_bytes = fixture_pdf(pages)
+        fixtures[pages] = hashlib.sha256(pdf_bytes).hexdigest()
+        
+        if "extract" in groups:
+            record("extract_text_from_pdf", pages, time_runs(
+                lambda: PDFTextExtractor.extract_text_from_pdf(io.BytesIO(pdf_bytes)), repeat
+            ))
+        
+        page_texts = PDFTextExtractor.extract_pages(io.BytesIO(pdf_bytes))
+        text = PDFTextExtractor.join_pages(page_texts)
+        summary = AISummarizer(ollama).summarize_fast_extractive(text, "long")
+        
+        for group, cases in document_cases(pages, text, page_texts, summary).items():
+            if group in groups:
+                for case, func in cases.items():
+                    record(case, pages, time_runs(func, repeat))
+        
+        if "summarize" in groups:
+            for case, func in summarizer_cases(text, ollama).items():
+                record(case, pages, time_generation(func, repeat, stub))
+    
+    ollama.close()
+    return results, fixtures
+
+
+def git_commit():
+    """Current commit of the working tree, or None outside a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current, threshold, noise_floor=0.001):
+    """
+    Print the change of every case present in both result files
+    
+    Cases are compared on their fastest run, the measurement least affected
+    by other load on the machine. Differences under noise_floor seconds are
+    never flagged, so sub-millisecond cases do not report timer jitter.
+    
+    Args:
+        baseline (dict): Earlier results document
+        current (dict): Later results document
+        threshold (float): Percent slowdown reported as a regression
+        noise_floor (float): Smallest absolute difference in seconds that is flagged
+        
+    Returns:
+        list: Keys of regressed cases
+    """
+    print(f"baseline {baseline['meta'].get('commit')} vs current {current['meta'].get('commit')}")
+    print(f"{'case':<50}{'before s':>11}{'after s':>11}{'change':>9}  (fastest run)")
+    regressions = []
+    for key, after in current['results'].items():
+        before = baseline['results'].get(key)
+        if before is None:
+            continue
+        change = (after['min'] - before['min']) / before['min'] * 100 if before['min'] else 0.0
+        flag = ""
+        if abs(after['min'] - before['min']) < noise_floor:
+            pass
+        elif change > threshold:
+            flag = "  slower"
+            regressions.append(key)
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{key:<50}{before['min']:>11.4f}{after['min']:>11.4f}{change:>+8.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--only", nargs="+", choices=GROUPS, default=list(GROUPS),
+                        help="Benchmark groups to run")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0,
+                        help="Generation rate of the stub server (0 = instant)")
+    parser.add_argument("--reply-tokens", type=int, default=16,
+                        help="Tokens in every stub reply")
+    parser.add_argument("--context-length", type=int, default=4096,
+                        help="Context window reported by the stub server")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="Compare two result files instead of running")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Percent slowdown of the fastest run counted as a regression")
+    args = parser.parse_args()
+    
+    if args.compare:
+        documents = []
+        for path in args.compare:
+            with open(path, encoding="utf-8") as f:
+                documents.append(json.load(f))
+        regressions = compare(documents[0], documents[1], args.threshold)
+        sys.exit(1 if regressions else 0)
+    
+    with StubOllama(
+        tokens_per_second=args.tokens_per_second,
+        reply_tokens=args.reply_tokens,
+        context_length=args.context_length,
+        models=(STUB_MODEL,)
+    ) as stub:
+        results, fixtures = run_suite(args.pages, args.only, args.repeat, stub)
+    
+    if args.output:
+        document = {
+            'meta': {
+                'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                'commit': git_commit(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'repeat': args.repeat,
+                'stub': {
+                    'tokens_per_second': args.tokens_per_second,
+                    'reply_tokens': args.reply_tokens,
+                    'context_length': args.context_length
+                },
+                'fixtures': {str(pages): digest for pages, digest in fixtures.items()}
+            },
+            'results': results
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
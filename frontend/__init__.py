@@ -5,28 +5,44 @@ Description: Frontend module for UI components and styling
 """
 
 from .styles import load_custom_css
+from .reporting import StreamlitReporter
 from .components import (
+    SUMMARY_TYPE_OPTIONS,
     render_header,
     render_features,
     render_sidebar,
+    render_cache_stats,
+    render_model_warm_up,
+    render_metrics_export,
     render_file_info,
     render_text_statistics,
+    render_cleanup_report,
     render_processing_status,
+    render_job_progress,
     render_summary_statistics,
+    render_stage_breakdown,
     render_summary_display,
     render_download_section,
     render_footer
 )
 
 __all__ = [
+    'SUMMARY_TYPE_OPTIONS',
     'load_custom_css',
+    'StreamlitReporter',
     'render_header',
     'render_features',
     'render_sidebar',
+    'render_cache_stats',
+    'render_model_warm_up',
+    'render_metrics_export',
     'render_file_info',
     'render_text_statistics',
+    'render_cleanup_report',
     'render_processing_status',
+    'render_job_progress',
     'render_summary_statistics',
+    'render_stage_breakdown',
     'render_summary_display',
     'render_download_section',
     'render_footer'
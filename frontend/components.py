@@ -7,6 +7,29 @@ Description: Reusable UI components for the AI PDF Summarizer
 import streamlit as st
 from datetime import datetime
 
+from backend.utils import TextStats
+
+# Sidebar labels mapped to AISummarizer summary type keys
+SUMMARY_TYPE_OPTIONS = {
+    "🎯 Extractive (Key Sentences)": "extractive",
+    "✨ Abstractive (AI-Generated)": "abstractive",
+    "📌 Bullet Points": "bullet_points",
+    "❓ Question-Based Analysis": "questions",
+    "💡 Key Insights": "key_insights",
+    "⚡ Fast Extractive (no AI)": "fast_extractive"
+}
+
+# Pipeline stages recorded by backend.metrics, in display order
+STAGE_LABELS = {
+    "extract": "Extract",
+    "strip_boilerplate": "Headers/footers",
+    "clean": "Clean",
+    "prefilter": "Pre-filter",
+    "condense": "Condense",
+    "prime": "Prefix",
+    "fast_extractive": "Sentence ranking"
+}
+
 def render_header():
     """Render premium header"""
     st.markdown("""
@@ -74,16 +97,11 @@ def render_sidebar(ollama):
         st.markdown("---")
         st.markdown("### 📝 Summary Settings")
         
-        summary_type = st.radio(
-            "Summarization Type",
-            [
-                "🎯 Extractive (Key Sentences)",
-                "✨ Abstractive (AI-Generated)",
-                "📌 Bullet Points",
-                "❓ Question-Based Analysis",
-                "💡 Key Insights"
-            ],
-            help="Choose how AI should summarize"
+        summary_types = st.multiselect(
+            "Summarization Types",
+            list(SUMMARY_TYPE_OPTIONS),
+            default=list(SUMMARY_TYPE_OPTIONS)[:1],
+            help="Choose how AI should summarize; several types are generated in parallel"
         )
         
         summary_length = st.select_slider(
@@ -93,6 +111,13 @@ def render_sidebar(ollama):
             help="Control output length"
         )
         
+        prefilter = st.checkbox(
+            "⚡ Extractive pre-filter",
+            value=False,
+            help="Shrink long documents to their key sentences locally instead of "
+                 "condensing them with extra AI calls"
+        )
+        
         st.markdown("---")
         st.markdown("### 💾 Quick Actions")
         if st.button("🔄 Reset", use_container_width=True):
@@ -115,7 +140,52 @@ def render_sidebar(ollama):
             **Phi**: Microsoft's efficient small model
             """)
         
-        return selected_model, summary_type, summary_length
+        return selected_model, summary_types, summary_length, prefilter
+
+def render_cache_stats(cache_stats):
+    """Render summary cache hit/miss counters in the sidebar"""
+    with st.sidebar:
+        st.markdown("---")
+        st.markdown("### 🗄️ Summary Cache")
+        col1, col2 = st.columns(2)
+        col1.metric("Hits", cache_stats['hits'])
+        col2.metric("Misses", cache_stats['misses'])
+        st.caption(
+            f"{cache_stats['entries']} cached summaries "
+            f"({cache_stats['bytes'] / 1024:.1f} KB)"
+        )
+
+def render_model_warm_up(selected_model, warming, timings):
+    """Render whether the selected model is loaded in the sidebar"""
+    with st.sidebar:
+        if warming:
+            st.caption(f"🔥 Loading {selected_model} in the background...")
+        elif timings:
+            st.caption(f"🔥 {selected_model} ready (loaded in {timings['load_seconds']:.1f}s)")
+
+def render_metrics_export(metrics):
+    """Render downloads of the process-wide metrics in the sidebar"""
+    with st.sidebar:
+        with st.expander("📈 Metrics Export"):
+            totals = metrics.totals()
+            st.caption(
+                f"{totals['requests']:,} model requests · "
+                f"{totals['tokens_per_second']:.1f} tok/s generation"
+            )
+            st.download_button(
+                "⬇️ JSON",
+                data=metrics.to_json(),
+                file_name="metrics.json",
+                mime="application/json",
+                use_container_width=True
+            )
+            st.download_button(
+                "⬇️ Prometheus",
+                data=metrics.to_prometheus(),
+                file_name="metrics.prom",
+                mime="text/plain",
+                use_container_width=True
+            )
 
 def render_file_info(uploaded_file, total_pages):
     """Render file information cards"""
@@ -145,16 +215,17 @@ def render_file_info(uploaded_file, total_pages):
         </div>
         """, unsafe_allow_html=True)
 
-def render_text_statistics(extracted_text):
-    """Render text statistics"""
-    word_count = len(extracted_text.split())
+def render_text_statistics(extracted_text, stats=None):
+    """Render text statistics, reusing a precomputed TextStats when given"""
+    if stats is None:
+        stats = TextStats.from_text(extracted_text)
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown(f"""
         <div class="feature-card">
             <div class="feature-title">📊 Total Words</div>
-            <div class="feature-desc" style="font-size: 1.5rem; font-weight: 600;">{word_count:,}</div>
+            <div class="feature-desc" style="font-size: 1.5rem; font-weight: 600;">{stats.words:,}</div>
         </div>
         """, unsafe_allow_html=True)
     
@@ -162,10 +233,18 @@ def render_text_statistics(extracted_text):
         st.markdown(f"""
         <div class="feature-card">
             <div class="feature-title">🔤 Characters</div>
-            <div class="feature-desc" style="font-size: 1.5rem; font-weight: 600;">{len(extracted_text):,}</div>
+            <div class="feature-desc" style="font-size: 1.5rem; font-weight: 600;">{stats.characters:,}</div>
         </div>
         """, unsafe_allow_html=True)
 
+def render_cleanup_report(report):
+    """Render how much repeated header/footer text was removed"""
+    if report['lines_removed']:
+        st.caption(
+            f"🧹 Removed {report['lines_removed']:,} repeated header/footer lines "
+            f"({report['chars_removed']:,} characters, ~{report['tokens_saved']:,} tokens)"
+        )
+
 def render_processing_status(selected_model, summary_type, summary_length):
     """Render processing status message"""
     st.markdown(f"""
@@ -176,8 +255,34 @@ def render_processing_status(selected_model, summary_type, summary_length):
     </div>
     """, unsafe_allow_html=True)
 
-def render_summary_statistics(stats, processing_time, selected_model):
-    """Render summary statistics cards"""
+def render_job_progress(job, summary_labels, position=0):
+    """
+    Render a queued or running summary job
+    
+    Streamed text is shown as far as it has arrived, and summaries already
+    finished are shown in full.
+    
+    Returns:
+        bool: True if the cancel button was clicked
+    """
+    render_processing_status(job['model'], ", ".join(summary_labels.values()), job['length'])
+    if job['status'] == "pending":
+        st.info(f"⏳ Queued behind {position} other summary job{'s' if position != 1 else ''}")
+    else:
+        st.progress(max(job['progress'], 0.05))
+        if job['message']:
+            st.text(f"✍️ {job['message']}")
+    
+    for summary_type, text in job['partial'].items():
+        render_summary_display(text + "▌", summary_labels.get(summary_type, summary_type))
+    for summary_type, text in job['results'].items():
+        if text:
+            render_summary_display(text, summary_labels.get(summary_type, summary_type))
+    
+    return st.button("⏹️ Cancel", key=f"cancel_{job['id']}")
+
+def render_summary_statistics(stats, processing_time, selected_model, metrics=None):
+    """Render summary statistics cards, with a stage breakdown if metrics are given"""
     st.markdown("## 📊 Summary Statistics")
     col1, col2, col3, col4, col5 = st.columns(5)
     
@@ -220,6 +325,29 @@ def render_summary_statistics(stats, processing_time, selected_model):
             <div class="metric-label">{selected_model.split(':')[0]}</div>
         </div>
         """, unsafe_allow_html=True)
+    
+    if metrics is not None:
+        render_stage_breakdown(metrics)
+
+def render_stage_breakdown(metrics):
+    """Render where a request spent its time, per pipeline stage and model phase"""
+    stages = [
+        f"{label} {metrics.stage_seconds(stage):.1f}s"
+        for stage, label in STAGE_LABELS.items()
+        if stage in metrics.stages
+    ]
+    totals = metrics.totals()
+    if totals['requests']:
+        stages += [
+            f"Model load {totals['load_seconds']:.1f}s",
+            f"Prompt eval {totals['prompt_eval_seconds']:.1f}s "
+            f"({totals['prompt_tokens']:,} tokens, {totals['prompt_tokens_per_second']:.0f} tok/s)",
+            f"Generation {totals['eval_seconds']:.1f}s "
+            f"({totals['eval_tokens']:,} tokens, {totals['tokens_per_second']:.1f} tok/s)",
+            f"{totals['requests']} model requests"
+        ]
+    if stages:
+        st.caption("⏱️ " + " · ".join(stages))
 
 def render_summary_display(summary, summary_type):
     """Render the summary in styled container"""
@@ -231,8 +359,8 @@ def render_summary_display(summary, summary_type):
     </div>
     """, unsafe_allow_html=True)
 
-def render_download_section(summary, uploaded_file, summary_type, exporter):
-    """Render download buttons"""
+def render_download_section(summary, uploaded_file, summary_type, exporter, key="download"):
+    """Render download buttons (key must be unique when several summaries are shown)"""
     st.markdown("## 💾 Download Your Summary")
     col1, col2 = st.columns(2)
     
@@ -242,7 +370,8 @@ def render_download_section(summary, uploaded_file, summary_type, exporter):
             data=summary,
             file_name=f"summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
             mime="text/plain",
-            use_container_width=True
+            use_container_width=True,
+            key=f"{key}_txt"
         )
     
     with col2:
@@ -252,7 +381,8 @@ def render_download_section(summary, uploaded_file, summary_type, exporter):
             data=pdf_bytes,
             file_name=f"summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
             mime="application/pdf",
-            use_container_width=True
+            use_container_width=True,
+            key=f"{key}_pdf"
         )
 
 def render_footer():
@@ -0,0 +1,39 @@
+"""
+Frontend Reporting Module
+File: frontend/reporting.py
+Description: Streamlit implementation of the backend Reporter interface
+"""
+
+import streamlit as st
+
+from backend.reporting import ProgressTracker, Reporter
+
+
+class StreamlitProgressTracker(ProgressTracker):
+    """Progress bar with a status line below it"""
+    
+    def __init__(self):
+        self.progress_bar = st.progress(0)
+        self.status_text = st.empty()
+    
+    def update(self, fraction, message=""):
+        if message:
+            self.status_text.text(message)
+        self.progress_bar.progress(min(max(fraction, 0.0), 1.0))
+    
+    def close(self):
+        self.progress_bar.empty()
+        self.status_text.empty()
+
+
+class StreamlitReporter(Reporter):
+    """Show backend errors and progress in the running Streamlit page"""
+    
+    def error(self, message):
+        st.error(message)
+    
+    def warning(self, message):
+        st.warning(message)
+    
+    def progress(self):
+        return StreamlitProgressTracker()
@@ -0,0 +1,25 @@
+"""
+Test Fixtures
+File: tests/conftest.py
+Description: Stub Ollama servers shared by the tests
+"""
+
+import pytest
+
+from benchmarks.stub_ollama import StubOllama
+
+MODEL = "stub:latest"
+
+
+@pytest.fixture
+def stub():
+    """Stub server answering instantly with a short reply"""
+    with StubOllama(tokens_per_second=0, reply_tokens=8) as server:
+        yield server
+
+
+@pytest.fixture
+def slow_stub():
+    """Stub server streaming a long reply slowly, so jobs can be caught running"""
+    with StubOllama(tokens_per_second=50, reply_tokens=500) as server:
+        yield server
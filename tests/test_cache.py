@@ -0,0 +1,97 @@
+"""
+Summary Cache Tests
+File: tests/test_cache.py
+Description: Least recently used eviction of SummaryCache by entry count and size
+"""
+
+import os
+import time
+
+import pytest
+
+from backend.cache import SummaryCache
+
+
+def put_all(cache, keys):
+    """Store one summary per key, each last used a second before the next"""
+    start = time.time() - 100
+    for index, key in enumerate(keys):
+        cache.put(key, f"Summary of {key}")
+        os.utime(cache._path(key), (start + index, start + index))
+
+
+def test_hit_and_miss(tmp_path):
+    cache = SummaryCache(str(tmp_path))
+    key = SummaryCache.make_key("hash", "model", "abstractive", "short", "template")
+    assert cache.get(key) is None
+    
+    cache.put(key, "A summary")
+    assert cache.get(key) == "A summary"
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_key_depends_on_every_input():
+    base = ("hash", "model", "abstractive", "short", "template")
+    keys = {SummaryCache.make_key(*base)}
+    for index in range(len(base)):
+        changed = list(base)
+        changed[index] += "-other"
+        keys.add(SummaryCache.make_key(*changed))
+    assert len(keys) == len(base) + 1
+
+
+def test_evicts_oldest_by_entry_count(tmp_path):
+    cache = SummaryCache(str(tmp_path), max_entries=3)
+    put_all(cache, ["a", "b", "c", "d"])
+    
+    assert cache.get("a") is None
+    assert [cache.get(key) for key in "bcd"] == ["Summary of b", "Summary of c", "Summary of d"]
+    assert cache.stats()['entries'] == 3
+
+
+def test_get_refreshes_recency(tmp_path):
+    cache = SummaryCache(str(tmp_path), max_entries=3)
+    put_all(cache, ["a", "b", "c"])
+    
+    assert cache.get("a") == "Summary of a"
+    cache.put("d", "Summary of d")
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == "Summary of a"
+
+
+def test_evicts_oldest_by_bytes(tmp_path):
+    cache = SummaryCache(str(tmp_path))
+    cache.put("probe", "Summary of probe")
+    entry_bytes = cache.stats()['bytes']
+    cache.clear()
+    
+    cache.max_bytes = 2 * entry_bytes + entry_bytes // 2
+    put_all(cache, ["a", "b", "c"])
+    
+    assert cache.get("a") is None
+    assert cache.get("b") == "Summary of b"
+    assert cache.get("c") == "Summary of c"
+    assert cache.stats()['bytes'] <= cache.max_bytes
+
+
+def test_large_entry_evicts_several(tmp_path):
+    cache = SummaryCache(str(tmp_path), max_bytes=4096)
+    put_all(cache, ["a", "b", "c"])
+    
+    cache.put("large", "x" * 3900)
+    
+    assert cache.get("large") == "x" * 3900
+    assert cache.get("a") is None
+    assert cache.stats()['entries'] < 4
+    assert cache.stats()['bytes'] <= 4096
+
+
+def test_failed_put_leaves_no_temp_file(tmp_path):
+    cache = SummaryCache(str(tmp_path))
+    with pytest.raises(TypeError):
+        cache.put("key", "A summary", metadata={'pages': object()})
+    
+    assert os.listdir(tmp_path) == []
+    assert cache.get("key") is None
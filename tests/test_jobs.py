@@ -0,0 +1,142 @@
+"""
+Job Queue Tests
+File: tests/test_jobs.py
+Description: Status transitions of JobQueue jobs against the stub Ollama server
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from backend import jobs
+from backend.ollama_client import OllamaClient
+from benchmarks.stub_ollama import StubOllama
+
+from conftest import MODEL
+
+TEXT = "Revenue grew in every region this quarter. " * 20
+
+
+def wait_for(condition, timeout=10.0):
+    """Poll until condition() is true"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out waiting for the job")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    """Build JobQueues over one job directory and shut them all down afterwards"""
+    queues = []
+    
+    def make(url, **options):
+        client = OllamaClient(base_url=url, max_retries=0)
+        queue = jobs.JobQueue(client, job_dir=str(tmp_path), **options)
+        queues.append(queue)
+        return queue
+    
+    yield make
+    for queue in queues:
+        queue.shutdown(cancel=True)
+
+
+def read_record(queue, job_id):
+    with open(os.path.join(queue.job_dir, f"{job_id}.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_streamed_job_is_done(stub, make_queue):
+    queue = make_queue(stub.url)
+    job_id = queue.submit(TEXT, MODEL, ["abstractive"])
+    record = queue.wait(job_id, timeout=10)
+    
+    assert record['status'] == jobs.DONE
+    assert record['results']['abstractive']
+    assert record['partial'] == {}
+    assert record['progress'] == 1.0
+    assert record['created'] <= record['started'] <= record['finished']
+    assert read_record(queue, job_id)['status'] == jobs.DONE
+
+
+def test_job_with_several_types_is_done(stub, make_queue):
+    queue = make_queue(stub.url)
+    job_id = queue.submit(TEXT, MODEL, ["abstractive", "bullet_points"])
+    record = queue.wait(job_id, timeout=10)
+    
+    assert record['status'] == jobs.DONE
+    assert set(record['results']) == {"abstractive", "bullet_points"}
+    assert all(record['results'].values())
+
+
+def test_server_error_fails_job(stub, make_queue):
+    stub.fail_next(10, 500)
+    queue = make_queue(stub.url)
+    job_id = queue.submit(TEXT, MODEL, ["abstractive"])
+    record = queue.wait(job_id, timeout=10)
+    
+    assert record['status'] == jobs.FAILED
+    assert record['errors'] == ["Ollama API returned status code: 500"]
+    assert not any(record['results'].values())
+
+
+def test_dropped_stream_fails_job(make_queue):
+    with StubOllama(tokens_per_second=0, reply_tokens=8, disconnect_rate=1.0) as server:
+        queue = make_queue(server.url)
+        job_id = queue.submit(TEXT, MODEL, ["abstractive"])
+        record = queue.wait(job_id, timeout=10)
+    
+    assert record['status'] == jobs.FAILED
+    assert record['error']
+    assert not record['results'].get('abstractive')
+
+
+def test_cancel_running_job(slow_stub, make_queue):
+    queue = make_queue(slow_stub.url)
+    job_id = queue.submit(TEXT, MODEL, ["abstractive"])
+    wait_for(lambda: queue.get(job_id)['status'] == jobs.RUNNING)
+    
+    assert queue.cancel(job_id)
+    record = queue.wait(job_id, timeout=10)
+    assert record['status'] == jobs.CANCELLED
+    assert not record['results']
+    assert not queue.cancel(job_id)
+
+
+def test_cancel_pending_job(slow_stub, make_queue):
+    queue = make_queue(slow_stub.url, max_workers=1)
+    running = queue.submit(TEXT, MODEL, ["abstractive"])
+    wait_for(lambda: queue.get(running)['status'] == jobs.RUNNING)
+    pending = queue.submit(TEXT, MODEL, ["abstractive"])
+    third = queue.submit(TEXT, MODEL, ["abstractive"])
+    assert queue.get(pending)['status'] == jobs.PENDING
+    assert queue.position(third) == 1
+    
+    assert queue.cancel(pending)
+    record = queue.get(pending)
+    assert record['status'] == jobs.CANCELLED
+    assert record['started'] is None
+    assert queue.position(third) == 0
+    assert queue.get(running)['status'] == jobs.RUNNING
+
+
+def test_restart_fails_interrupted_jobs(stub, slow_stub, make_queue):
+    first = make_queue(stub.url)
+    done = first.submit(TEXT, MODEL, ["abstractive"])
+    first.wait(done, timeout=10)
+    
+    interrupted_queue = make_queue(slow_stub.url)
+    interrupted = interrupted_queue.submit(TEXT, MODEL, ["abstractive"])
+    wait_for(lambda: interrupted_queue.get(interrupted)['status'] == jobs.RUNNING)
+    
+    # A new process reads the records the running one left on disk
+    restarted = make_queue(stub.url)
+    assert restarted.get(done)['status'] == jobs.DONE
+    assert restarted.get(done)['results'] == first.get(done)['results']
+    record = restarted.get(interrupted)
+    assert record['status'] == jobs.FAILED
+    assert record['error'] == "Interrupted by a server restart"
+    assert read_record(restarted, interrupted)['status'] == jobs.FAILED
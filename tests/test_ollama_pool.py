@@ -0,0 +1,195 @@
+"""
+Ollama Pool Tests
+File: tests/test_ollama_pool.py
+Description: Circuit breaker states and OllamaPool failover against stub servers
+"""
+
+import time
+
+import pytest
+
+from backend.ollama_pool import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    OllamaPool,
+    document_affinity
+)
+from backend.reporting import Reporter
+from benchmarks.stub_ollama import StubOllama
+
+from conftest import MODEL
+
+
+class ListReporter(Reporter):
+    """Keeps reported errors for assertions"""
+    
+    def __init__(self):
+        self.errors = []
+    
+    def error(self, message):
+        self.errors.append(message)
+
+
+@pytest.fixture
+def second_stub():
+    with StubOllama(tokens_per_second=0, reply_tokens=8) as server:
+        yield server
+
+
+@pytest.fixture
+def make_pool():
+    """Build OllamaPools without health check threads and close them afterwards"""
+    pools = []
+    
+    def make(urls, **options):
+        options.setdefault('health_interval', 0)
+        options.setdefault('reporter', ListReporter())
+        pool = OllamaPool(urls, **options)
+        pools.append(pool)
+        return pool
+    
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.acquire()
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.available()
+    
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.available()
+
+
+def test_breaker_success_resets_failures():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_breaker_half_open_admits_one_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    time.sleep(0.06)
+    
+    assert breaker.state == HALF_OPEN
+    assert breaker.available()
+    breaker.acquire()
+    assert not breaker.available()
+    
+    # An inconclusive trial (e.g. a timeout) frees the slot for another one
+    breaker.record_inconclusive()
+    assert breaker.available()
+    
+    breaker.acquire()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+
+
+def test_breaker_failed_trial_reopens():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0.05)
+    breaker.trip()
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+    
+    breaker.acquire()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.available()
+
+
+def test_pool_fails_over_on_server_errors(stub, second_stub, make_pool):
+    stub.fail_next(10, 500)
+    pool = make_pool([stub.url, second_stub.url], failure_threshold=1, max_retries=0)
+    
+    results = [pool.generate(MODEL, f"Question {i}") for i in range(4)]
+    
+    assert all(results)
+    assert pool.reporter.errors == []
+    bad, good = pool.status()
+    assert bad['state'] == OPEN
+    assert bad['failures'] == 1
+    assert good['state'] == CLOSED
+    assert good['requests'] == 4
+    assert bad['outstanding'] == good['outstanding'] == 0
+
+
+def test_pool_reports_when_every_host_fails(stub, second_stub, make_pool):
+    stub.fail_next(10, 500)
+    second_stub.fail_next(10, 500)
+    pool = make_pool([stub.url, second_stub.url], failure_threshold=1, max_retries=0)
+    
+    assert pool.generate(MODEL, "Question") is None
+    assert pool.reporter.errors == ["Ollama API returned status code: 500"]
+    assert [host['state'] for host in pool.status()] == [OPEN, OPEN]
+    
+    assert pool.generate(MODEL, "Question") is None
+    assert pool.reporter.errors[-1] == "No Ollama host is available"
+
+
+def test_pool_does_not_fail_over_on_timeout(make_pool, second_stub):
+    with StubOllama(tokens_per_second=0, reply_tokens=8, latency=1.0) as slow:
+        pool = make_pool([slow.url, second_stub.url], failure_threshold=1, max_retries=0,
+                         read_timeout=0.2)
+        assert pool.generate(MODEL, "Question") is None
+    
+    assert len(pool.reporter.errors) == 1
+    assert pool.reporter.errors[0].startswith("Request timed out")
+    assert second_stub.stats['requests'] == 0
+    assert [host['state'] for host in pool.status()] == [CLOSED, CLOSED]
+
+
+def test_pool_does_not_fail_over_on_client_errors(stub, second_stub, make_pool):
+    pool = make_pool([stub.url, second_stub.url], failure_threshold=1, max_retries=0)
+    
+    assert pool.generate("missing:latest", "Question") is None
+    assert len(pool.reporter.errors) == 1
+    assert stub.stats['requests'] + second_stub.stats['requests'] == 1
+    assert [host['state'] for host in pool.status()] == [CLOSED, CLOSED]
+
+
+def test_pool_half_open_host_recovers(stub, second_stub, make_pool):
+    stub.fail_next(1, 500)
+    pool = make_pool([stub.url, second_stub.url], failure_threshold=1, reset_timeout=0.1,
+                     max_retries=0)
+    assert pool.generate(MODEL, "Question")
+    assert pool.status()[0]['state'] == OPEN
+    
+    time.sleep(0.15)
+    assert pool.status()[0]['state'] == HALF_OPEN
+    for i in range(2):
+        assert pool.generate(MODEL, f"Question {i}")
+    assert pool.status()[0]['state'] == CLOSED
+
+
+def test_dropped_stream_releases_host(stub, second_stub, make_pool):
+    pool = make_pool([stub.url, second_stub.url])
+    stream = pool.generate(MODEL, "Question", stream=True)
+    assert sum(host['outstanding'] for host in pool.status()) == 1
+    
+    del stream
+    assert sum(host['outstanding'] for host in pool.status()) == 0
+    
+    with pool.generate(MODEL, "Question", stream=True) as stream:
+        assert "".join(stream)
+    assert sum(host['outstanding'] for host in pool.status()) == 0
+
+
+def test_document_affinity_keeps_one_host(stub, second_stub, make_pool):
+    pool = make_pool([stub.url, second_stub.url])
+    with document_affinity("document"):
+        for i in range(4):
+            assert pool.generate(MODEL, f"Question {i}")
+    
+    assert sorted(host['requests'] for host in pool.status()) == [0, 4]
@@ -0,0 +1,74 @@
+"""
+Summarizer Tests
+File: tests/test_summarizer.py
+Description: Map-reduce condensing of AISummarizer when chunk requests fail
+"""
+
+import pytest
+
+from backend.cache import SummaryCache
+from backend.ollama_client import OllamaClient
+from backend.reporting import Reporter, use_reporter
+from backend.summarizer import MAX_FAILED_CHUNK_RATIO, AISummarizer
+from backend.utils import split_into_token_chunks
+
+from conftest import MODEL
+
+TEXT = " ".join(f"Section {i} reports revenue, costs and staffing in detail." for i in range(100))
+BUDGET = 200
+CHUNKS = len(split_into_token_chunks(TEXT, BUDGET, 50))
+
+
+class ListReporter(Reporter):
+    """Keeps reported errors and warnings for assertions"""
+    
+    def __init__(self):
+        self.errors = []
+        self.warnings = []
+    
+    def error(self, message):
+        self.errors.append(message)
+    
+    def warning(self, message):
+        self.warnings.append(message)
+
+
+@pytest.fixture
+def reporter():
+    reporter = ListReporter()
+    with use_reporter(reporter):
+        yield reporter
+
+
+def make_summarizer(stub, cache=None):
+    client = OllamaClient(base_url=stub.url, max_retries=0)
+    return AISummarizer(client, max_input_tokens=BUDGET, max_concurrency=1, cache=cache)
+
+
+def test_map_reduce_condenses(stub, reporter):
+    condensed = make_summarizer(stub).map_reduce_text(TEXT, MODEL)
+    
+    assert condensed
+    assert reporter.errors == reporter.warnings == []
+
+
+def test_some_failed_chunks_are_reported(stub, reporter, tmp_path):
+    cache = SummaryCache(str(tmp_path))
+    summarizer = make_summarizer(stub, cache)
+    stub.fail_next(1, 500)
+    
+    assert summarizer.prepare_text(TEXT, MODEL, document_hash="hash")
+    assert len(reporter.warnings) == 1
+    assert reporter.warnings[0].startswith(f"1 of {CHUNKS} document sections failed")
+    # A condensed text missing a section is not cached
+    assert cache.stats()['entries'] == 0
+
+
+def test_too_many_failed_chunks_fail(stub, reporter):
+    failed = int(MAX_FAILED_CHUNK_RATIO * CHUNKS) + 1
+    stub.fail_next(failed, 500)
+    
+    assert make_summarizer(stub).map_reduce_text(TEXT, MODEL) is None
+    assert reporter.errors[-1] == (
+        f"Could not condense the document: {failed} of {CHUNKS} document sections failed"
+    )
@@ -0,0 +1,51 @@
+"""
+Text Cleaner Tests
+File: tests/test_text_cleaner.py
+Description: Page-number removal and header/footer detection of TextCleaner
+"""
+
+from backend.text_cleaner import TextCleaner
+
+BODY = "Results by region:\n42\n17\n2023\nRevenue grew in every region.\nCosts fell.\nOutlook."
+
+
+def test_page_numbers_removed_at_page_edges():
+    pages = TextCleaner.clean_pages([
+        "1\nTitle\n" + BODY,
+        BODY + "\n- 2 -",
+        "Page 3 of 3\n" + BODY + "\n"
+    ])
+    for page in pages:
+        assert page.startswith("Title" if page is pages[0] else "Results by region:")
+        assert page.endswith("Outlook.")
+
+
+def test_numbers_inside_a_page_are_kept():
+    for page in TextCleaner.clean_pages(["Intro.\nMore.\nEven more.\n" + BODY] * 3):
+        assert "42 17 2023" in page
+
+
+def test_number_equal_to_page_position_removed():
+    lines = ["Line one.", "Line two.", "Line three.", "Line four.", "Line five.", "Line six."]
+    pages = ["\n".join(lines[:3] + [str(index)] + lines[3:]) for index in (1, 2, 7)]
+    cleaned = TextCleaner.clean_pages(pages)
+    assert cleaned[0] == cleaned[1] == " ".join(lines)
+    assert " 7 " in cleaned[2]
+
+
+def test_repeated_edge_lines_stripped():
+    regions = ["North", "South", "East", "West", "Central"]
+    bodies = [f"{region} region.\n{BODY}\n{region} summary." for region in regions]
+    pages = [f"Annual Report\n{body}\nPage {index} of 5" for index, body in enumerate(bodies, 1)]
+    stripped, report = TextCleaner.strip_repeated_lines(pages)
+    assert report['repeated_lines'] == 2
+    assert report['lines_removed'] == 10
+    assert stripped == bodies
+
+
+def test_body_of_short_pages_kept():
+    # Slides: every page repeats its heading, only the first and last lines are edges
+    pages = [f"Quarterly Review\nKey takeaways\nPoint {index}\nConfidential" for index in range(5)]
+    stripped, report = TextCleaner.strip_repeated_lines(pages)
+    assert report['repeated_lines'] == 2
+    assert stripped == [f"Key takeaways\nPoint {index}" for index in range(5)]